@@ -23,3 +23,14 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+
+from . import _lazy
+
+# Define subpackages and modules, which are imported on first access
+SUBPACKAGES = ("instrumentation", "pipeline", "propagator", "scheduling",
+               "sweep", "visibility", "visualisation")
+
+__all__ = list(SUBPACKAGES)
+
+# Import attributes on first access
+__getattr__, __dir__ = _lazy.make_lazy(__name__, dict.fromkeys(SUBPACKAGES))
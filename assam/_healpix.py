@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+
+
+def nside2npix(nside):
+    """
+    Function to calculate the number of pixels of a HEALPix tessellation.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+
+    Returns
+    -------
+    int
+        Number of pixels.
+
+    """
+
+    return 12 * nside**2
+
+
+def ring_z(nside, ring):
+    """
+    Function to calculate the z coordinate of the pixel centres of rings.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    ring : numpy.ndarray
+        Ring numbers, from 1 at the north pole to 4*nside-1 at the south pole.
+
+    Returns
+    -------
+    z : numpy.ndarray
+        Cosine of the colatitude of the rings.
+
+    """
+
+    # Calculate z in the north cap, equatorial belt and south cap
+    ring = np.asarray(ring)
+    south_ring = 4*nside - ring
+    z = np.where(ring < nside,
+                 1 - ring**2 / (3*nside**2),
+                 np.where(ring <= 3*nside,
+                          (4/3) - 2*ring / (3*nside),
+                          south_ring**2 / (3*nside**2) - 1))
+
+    return z
+
+
+def ring_start(nside, ring):
+    """
+    Function to calculate the index of the first pixel of rings.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    ring : numpy.ndarray
+        Ring numbers, from 1 at the north pole to 4*nside-1 at the south pole.
+
+    Returns
+    -------
+    numpy.ndarray
+        Index of the first pixel of each ring.
+
+    """
+
+    # Calculate start index in the north cap, equatorial belt and south cap
+    ring = np.asarray(ring)
+    south_ring = 4*nside - ring
+    return np.where(ring < nside,
+                    2*ring*(ring - 1),
+                    np.where(ring <= 3*nside,
+                             2*nside*(nside - 1) + (ring - nside)*4*nside,
+                             nside2npix(nside) - 2*south_ring*(south_ring + 1)))
+
+
+def pix2vec(nside, ipix):
+    """
+    Function to calculate the unit vectors of pixel centres in the RING
+    scheme.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    ipix : numpy.ndarray
+        Pixel indices.
+
+    Returns
+    -------
+    vectors : numpy.ndarray
+        Unit vectors of the pixel centres, with shape (..., 3).
+
+    """
+
+    # Calculate pixel counts
+    ipix = np.asarray(ipix)
+    npix = nside2npix(nside)
+    ncap = 2*nside*(nside - 1)
+
+    # Declare ring numbers and longitudes
+    ring = np.empty(ipix.shape, dtype=np.int64)
+    phi = np.empty(ipix.shape)
+
+    # Calculate north polar cap pixels
+    north = ipix < ncap
+    ring[north] = ((1 + np.sqrt(1 + 2*ipix[north])) / 2).astype(np.int64)
+    jphi = ipix[north] - 2*ring[north]*(ring[north] - 1)
+    phi[north] = (np.pi / (2*ring[north])) * (jphi + 0.5)
+
+    # Calculate equatorial belt pixels
+    equator = (ipix >= ncap) & (ipix < npix - ncap)
+    ip = ipix[equator] - ncap
+    ring[equator] = ip // (4*nside) + nside
+    fodd = np.where((ring[equator] + nside) % 2 == 1, 1.0, 0.5)
+    phi[equator] = (ip % (4*nside) + 1 - fodd) * np.pi / (2*nside)
+
+    # Calculate south polar cap pixels
+    south = ipix >= npix - ncap
+    ip = npix - ipix[south]
+    south_ring = ((1 + np.sqrt(2*ip - 1)) / 2).astype(np.int64)
+    ring[south] = 4*nside - south_ring
+    jphi = ipix[south] - (npix - 2*south_ring*(south_ring + 1))
+    phi[south] = (np.pi / (2*south_ring)) * (jphi + 0.5)
+
+    # Calculate unit vectors
+    z = ring_z(nside, ring)
+    sin_theta = np.sqrt(1 - z**2)
+    vectors = np.stack((sin_theta*np.cos(phi),
+                        sin_theta*np.sin(phi),
+                        z), axis=-1)
+
+    return vectors
+
+
+def vec2pix(nside, vectors):
+    """
+    Function to find the pixels containing unit vectors in the RING scheme.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    vectors : numpy.ndarray
+        Unit vectors, with shape (..., 3).
+
+    Returns
+    -------
+    ipix : numpy.ndarray
+        Pixel indices.
+
+    """
+
+    # Calculate z and longitude in units of quarter turns
+    vectors = np.asarray(vectors, dtype=float)
+    z = np.clip(vectors[..., 2], -1, 1)
+    za = np.abs(z)
+    tt = np.mod(np.arctan2(vectors[..., 1], vectors[..., 0]) / (np.pi/2), 4)
+
+    # Declare pixel indices
+    npix = nside2npix(nside)
+    ncap = 2*nside*(nside - 1)
+    ipix = np.empty(z.shape, dtype=np.int64)
+
+    # Calculate equatorial belt pixels
+    equator = za <= 2/3
+    temp1 = nside*(0.5 + tt[equator])
+    temp2 = nside*z[equator]*0.75
+    jp = (temp1 - temp2).astype(np.int64)
+    jm = (temp1 + temp2).astype(np.int64)
+    ir = nside + 1 + jp - jm
+    kshift = 1 - (ir & 1)
+    ip = np.mod((jp + jm - nside + kshift + 1) // 2, 4*nside)
+    ipix[equator] = ncap + (ir - 1)*4*nside + ip
+
+    # Calculate polar cap pixels
+    polar = ~equator
+    tp = tt[polar] - np.floor(tt[polar])
+    tmp = nside*np.sqrt(3*(1 - za[polar]))
+    jp = (tp*tmp).astype(np.int64)
+    jm = ((1 - tp)*tmp).astype(np.int64)
+    ir = jp + jm + 1
+    ip = np.mod((tt[polar]*ir).astype(np.int64), 4*ir)
+    ipix[polar] = np.where(z[polar] > 0,
+                           2*ir*(ir - 1) + ip,
+                           npix - 2*ir*(ir + 1) + ip)
+
+    return ipix
+
+
+def disc_candidates(nside, vector, radius):
+    """
+    Function to find the contiguous range of pixels in the rings which
+    intersect a disc, as a prefilter for disc queries.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    vector : numpy.ndarray
+        Unit vector of the disc centre.
+    radius : float
+        Disc angular radius [rad].
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the candidate pixels.
+
+    """
+
+    # Calculate colatitude range of the disc
+    theta = np.arccos(np.clip(vector[2], -1, 1))
+    z_max = np.cos(max(0.0, theta - radius))
+    z_min = np.cos(min(np.pi, theta + radius))
+
+    # Find rings with pixel centres within the colatitude range, where z
+    # decreases with ring number
+    rings = np.arange(1, 4*nside)
+    within = np.flatnonzero((ring_z(nside, rings) <= z_max + 1e-12)
+                            & (ring_z(nside, rings) >= z_min - 1e-12))
+    if len(within) == 0:
+        return np.arange(0)
+
+    # Calculate pixel range of the rings
+    first = ring_start(nside, rings[within[0]])
+    last = ring_start(nside, rings[within[-1]] + 1) \
+        if rings[within[-1]] < 4*nside - 1 else nside2npix(nside)
+
+    return np.arange(first, last)
+
+
+def query_disc(nside, vector, radius, pixel_vectors=None):
+    """
+    Function to find the pixels with centres within a disc.
+
+    Parameters
+    ----------
+    nside : int
+        HEALPix resolution parameter.
+    vector : numpy.ndarray
+        Unit vector of the disc centre.
+    radius : float
+        Disc angular radius [rad].
+    pixel_vectors : numpy.ndarray, optional
+        Precomputed unit vectors of all pixel centres. The default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the pixels within the disc.
+
+    """
+
+    # Find candidate pixels
+    candidates = disc_candidates(nside, vector, radius)
+
+    # Calculate candidate pixel vectors
+    if pixel_vectors is None:
+        candidate_vectors = pix2vec(nside, candidates)
+    else:
+        candidate_vectors = pixel_vectors[candidates]
+
+    # Test candidates against the disc
+    return candidates[candidate_vectors @ vector >= np.cos(radius)]
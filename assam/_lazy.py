@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import importlib
+import sys
+
+
+def make_lazy(name, attributes):
+    """
+    Function to create the module-level __getattr__ and __dir__ functions of
+    a package, which import its attributes on first access so that importing
+    the package does not import their dependencies.
+
+    Parameters
+    ----------
+    name : str
+        Package name.
+    attributes : dict
+        Relative names of the modules containing each attribute, keyed by
+        attribute name, or None for submodules imported as the attribute.
+
+    Returns
+    -------
+    __getattr__ : callable
+        Function to import an attribute on first access.
+    __dir__ : callable
+        Function to list the package attributes, including lazily imported
+        ones.
+
+    """
+
+    def __getattr__(attribute):
+        # Check attribute
+        if attribute not in attributes:
+            raise AttributeError(f"module {name!r} has no attribute {attribute!r}")
+
+        # Import submodule, which is added to the package on import
+        if attributes[attribute] is None:
+            return importlib.import_module(f".{attribute}", name)
+
+        # Import module containing the attribute and store it in the package
+        module = importlib.import_module(attributes[attribute], name)
+        value = getattr(module, attribute)
+        setattr(sys.modules[name], attribute, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[name])) | set(attributes))
+
+    return __getattr__, __dir__
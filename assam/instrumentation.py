@@ -0,0 +1,492 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Import resource usage module, which is not available on Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Define logger
+LOGGER = logging.getLogger(__name__)
+
+# Define instrumentation state
+STATE = {"enabled": False,
+         "log": False,
+         "profile": False,
+         "profile_dir": None,
+         "profiling": False,
+         "records": [],
+         "sample_interval": 0.01}
+
+
+def enable(log=False, profile=False, profile_dir=None):
+    """
+    Function to enable instrumentation of the pipeline stages.
+
+    Parameters
+    ----------
+    log : bool, optional
+        Flag to emit each record as a JSON log message at INFO level.
+        The default is False.
+    profile : bool, optional
+        Flag to capture a cProfile profile of each stage. The default is
+        False.
+    profile_dir : str, optional
+        Directory to write profiles to as "<stage>_<index>.prof" files,
+        which can be read with pstats or snakeviz. The default is None
+        which keeps the profiles in memory.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Store options
+    STATE["enabled"] = True
+    STATE["log"] = log
+    STATE["profile"] = profile
+    STATE["profile_dir"] = profile_dir
+
+    # Create profile directory
+    if profile_dir is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+
+
+def disable():
+    """
+    Function to disable instrumentation.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    STATE["enabled"] = False
+
+
+def reset():
+    """
+    Function to clear the recorded stages.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    STATE["records"] = []
+
+
+def peak_rss():
+    """
+    Function to get the lifetime peak resident set size of the process and
+    of its terminated child processes, such as multiprocessing workers.
+
+    Returns
+    -------
+    peak_rss : int
+        Peak resident set size of the process [bytes], or None if not
+        available.
+    peak_rss_children : int
+        Peak resident set size of the largest child process [bytes], or
+        None if not available.
+
+    """
+
+    # Check for resource module
+    if resource is None:
+        return None, None
+
+    # Find peak resident set size, which is in bytes on macOS and kilobytes
+    # elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (scale*resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            scale*resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def current_rss(pid="self"):
+    """
+    Function to get the current resident set size of a process from procfs,
+    which is only available on Linux.
+
+    Parameters
+    ----------
+    pid : int or str, optional
+        Process ID. The default is "self" which is this process.
+
+    Returns
+    -------
+    int
+        Resident set size of the process [bytes], or None if not available.
+
+    """
+
+    # Read resident pages, where the process may have already exited
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def children_rss():
+    """
+    Function to get the total current resident set size of the child
+    processes from procfs, which is only available on Linux.
+
+    Returns
+    -------
+    int
+        Total resident set size of the child processes [bytes], or None if
+        not available.
+
+    """
+
+    # Find child processes of each thread
+    try:
+        pids = set()
+        for task in os.listdir("/proc/self/task"):
+            with open(f"/proc/self/task/{task}/children") as file:
+                pids.update(file.read().split())
+    except OSError:
+        return None
+
+    # Sum resident set sizes of the children still running
+    return sum(current_rss(pid) or 0 for pid in pids)
+
+
+class MemorySampler():
+
+    def __init__(self, interval=0.01):
+        """
+        Initialisation function for a sampler which tracks the peak current
+        resident set size of the process and its children in a background
+        thread.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Sampling interval [s]. The default is 0.01.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store interval and declare samples
+        self.interval = interval
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+        self.peak_rss_children = children_rss()
+
+        # Declare thread
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def sample(self):
+        """
+        Function to sample the resident set sizes and update the peaks.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Update peaks of available samples
+        rss = current_rss()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+        rss_children = children_rss()
+        if rss_children is not None:
+            self.peak_rss_children = max(self.peak_rss_children or 0,
+                                         rss_children)
+
+    def run(self):
+        """
+        Function to sample until the sampler is stopped.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """
+        Function to start sampling, unless procfs is not available.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.start_rss is not None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Function to stop sampling and take a final sample.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.thread is not None:
+            self.stopped.set()
+            self.thread.join()
+            self.sample()
+
+
+def cpu_times():
+    """
+    Function to get the CPU time of the process and of its terminated child
+    processes.
+
+    Returns
+    -------
+    cpu_time : float
+        CPU time of the process [s].
+    cpu_time_children : float
+        CPU time of the child processes [s].
+
+    """
+
+    # Sum user and system times
+    times = os.times()
+    return times.user + times.system, times.children_user + times.children_system
+
+
+@contextlib.contextmanager
+def stage(name, count=None):
+    """
+    Context manager to record the wall time, CPU time, peak memory and item
+    count of a stage.
+
+    Parameters
+    ----------
+    name : str
+        Stage name.
+    count : int, optional
+        Number of items processed by the stage. The default is None.
+
+    Yields
+    ------
+    record : dict
+        Stage record, where the item count can be set inside the block.
+
+    """
+
+    # Skip if disabled
+    record = {"stage": name, "count": count}
+    if not STATE["enabled"]:
+        yield record
+        return
+
+    # Start profiler, unless an enclosing stage is already profiled
+    profiler = None
+    if STATE["profile"] and not STATE["profiling"]:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        STATE["profiling"] = True
+
+    # Record start and sample memory during the stage
+    wall_start = time.perf_counter()
+    cpu_start, cpu_children_start = cpu_times()
+    rss_start, rss_children_start = peak_rss()
+    sampler = MemorySampler(STATE["sample_interval"])
+    sampler.start()
+
+    try:
+        yield record
+    finally:
+        # Record end
+        wall_time = time.perf_counter() - wall_start
+        cpu_end, cpu_children_end = cpu_times()
+        sampler.stop()
+
+        # Find peak memory during the stage from the samples, or otherwise
+        # from the lifetime peaks if they increased during the stage
+        rss, rss_children = sampler.peak_rss, sampler.peak_rss_children
+        rss_end, rss_children_end = peak_rss()
+        if rss is None and rss_end is not None and rss_end > rss_start:
+            rss = rss_end
+        if rss_children is None and rss_children_end is not None \
+                and rss_children_end > rss_children_start:
+            rss_children = rss_children_end
+        if rss is not None and sampler.start_rss is not None:
+            rss_growth = rss - sampler.start_rss
+        else:
+            rss_growth = None
+
+        # Stop profiler
+        if profiler is not None:
+            profiler.disable()
+            STATE["profiling"] = False
+
+        # Store record
+        record.update({"wall_time": wall_time,
+                       "cpu_time": cpu_end - cpu_start,
+                       "cpu_time_children": cpu_children_end - cpu_children_start,
+                       "peak_rss": rss,
+                       "rss_growth": rss_growth,
+                       "peak_rss_children": rss_children,
+                       "start": time.time() - wall_time})
+        if record["count"] is not None and wall_time > 0:
+            record["items_per_second"] = record["count"] / wall_time
+        STATE["records"].append(record)
+
+        # Save or keep profile
+        if profiler is not None:
+            if STATE["profile_dir"] is not None:
+                path = os.path.join(STATE["profile_dir"],
+                                    f"{name}_{len(STATE['records'])}.prof")
+                profiler.dump_stats(path)
+                record["profile"] = path
+            else:
+                record["profile"] = profiler
+
+        # Emit log message
+        if STATE["log"]:
+            LOGGER.info(json.dumps(serialisable(record)))
+
+
+def instrument(name=None, count=None):
+    """
+    Decorator to record a function as a stage.
+
+    Parameters
+    ----------
+    name : str, optional
+        Stage name. The default is None which uses the function name.
+    count : callable, optional
+        Function which returns the number of processed items, called with
+        the result and the first argument, which is the instance for
+        methods. The default is None.
+
+    Returns
+    -------
+    decorator : callable
+        Function decorator.
+
+    """
+
+    def decorator(function):
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # Call function directly if disabled
+            if not STATE["enabled"]:
+                return function(*args, **kwargs)
+
+            # Record stage
+            with stage(stage_name) as record:
+                result = function(*args, **kwargs)
+                if count is not None:
+                    record["count"] = count(result, args[0] if args else None)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def serialisable(record):
+    """
+    Function to convert a record into JSON serialisable values.
+
+    Parameters
+    ----------
+    record : dict
+        Stage record.
+
+    Returns
+    -------
+    dict
+        Serialisable record, without in-memory profiles.
+
+    """
+
+    return {key: value for key, value in record.items()
+            if not isinstance(value, cProfile.Profile)}
+
+
+def report():
+    """
+    Function to get the recorded stages.
+
+    Returns
+    -------
+    list
+        Stage records.
+
+    """
+
+    return [serialisable(record) for record in STATE["records"]]
+
+
+def save_report(path):
+    """
+    Function to save the recorded stages as a JSON report.
+
+    Parameters
+    ----------
+    path : str
+        Output path.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with open(path, "w") as file:
+        json.dump({"records": report()}, file, indent=2)
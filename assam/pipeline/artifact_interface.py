@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+
+def hash_value(value, digest=None):
+    """
+    Function to hash a value by its content, so that equal inputs give equal
+    hashes across runs.
+
+    Parameters
+    ----------
+    value : object
+        Value to hash, such as a number, string, list, dict, NumPy array,
+        Astropy quantity or time. Other objects are hashed by their pickle.
+    digest : hashlib._Hash, optional
+        Hash object to update. The default is None.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash.
+
+    """
+
+    # Create hash object
+    if digest is None:
+        digest = hashlib.sha256()
+
+    # Hash value by type
+    if value is None or isinstance(value, (bool, int, float, str)):
+        digest.update(json.dumps(value).encode())
+    elif isinstance(value, bytes):
+        digest.update(b"bytes")
+        digest.update(value)
+    elif isinstance(value, dict):
+        digest.update(b"dict")
+        for key in sorted(value, key=repr):
+            hash_value(key, digest)
+            hash_value(value[key], digest)
+    elif isinstance(value, (list, tuple)):
+        digest.update(type(value).__name__.encode())
+        for item in value:
+            hash_value(item, digest)
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        hash_value(value.item(), digest)
+    elif hasattr(value, "unit") and hasattr(value, "value"):
+        # Hash Astropy quantities by value and unit
+        digest.update(b"quantity")
+        hash_value(np.asarray(value.value), digest)
+        hash_value(str(value.unit), digest)
+    elif hasattr(value, "jd1") and hasattr(value, "scale"):
+        # Hash Astropy times by their two-part Julian date and scale
+        digest.update(b"time")
+        hash_value(np.asarray(value.jd1), digest)
+        hash_value(np.asarray(value.jd2), digest)
+        hash_value(value.scale, digest)
+    else:
+        digest.update(pickle.dumps(value, protocol=4))
+
+    return digest.hexdigest()
+
+
+def hash_file(path, block_size=1 << 20):
+    """
+    Function to hash the content of a file.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    block_size : int, optional
+        Number of bytes read at a time. The default is 1 MiB.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash.
+
+    """
+
+    # Hash file in blocks
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def hash_function(function):
+    """
+    Function to hash a function by its qualified name and source code, so
+    that editing a stage function changes its hash. Functions called by it
+    are not hashed.
+
+    Parameters
+    ----------
+    function : callable
+        Function to hash. Partial functions are hashed with their arguments.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash.
+
+    """
+
+    # Hash partial functions with their arguments
+    if isinstance(function, functools.partial):
+        return hash_value([hash_function(function.func), function.args,
+                           function.keywords])
+
+    # Extract source code, falling back to the bytecode and constants if
+    # the source is not available, such as for interactive sessions
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        code = getattr(function, "__code__", None)
+        source = None if code is None else [code.co_code, repr(code.co_consts)]
+
+    return hash_value([getattr(function, "__module__", None),
+                       getattr(function, "__qualname__", repr(function)),
+                       source])
+
+
+class ArtifactStore():
+
+    def __init__(self, cache_dir):
+        """
+        Initialisation function for the artifact store, which pickles stage
+        outputs to disk under their content hash.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Cache directory.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store cache directory
+        self.cache_dir = cache_dir
+
+    def path(self, name, key):
+        """
+        Function to get the path of an artifact.
+
+        Parameters
+        ----------
+        name : str
+            Artifact name.
+        key : str
+            Artifact hash.
+
+        Returns
+        -------
+        str
+            Artifact path.
+
+        """
+
+        return os.path.join(self.cache_dir, name, f"{key}.pkl")
+
+    def exists(self, name, key):
+        """
+        Function to check whether an artifact exists.
+
+        Parameters
+        ----------
+        name : str
+            Artifact name.
+        key : str
+            Artifact hash.
+
+        Returns
+        -------
+        bool
+            True if the artifact exists.
+
+        """
+
+        return os.path.exists(self.path(name, key))
+
+    def load(self, name, key):
+        """
+        Function to load an artifact.
+
+        Parameters
+        ----------
+        name : str
+            Artifact name.
+        key : str
+            Artifact hash.
+
+        Returns
+        -------
+        object
+            Artifact value.
+
+        """
+
+        with open(self.path(name, key), "rb") as file:
+            return pickle.load(file)
+
+    def save(self, name, key, value):
+        """
+        Function to save an artifact, writing it to a temporary file first so
+        that interrupted runs do not leave partial artifacts.
+
+        Parameters
+        ----------
+        name : str
+            Artifact name.
+        key : str
+            Artifact hash.
+        value : object
+            Artifact value.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Create artifact directory
+        path = self.path(name, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to temporary file and move into place
+        fd, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import multiprocessing
+
+from tqdm import tqdm
+
+from . import artifact_interface
+
+# Declare state shared with multiprocessing workers
+WORKER_STATE = {}
+
+
+def propagate_spacecraft(start_time, end_time, time_step, keplerian_elements, propagator="gmat"):
+    """
+    Stage function to propagate the spacecraft.
+
+    Parameters
+    ----------
+    start_time : astropy.time.core.Time
+        Mission start time.
+    end_time : astropy.time.core.Time
+        Mission end time.
+    time_step : astropy.time.core.TimeDelta
+        Time step for output state.
+    keplerian_elements : dict
+        Earth-centered Keplerian elements of the satellite.
+    propagator : str, optional
+        Propagator option. The default is "gmat".
+
+    Returns
+    -------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+
+    """
+
+    # Import module on first use
+    from ..propagator import PropagatorModule
+
+    # Propagate spacecraft
+    propagator = PropagatorModule(start_time, end_time, time_step,
+                                  keplerian_elements, propagator)
+
+    return propagator.propagate_spacecraft()
+
+
+def load_solar_bodies(spacecraft_frame, ephem="jpl", path="data/solar_bodies.yml"):
+    """
+    Stage function to load the solar bodies.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+    ephem : str, optional
+        Ephemeris selection. The default is "jpl".
+    path : str, optional
+        Path of the solar bodies file. The default is "data/solar_bodies.yml".
+
+    Returns
+    -------
+    list
+        Solar system bodies and their properties.
+
+    """
+
+    # Import module on first use
+    from ..propagator import solar_body_interface
+
+    return solar_body_interface.load(spacecraft_frame, ephem=ephem, path=path)
+
+
+def load_target_catalogue(path="data/targets.yml"):
+    """
+    Stage function to load the target catalogue, from a YAML catalogue, or
+    from a CSV or FITS table with one row per subtarget.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the targets file. The default is "data/targets.yml".
+
+    Raises
+    ------
+    ValueError
+        Error if targets file is empty, if its format is not supported, or
+        if a table column is missing.
+
+    Returns
+    -------
+    catalogue : dict
+        Target information keyed by target name.
+
+    """
+
+    # Import module on first use
+    from ..visibility import catalogue_interface
+
+    # Load tables of targets from columns
+    if catalogue_interface.file_format(path) != "yaml":
+        columns = catalogue_interface.read_catalogue(path)
+        return catalogue_interface.columns_catalogue(columns)
+
+    # Load targets from config file, reusing its binary cache
+    return catalogue_interface.load_yaml(path)
+
+
+def calculate_target_visibility(spacecraft_frame, solar_bodies, catalogue, num_workers=None, context=None):
+    """
+    Stage function to generate targets and calculate their visibility and
+    contacts, caching each target separately so that changing one target
+    only recalculates that target.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+    solar_bodies : list
+        Solar system bodies and their properties.
+    catalogue : dict
+        Target information keyed by target name.
+    num_workers : int, optional
+        Number of workers for multiprocessing. The default is None.
+    context : assam.pipeline.pipeline_module.StageContext, optional
+        Stage context. The default is None which disables per-target caching.
+
+    Returns
+    -------
+    targets : list
+        Targets with their visibility and contacts.
+
+    """
+
+    # Hash the stage definition and the spacecraft and solar body inputs
+    # shared by all targets
+    if context is not None:
+        dependency_keys = dict(context.dependency_keys)
+        dependency_keys.pop("target_catalogue", None)
+        shared_key = artifact_interface.hash_value(
+            {"name": context.name,
+             "version": context.version,
+             "function": context.function_key,
+             "parameters": context.parameters,
+             "dependencies": dependency_keys})
+
+    # Load targets from cache, recording the missing targets
+    targets = [None] * len(catalogue)
+    keys = [None] * len(catalogue)
+    missing = []
+    for i, target_dump in enumerate(catalogue.items()):
+        if context is not None:
+            keys[i] = artifact_interface.hash_value([shared_key, target_dump])
+            if context.store.exists("target_visibility", keys[i]):
+                targets[i] = context.store.load("target_visibility", keys[i])
+                continue
+        missing.append(i)
+
+    # Skip worker pool if all targets are cached
+    if not missing:
+        return targets
+
+    # Create list of missing targets
+    targets_dump = list(catalogue.items())
+    worker_params = [targets_dump[i] for i in missing]
+
+    # Create worker pool
+    with multiprocessing.Pool(num_workers, initializer=init_worker,
+                              initargs=(spacecraft_frame, solar_bodies)) as p:
+        # Create progress bar
+        with tqdm(total=len(missing), desc="Target Visibility") as pbar:
+            # Iterate through targets
+            for i, target in zip(missing, p.imap(target_visibility_worker,
+                                                 worker_params)):
+                # Store target and save to cache
+                targets[i] = target
+                if context is not None:
+                    context.store.save("target_visibility", keys[i], target)
+
+                # Update progress bar
+                pbar.update()
+
+    return targets
+
+
+def init_worker(spacecraft_frame, solar_bodies):
+    """
+    Function to initialise multiprocessing workers with the spacecraft
+    frame and solar bodies shared by all targets.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+    solar_bodies : list
+        Solar system bodies and their properties.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    WORKER_STATE["spacecraft_frame"] = spacecraft_frame
+    WORKER_STATE["solar_bodies"] = solar_bodies
+
+
+def target_visibility_worker(target_dump):
+    """
+    Worker function to generate a target and calculate its visibility and
+    contacts.
+
+    Parameters
+    ----------
+    target_dump : tuple
+        Target name and information.
+
+    Returns
+    -------
+    target : assam.visibility.astro_target.AstroTarget
+        Target with its visibility and contacts.
+
+    """
+
+    # Import module on first use
+    from ..visibility import astro_target_interface
+
+    # Generate target and calculate visibility and contacts
+    target = astro_target_interface.load_worker((target_dump,
+                                                 WORKER_STATE["spacecraft_frame"]))
+    target.calculate_visibility(WORKER_STATE["solar_bodies"])
+    target.calculate_contacts()
+
+    return target
+
+
+def calculate_stats(spacecraft_frame, solar_bodies, targets):
+    """
+    Stage function to calculate overall target statistics.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+    solar_bodies : list
+        Solar system bodies and their properties.
+    targets : list
+        Targets with their contacts.
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame
+        Overall statistics of target contacts.
+
+    """
+
+    # Import module on first use
+    from ..visibility import VisibilityModule
+
+    # Calculate statistics
+    visibility = VisibilityModule(spacecraft_frame, solar_bodies)
+    visibility.targets = targets
+
+    return visibility.calculate_overall_stats()
+
+
+def schedule(targets, method="simple_dynamic_schedule", options=None):
+    """
+    Stage function to schedule contacts.
+
+    Parameters
+    ----------
+    targets : list
+        Targets with their contacts.
+    method : str, optional
+        Name of the scheduling method of the scheduling module.
+        The default is "simple_dynamic_schedule".
+    options : dict, optional
+        Keyword arguments of the scheduling method. The default is None.
+
+    Raises
+    ------
+    ValueError
+        Error if the scheduling method is invalid.
+
+    Returns
+    -------
+    scheduling : assam.scheduling.SchedulingModule
+        Scheduling module with the scheduled contacts.
+
+    """
+
+    # Import module on first use
+    from ..scheduling import SchedulingModule
+
+    # Check scheduling method
+    if not method.endswith("schedule") or not hasattr(SchedulingModule, method):
+        raise ValueError(f"Invalid scheduling method: {method}")
+
+    # Schedule contacts
+    scheduling = SchedulingModule(targets)
+    scheduling.combine_contacts()
+    getattr(scheduling, method)(**(options or {}))
+
+    return scheduling
+
+
+def add_mission_stages(pipeline, start_time, end_time, time_step, keplerian_elements, propagator="gmat", ephem="jpl", targets_path="data/targets.yml", solar_bodies_path="data/solar_bodies.yml", schedule_method="simple_dynamic_schedule", schedule_options=None):
+    """
+    Function to add the mission analysis stages to a pipeline, from orbit
+    propagation to scheduling.
+
+    The stages are spacecraft, solar_bodies, target_catalogue, targets,
+    stats and schedule. Any stage can be replaced afterwards with
+    add_stage, such as the spacecraft stage with another propagator.
+
+    Parameters
+    ----------
+    pipeline : assam.pipeline.PipelineModule
+        Pipeline module.
+    start_time : astropy.time.core.Time
+        Mission start time.
+    end_time : astropy.time.core.Time
+        Mission end time.
+    time_step : astropy.time.core.TimeDelta
+        Time step for output state.
+    keplerian_elements : dict
+        Earth-centered Keplerian elements of the satellite.
+    propagator : str, optional
+        Propagator option. The default is "gmat".
+    ephem : str, optional
+        Ephemeris selection. The default is "jpl".
+    targets_path : str, optional
+        Path of the targets file. The default is "data/targets.yml".
+    solar_bodies_path : str, optional
+        Path of the solar bodies file. The default is "data/solar_bodies.yml".
+    schedule_method : str, optional
+        Name of the scheduling method. The default is
+        "simple_dynamic_schedule".
+    schedule_options : dict, optional
+        Keyword arguments of the scheduling method. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Add propagation stages
+    pipeline.add_stage("spacecraft", propagate_spacecraft,
+                       parameters={"start_time": start_time,
+                                   "end_time": end_time,
+                                   "time_step": time_step,
+                                   "keplerian_elements": keplerian_elements,
+                                   "propagator": propagator})
+    pipeline.add_stage("solar_bodies", load_solar_bodies,
+                       dependencies=("spacecraft",),
+                       parameters={"ephem": ephem,
+                                   "path": solar_bodies_path},
+                       files=(solar_bodies_path,))
+
+    # Add visibility stages
+    pipeline.add_stage("target_catalogue", load_target_catalogue,
+                       parameters={"path": targets_path},
+                       files=(targets_path,))
+    pipeline.add_stage("targets", calculate_target_visibility,
+                       dependencies=("spacecraft", "solar_bodies",
+                                     "target_catalogue"),
+                       context=True)
+    pipeline.add_stage("stats", calculate_stats,
+                       dependencies=("spacecraft", "solar_bodies", "targets"))
+
+    # Add scheduling stage
+    pipeline.add_stage("schedule", schedule,
+                       dependencies=("targets",),
+                       parameters={"method": schedule_method,
+                                   "options": schedule_options})
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+import time
+
+from . import artifact_interface
+
+# Define logger
+LOGGER = logging.getLogger(__name__)
+
+
+class PipelineStage():
+
+    def __init__(self, name, function, dependencies=(), parameters=None, files=(), context=False, version=0):
+        """
+        Initialisation function for a pipeline stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        function : callable
+            Stage function, called with the outputs of the dependencies as
+            positional arguments and the parameters as keyword arguments.
+        dependencies : tuple, optional
+            Names of the stages whose outputs are inputs to this stage.
+            The default is ().
+        parameters : dict, optional
+            Keyword arguments of the stage function. The default is None.
+        files : tuple, optional
+            Paths of input files, which are hashed by their content.
+            The default is ().
+        context : bool, optional
+            Flag to pass the stage context as the context keyword argument,
+            for stages which cache parts of their output themselves.
+            The default is False.
+        version : int, optional
+            Stage version, which is increased to invalidate artifacts when
+            the functions called by the stage function change, as only the
+            source of the stage function itself is hashed. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store stage properties
+        self.name = name
+        self.function = function
+        self.dependencies = tuple(dependencies)
+        self.parameters = parameters or {}
+        self.files = tuple(files)
+        self.context = context
+        self.version = version
+
+
+class StageContext():
+
+    def __init__(self, store, key, dependency_keys, name=None, version=0, parameters=None, function_key=None):
+        """
+        Initialisation function for the context of a running stage.
+
+        Parameters
+        ----------
+        store : assam.pipeline.artifact_interface.ArtifactStore
+            Artifact store.
+        key : str
+            Stage hash.
+        dependency_keys : dict
+            Hashes of the dependencies.
+        name : str, optional
+            Stage name. The default is None.
+        version : int, optional
+            Stage version. The default is 0.
+        parameters : dict, optional
+            Keyword arguments of the stage function. The default is None.
+        function_key : str, optional
+            Hash of the stage function. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store context
+        self.store = store
+        self.key = key
+        self.dependency_keys = dependency_keys
+        self.name = name
+        self.version = version
+        self.parameters = parameters or {}
+        self.function_key = function_key
+
+
+class PipelineModule():
+
+    def __init__(self, cache_dir="cache", verbose=True):
+        """
+        Initialisation function for the pipeline module, which runs stages
+        as a directed acyclic graph and caches their outputs on disk under a
+        hash of their inputs.
+
+        A stage hash combines its name, version, function source,
+        parameters, input file contents and the hashes of its dependencies,
+        so a stage is only rerun if one of these changes.
+
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Cache directory. The default is "cache".
+        verbose : bool, optional
+            Flag to log whether each stage was loaded or run, at the INFO
+            level of the assam.pipeline.pipeline_module logger.
+            The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Create artifact store
+        self.store = artifact_interface.ArtifactStore(cache_dir)
+        self.verbose = verbose
+
+        # Declare empty variables
+        self.stages = {}
+        self.keys = {}
+        self.results = {}
+        self.timings = {}
+        self.executed = []
+
+    def add_stage(self, name, function, dependencies=(), parameters=None, files=(), context=False, version=0):
+        """
+        Function to add a stage to the pipeline, replacing any stage with
+        the same name.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        function : callable
+            Stage function.
+        dependencies : tuple, optional
+            Names of the dependency stages. The default is ().
+        parameters : dict, optional
+            Keyword arguments of the stage function. The default is None.
+        files : tuple, optional
+            Paths of input files. The default is ().
+        context : bool, optional
+            Flag to pass the stage context. The default is False.
+        version : int, optional
+            Stage version. The default is 0.
+
+        Returns
+        -------
+        stage : PipelineStage
+            Pipeline stage.
+
+        """
+
+        # Create and store stage
+        stage = PipelineStage(name, function, dependencies, parameters,
+                              files, context, version)
+        self.stages[name] = stage
+
+        return stage
+
+    def stage_order(self, targets=None):
+        """
+        Function to order stages so that each stage follows its dependencies.
+
+        Parameters
+        ----------
+        targets : list, optional
+            Names of the required stages. The default is None which uses all
+            stages.
+
+        Raises
+        ------
+        ValueError
+            Error if a stage is missing or the stages contain a cycle.
+
+        Returns
+        -------
+        order : list
+            Ordered stage names.
+
+        """
+
+        # Define required stages
+        if targets is None:
+            targets = list(self.stages)
+
+        # Visit stages depth-first
+        order = []
+        state = {}
+
+        def visit(name):
+            # Check stage
+            if name not in self.stages:
+                raise ValueError(f"Missing stage: {name}")
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cyclic stage dependency: {name}")
+            if state.get(name) == "done":
+                return
+
+            # Visit dependencies
+            state[name] = "visiting"
+            for dependency in self.stages[name].dependencies:
+                visit(dependency)
+            state[name] = "done"
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+
+        return order
+
+    def stage_key(self, name):
+        """
+        Function to calculate the hash of a stage from its inputs, where the
+        hashes of its dependencies must already be calculated.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+
+        Returns
+        -------
+        str
+            Stage hash.
+
+        """
+
+        # Hash stage definition and inputs
+        stage = self.stages[name]
+        return artifact_interface.hash_value(
+            {"name": name,
+             "version": stage.version,
+             "function": artifact_interface.hash_function(stage.function),
+             "parameters": stage.parameters,
+             "files": [artifact_interface.hash_file(path)
+                       for path in stage.files],
+             "dependencies": [self.keys[dependency]
+                              for dependency in stage.dependencies]})
+
+    def run(self, targets=None, force=()):
+        """
+        Function to run the pipeline, loading stages whose artifacts exist
+        and running the others.
+
+        Parameters
+        ----------
+        targets : list, optional
+            Names of the required stages. The default is None which uses all
+            stages.
+        force : tuple, optional
+            Names of the stages to rerun regardless of their artifacts.
+            The default is ().
+
+        Returns
+        -------
+        results : dict
+            Outputs of the stages.
+
+        """
+
+        # Reset executed stages
+        self.executed = []
+
+        # Iterate through stages in dependency order
+        for name in self.stage_order(targets):
+            # Calculate stage hash
+            stage = self.stages[name]
+            key = self.stage_key(name)
+            self.keys[name] = key
+
+            # Skip stages which are loaded with an unchanged hash
+            if name in self.results and self.results[name][0] == key \
+                    and name not in force:
+                continue
+
+            # Load or run stage
+            start = time.perf_counter()
+            if self.store.exists(name, key) and name not in force:
+                output = self.store.load(name, key)
+                status = "loaded"
+            else:
+                # Collect inputs
+                args = [self.results[dependency][1]
+                        for dependency in stage.dependencies]
+                kwargs = dict(stage.parameters)
+                if stage.context:
+                    kwargs["context"] = StageContext(
+                        self.store, key,
+                        {dependency: self.keys[dependency]
+                         for dependency in stage.dependencies},
+                        name, stage.version, stage.parameters,
+                        artifact_interface.hash_function(stage.function))
+
+                # Run stage and save artifact
+                output = stage.function(*args, **kwargs)
+                self.store.save(name, key, output)
+                self.executed.append(name)
+                status = "run"
+
+            # Store output and timing
+            self.results[name] = (key, output)
+            self.timings[name] = time.perf_counter() - start
+            if self.verbose:
+                LOGGER.info("Stage %s: %s (%.2f s)", name, status,
+                            self.timings[name])
+
+        return {name: output for name, (_, output) in self.results.items()}
+
+    def __getitem__(self, name):
+        """
+        Function to get the output of a stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+
+        Returns
+        -------
+        object
+            Stage output.
+
+        """
+
+        return self.results[name][1]
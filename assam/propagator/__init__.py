@@ -24,4 +24,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from .propagator_module import PropagatorModule
+from .. import _lazy
+
+# Define lazily imported attributes and their modules
+LAZY_ATTRIBUTES = {"PropagatorModule": ".propagator_module"}
+
+__all__ = list(LAZY_ATTRIBUTES)
+
+# Import attributes on first access
+__getattr__, __dir__ = _lazy.make_lazy(__name__, LAZY_ATTRIBUTES)
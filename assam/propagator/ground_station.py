@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+
+
+class GroundStation():
+
+    def __init__(self, name, latitude, longitude, altitude, min_elevation, downlink_rate):
+        """
+        Initialisation function for ground station objects.
+
+        Parameters
+        ----------
+        name : str
+            Ground station name.
+        latitude : astropy.units.quantity.Quantity
+            Geodetic latitude.
+        longitude : astropy.units.quantity.Quantity
+            Longitude.
+        altitude : astropy.units.quantity.Quantity
+            Altitude above the WGS84 ellipsoid.
+        min_elevation : astropy.units.quantity.Quantity
+            Elevation mask, above which the spacecraft can downlink.
+        downlink_rate : float
+            Downlink data rate [Mbit/s].
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Load station properties
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.min_elevation = min_elevation
+        self.downlink_rate = downlink_rate
+
+        # Declare empty variables
+        self.elevation = None
+        self.visibility = None
+        self.passes = None
+
+    def calculate_passes(self, jd, spacecraft=None):
+        """
+        Function to convert the Boolean visibility above the elevation mask
+        into a series of station passes.
+
+        Parameters
+        ----------
+        jd : numpy.ndarray
+            Julian dates of the visibility.
+        spacecraft : str, optional
+            Name of the spacecraft. The default is None.
+
+        Returns
+        -------
+        passes : list
+            List of station passes.
+
+        """
+
+        # Find edges of visible runs
+        visibility = np.concatenate(([False], self.visibility, [False]))
+        edges = np.flatnonzero(np.diff(visibility.astype(np.int8)))
+        istart = edges[0::2]
+        iend = np.clip(edges[1::2], 0, len(jd)-1)
+
+        # Remove runs which start at the end
+        keep = istart < len(jd)-1
+        istart = istart[keep]
+        iend = iend[keep]
+
+        # Create list of passes
+        passes = [StationPass(self, jd[s], jd[e], spacecraft=spacecraft)
+                  for s, e in zip(istart, iend)]
+
+        # Store passes
+        self.passes = passes
+
+        return passes
+
+
+class StationPass():
+
+    def __init__(self, station, start, end, spacecraft=None):
+        """
+        Initialisation function for a ground station pass.
+
+        Parameters
+        ----------
+        station : assam.propagator.ground_station.GroundStation
+            Corresponding ground station of the pass.
+        start : float
+            Pass start time [JD].
+        end : float
+            Pass end time [JD].
+        spacecraft : str, optional
+            Name of the spacecraft. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store station, spacecraft, and start/end times
+        self.station = station
+        self.spacecraft = spacecraft
+        self.start = start
+        self.end = end
+        self.duration = end - start
+
+        # Calculate downlink capacity [Mbit]
+        self.capacity = station.downlink_rate * self.duration * 86400
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import yaml
+
+from astropy import units as u
+import numpy as np
+
+from ..visibility import constraints
+from .ground_station import GroundStation
+
+# Define WGS84 Earth equatorial radius [km]
+EARTH_RADIUS = 6378.137
+
+
+def geodetic_to_cartesian(latitude, longitude, altitude):
+    """
+    Function to convert geodetic coordinates into Earth-fixed Cartesian
+    positions on the WGS84 ellipsoid.
+
+    Parameters
+    ----------
+    latitude : numpy.ndarray
+        Geodetic latitude [rad] with shape (N,).
+    longitude : numpy.ndarray
+        Longitude [rad] with shape (N,).
+    altitude : numpy.ndarray
+        Altitude [km] with shape (N,).
+
+    Returns
+    -------
+    positions : numpy.ndarray
+        Earth-fixed positions [km] with shape (N, 3).
+    up : numpy.ndarray
+        Local vertical unit vectors with shape (N, 3).
+
+    """
+
+    # Calculate prime vertical radius of curvature
+    e2 = constraints.EARTH_FLATTENING * (2 - constraints.EARTH_FLATTENING)
+    sin_lat = np.sin(latitude)
+    cos_lat = np.cos(latitude)
+    radius = EARTH_RADIUS / np.sqrt(1 - e2*sin_lat**2)
+
+    # Calculate positions and local vertical
+    positions = np.stack(((radius + altitude) * cos_lat * np.cos(longitude),
+                          (radius + altitude) * cos_lat * np.sin(longitude),
+                          (radius*(1 - e2) + altitude) * sin_lat), axis=-1)
+    up = np.stack((cos_lat * np.cos(longitude),
+                   cos_lat * np.sin(longitude),
+                   sin_lat), axis=-1)
+
+    return positions, up
+
+
+def elevation_angles(station_positions, up, spacecraft_positions):
+    """
+    Function to calculate the spacecraft elevation from each ground station,
+    vectorised over the stations and times.
+
+    Parameters
+    ----------
+    station_positions : numpy.ndarray
+        Earth-fixed station positions [km] with shape (N, 3).
+    up : numpy.ndarray
+        Local vertical unit vectors with shape (N, 3).
+    spacecraft_positions : numpy.ndarray
+        Earth-fixed spacecraft positions [km] with shape (T, 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        Elevation [rad] with shape (N, T).
+
+    """
+
+    # Calculate line of sight from each station
+    line_of_sight = spacecraft_positions[None, :, :] - station_positions[:, None, :]
+    distance = np.linalg.norm(line_of_sight, axis=-1)
+
+    # Calculate elevation above the local horizontal
+    sin_elevation = np.einsum("ntk,nk->nt", line_of_sight, up) / distance
+
+    return np.arcsin(np.clip(sin_elevation, -1, 1))
+
+
+def load(spacecraft_frame, path="data/ground_stations.yml", spacecraft=None):
+    """
+    Function to import ground stations and calculate their passes.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame relative to the Earth's centre of mass
+        with the same orientation as BCRS/ICRS.
+    path : str, optional
+        Path of the ground stations file.
+        The default is "data/ground_stations.yml".
+    spacecraft : str, optional
+        Name of the spacecraft, which is stored with its passes.
+        The default is None.
+
+    Raises
+    ------
+    ValueError
+        Error if ground stations file is empty.
+
+    Returns
+    -------
+    ground_stations : list
+        Ground stations and their passes.
+
+    """
+
+    # Load ground stations from config
+    with open(path, "r") as ground_stations_file:
+        ground_stations_dump = yaml.safe_load(ground_stations_file)
+
+    # Check for empty ground stations file
+    if ground_stations_dump is None:
+        raise ValueError("Empty ground stations file")
+
+    # Create included ground station objects
+    ground_stations = [GroundStation(name,
+                                     info["latitude"] * u.deg,
+                                     info["longitude"] * u.deg,
+                                     info["altitude"] * u.m,
+                                     info["min_elevation"] * u.deg,
+                                     info["downlink_rate"])
+                       for name, info in ground_stations_dump.items()
+                       if info["included"]]
+    if not ground_stations:
+        return ground_stations
+
+    # Calculate Earth-fixed spacecraft positions
+    jd = spacecraft_frame.obstime.utc.jd
+    spacecraft_position = np.moveaxis(
+        spacecraft_frame.obsgeoloc.xyz.to_value(u.km), 0, -1)
+    spacecraft_position = constraints.earth_fixed_positions(
+        spacecraft_position, jd)
+
+    # Calculate station positions
+    station_positions, up = geodetic_to_cartesian(
+        np.array([station.latitude.to_value(u.rad)
+                  for station in ground_stations]),
+        np.array([station.longitude.to_value(u.rad)
+                  for station in ground_stations]),
+        np.array([station.altitude.to_value(u.km)
+                  for station in ground_stations]))
+
+    # Calculate elevation of all stations in one pass
+    elevation = elevation_angles(station_positions, up, spacecraft_position)
+
+    # Calculate visibility and passes of each station
+    for station, station_elevation in zip(ground_stations, elevation):
+        station.elevation = station_elevation * u.rad
+        station.visibility = (station_elevation
+                              >= station.min_elevation.to_value(u.rad))
+        station.calculate_passes(spacecraft_frame.obstime.jd, spacecraft)
+
+    return ground_stations
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from astropy import units as u
+from astropy.coordinates import GCRS, CartesianRepresentation
+import numpy as np
+
+# Define Earth gravitational parameter [km^3/s^2], equatorial radius [km]
+# and J2 coefficient
+EARTH_MU = 398600.4418
+EARTH_RADIUS = 6378.137
+EARTH_J2 = 1.08262668e-3
+
+
+def solve_kepler(mean_anomaly, eccentricity, tolerance=1e-12, max_iterations=50):
+    """
+    Function to solve Kepler's equation for the eccentric anomaly using
+    vectorised Newton iterations.
+
+    Parameters
+    ----------
+    mean_anomaly : numpy.ndarray
+        Mean anomaly [rad].
+    eccentricity : float
+        Orbit eccentricity.
+    tolerance : float, optional
+        Convergence tolerance [rad]. The default is 1e-12.
+    max_iterations : int, optional
+        Maximum number of iterations. The default is 50.
+
+    Returns
+    -------
+    eccentric_anomaly : numpy.ndarray
+        Eccentric anomaly [rad].
+
+    """
+
+    # Initialise with mean anomaly, or pi for high eccentricities
+    eccentric_anomaly = np.array(mean_anomaly, dtype=float)
+    if eccentricity > 0.8:
+        eccentric_anomaly = np.full_like(eccentric_anomaly, np.pi)
+
+    # Iterate until converged
+    for _ in range(max_iterations):
+        step = ((eccentric_anomaly
+                 - eccentricity*np.sin(eccentric_anomaly)
+                 - mean_anomaly)
+                / (1 - eccentricity*np.cos(eccentric_anomaly)))
+        eccentric_anomaly -= step
+        if np.all(np.abs(step) < tolerance):
+            break
+
+    return eccentric_anomaly
+
+
+class KeplerInterface():
+
+    def __init__(self, start_time, end_time, time_step, keplerian_elements, j2=True):
+        """
+        Initialisation function of the analytic Keplerian propagator, which
+        is a stand-in for GMAT that runs offline, such as for benchmarks.
+
+        Parameters
+        ----------
+        start_time : astropy.time.core.Time
+            Mission start time.
+        end_time : astropy.time.core.Time
+            Mission end time.
+        time_step : astropy.time.core.TimeDelta
+            Time step for output state.
+        keplerian_elements : dict
+            Earth-centered Keplerian elements of the satellite, with the
+            semi-major axis "SMA" in km, eccentricity "ECC", and inclination
+            "INC", right ascension of the ascending node "RAAN", argument of
+            periapsis "AOP" and true anomaly "TA" in degrees.
+        j2 : bool, optional
+            Flag to include the secular drift of the node, periapsis and
+            mean anomaly due to J2. The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Define state variables
+        self.start_time = start_time
+        self.end_time = end_time
+        self.time_step = time_step
+        self.keplerian_elements = keplerian_elements
+        self.j2 = j2
+
+        # Declare empty variables
+        self.spacecraft_frame = None
+
+    def load_state(self):
+        """
+        Function to propagate the spacecraft state analytically.
+
+        Returns
+        -------
+        spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+            Spacecraft reference frame relative to the Earth's centre of mass
+            with the same orientation as BCRS/ICRS.
+
+        """
+
+        # Calculate time vector
+        nstep = np.rint((self.end_time-self.start_time)/self.time_step) + 1
+        spacecraft_time = self.start_time + self.time_step * np.arange(0, nstep)
+        dt = (spacecraft_time - self.start_time).sec
+
+        # Extract elements
+        elements = self.keplerian_elements
+        a = float(elements["SMA"])
+        e = float(elements.get("ECC", 0))
+        inc = np.radians(elements.get("INC", 0))
+        raan0 = np.radians(elements.get("RAAN", 0))
+        aop0 = np.radians(elements.get("AOP", 0))
+        ta0 = np.radians(elements.get("TA", 0))
+
+        # Calculate initial mean anomaly and mean motion
+        ea0 = 2*np.arctan2(np.sqrt(1 - e)*np.sin(ta0/2),
+                           np.sqrt(1 + e)*np.cos(ta0/2))
+        ma0 = ea0 - e*np.sin(ea0)
+        n = np.sqrt(EARTH_MU / a**3)
+        p = a*(1 - e**2)
+
+        # Calculate secular rates due to J2
+        if self.j2:
+            factor = 1.5*EARTH_J2*(EARTH_RADIUS/p)**2*n
+            raan_rate = -factor*np.cos(inc)
+            aop_rate = 0.5*factor*(5*np.cos(inc)**2 - 1)
+            ma_rate = n + 0.5*factor*np.sqrt(1 - e**2)*(3*np.cos(inc)**2 - 1)
+        else:
+            raan_rate, aop_rate, ma_rate = 0.0, 0.0, n
+
+        # Propagate angles
+        raan = raan0 + raan_rate*dt
+        aop = aop0 + aop_rate*dt
+        ma = ma0 + ma_rate*dt
+
+        # Calculate true anomaly and radius
+        ea = solve_kepler(np.mod(ma, 2*np.pi), e)
+        ta = 2*np.arctan2(np.sqrt(1 + e)*np.sin(ea/2),
+                          np.sqrt(1 - e)*np.cos(ea/2))
+        r = a*(1 - e*np.cos(ea))
+
+        # Calculate position and velocity in the perifocal frame
+        h = np.sqrt(EARTH_MU*p)
+        pos_p, pos_q = r*np.cos(ta), r*np.sin(ta)
+        vel_p, vel_q = -EARTH_MU/h*np.sin(ta), EARTH_MU/h*(e + np.cos(ta))
+
+        # Calculate perifocal axes in the Earth-centred inertial frame
+        axis_p = np.stack((np.cos(raan)*np.cos(aop)
+                           - np.sin(raan)*np.sin(aop)*np.cos(inc),
+                           np.sin(raan)*np.cos(aop)
+                           + np.cos(raan)*np.sin(aop)*np.cos(inc),
+                           np.sin(aop)*np.sin(inc)))
+        axis_q = np.stack((-np.cos(raan)*np.sin(aop)
+                           - np.sin(raan)*np.cos(aop)*np.cos(inc),
+                           -np.sin(raan)*np.sin(aop)
+                           + np.cos(raan)*np.cos(aop)*np.cos(inc),
+                           np.cos(aop)*np.sin(inc)))
+
+        # Rotate into the Earth-centred inertial frame
+        position = axis_p*pos_p + axis_q*pos_q
+        velocity = axis_p*vel_p + axis_q*vel_q
+
+        # Add astropy units to position and velocity
+        spacecraft_position = CartesianRepresentation(*position, unit=u.km)
+        spacecraft_velocity = CartesianRepresentation(*velocity,
+                                                      unit=u.km/u.s)
+
+        # Generate spacecraft reference frame
+        spacecraft_frame = GCRS(representation_type="cartesian",
+                                obstime=spacecraft_time,
+                                obsgeoloc=spacecraft_position,
+                                obsgeovel=spacecraft_velocity)
+
+        # Store spacecraft frame
+        self.spacecraft_frame = spacecraft_frame
+
+        return spacecraft_frame
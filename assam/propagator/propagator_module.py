@@ -24,8 +24,10 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from . import solar_body_interface
+from . import ground_station_interface, solar_body_interface
 from .gmat_interface import GMATInterface
+from .kepler_interface import KeplerInterface
+from ..instrumentation import instrument
 
 
 class PropagatorModule():
@@ -42,10 +44,13 @@ class PropagatorModule():
             Mission end time.
         time_step : astropy.time.core.TimeDelta
             Time step for output state.
-        keplerian_elements : dict
-            Earth-centered Keplerian elements of the satellite.
+        keplerian_elements : dict or list
+            Earth-centered Keplerian elements of the satellite, or a list of
+            Keplerian elements for a constellation.
         propagator : str, optional
-            Propagator option. The default is "gmat".
+            Propagator option, either "gmat", or "kepler" for the analytic
+            Keplerian propagator with J2 secular drift, which runs without
+            GMAT. The default is "gmat".
 
         Returns
         -------
@@ -64,7 +69,11 @@ class PropagatorModule():
         self.propagator_object = None
         self.spacecraft_frame = None
         self.solar_bodies = None
+        self.spacecraft_frames = None
+        self.constellation_solar_bodies = None
+        self.ground_stations = None
 
+    @instrument(count=lambda frame, self: len(frame.obstime))
     def propagate_spacecraft(self):
         """
         Function to handle propagators for satellite frame generation.
@@ -98,6 +107,19 @@ class PropagatorModule():
 
             # Extract spacecraft frame
             spacecraft_frame = gmat.spacecraft_frame
+        elif self.propagator == "kepler":
+            # Run analytic orbit propagation
+            kepler = KeplerInterface(self.start_time,
+                                     self.end_time,
+                                     self.time_step,
+                                     self.keplerian_elements)
+            kepler.load_state()
+
+            # Store propagator object
+            self.propagator_object = kepler
+
+            # Extract spacecraft frame
+            spacecraft_frame = kepler.spacecraft_frame
         else:
             # Raise error if propagator not available
             raise ValueError("Invalid propagator")
@@ -107,10 +129,20 @@ class PropagatorModule():
 
         return spacecraft_frame
 
-    def get_solar_bodies(self):
+    @instrument(count=lambda solar_bodies, self: len(solar_bodies))
+    def get_solar_bodies(self, path="data/solar_bodies.yml", ephem="jpl"):
         """
         Function to get the import solar bodies.
 
+        Parameters
+        ----------
+        path : str, optional
+            Path of the solar bodies file.
+            The default is "data/solar_bodies.yml".
+        ephem : str, optional
+            Ephemeris selection, where "builtin" runs offline.
+            The default is "jpl".
+
         Returns
         -------
         solar_bodies : list
@@ -119,9 +151,97 @@ class PropagatorModule():
         """
 
         # Load solar bodies
-        solar_bodies = solar_body_interface.load(self.spacecraft_frame)
+        solar_bodies = solar_body_interface.load(self.spacecraft_frame,
+                                                 ephem=ephem,
+                                                 path=path)
 
         # Store output
         self.solar_bodies = solar_bodies
 
         return solar_bodies
+
+    @instrument(count=lambda stations, self: len(stations))
+    def get_ground_stations(self, path="data/ground_stations.yml"):
+        """
+        Function to import ground stations and calculate their passes of the
+        spacecraft above each station's elevation mask.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the ground stations file.
+            The default is "data/ground_stations.yml".
+
+        Returns
+        -------
+        ground_stations : list
+            Ground stations and their passes.
+
+        """
+
+        # Load ground stations
+        ground_stations = ground_station_interface.load(self.spacecraft_frame,
+                                                        path=path)
+
+        # Store output
+        self.ground_stations = ground_stations
+
+        return ground_stations
+
+    @instrument(count=lambda frames, self: len(frames))
+    def propagate_constellation(self):
+        """
+        Function to propagate each spacecraft of a constellation.
+
+        Returns
+        -------
+        spacecraft_frames : list
+            Spacecraft reference frames in the order of the Keplerian
+            elements.
+
+        """
+
+        # Propagate each spacecraft
+        constellation_elements = self.keplerian_elements
+        spacecraft_frames = []
+        try:
+            for keplerian_elements in constellation_elements:
+                self.keplerian_elements = keplerian_elements
+                spacecraft_frames.append(self.propagate_spacecraft())
+        finally:
+            self.keplerian_elements = constellation_elements
+
+        # Store spacecraft frames
+        self.spacecraft_frames = spacecraft_frames
+
+        return spacecraft_frames
+
+    @instrument(count=lambda solar_bodies, self: len(solar_bodies))
+    def get_constellation_solar_bodies(self, path="data/solar_bodies.yml", ephem="jpl"):
+        """
+        Function to get the solar bodies of each spacecraft of a
+        constellation, calculating their ephemerides once.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the solar bodies file.
+            The default is "data/solar_bodies.yml".
+        ephem : str, optional
+            Ephemeris selection. The default is "jpl".
+
+        Returns
+        -------
+        constellation_solar_bodies : list
+            Solar system bodies and their properties for each spacecraft.
+
+        """
+
+        # Load solar bodies
+        constellation_solar_bodies = solar_body_interface.load_constellation(
+            self.spacecraft_frames, ephem=ephem, path=path)
+
+        # Store output
+        self.constellation_solar_bodies = constellation_solar_bodies
+
+        return constellation_solar_bodies
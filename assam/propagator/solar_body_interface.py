@@ -28,14 +28,15 @@ import multiprocessing
 import yaml
 
 from astropy import units as u
-from astropy.coordinates import solar_system_ephemeris, get_body
+from astropy.coordinates import CartesianRepresentation, SkyCoord, solar_system_ephemeris, get_body
 import numpy as np
 from tqdm import tqdm
 
+from ..visibility import geometry
 from .solar_body import SolarBody
 
 
-def load(spacecraft_frame, ephem="jpl", num_workers=None):
+def load(spacecraft_frame, ephem="jpl", num_workers=None, path="data/solar_bodies.yml"):
     """
     Function to get the coordinates of solar bodies.
 
@@ -48,6 +49,8 @@ def load(spacecraft_frame, ephem="jpl", num_workers=None):
         Ephemeris selection.
     num_workers : int, optional
         Number of workers for multiprocessing.
+    path : str, optional
+        Path of the solar bodies file. The default is "data/solar_bodies.yml".
 
     Raises
     ------
@@ -65,8 +68,7 @@ def load(spacecraft_frame, ephem="jpl", num_workers=None):
     solar_system_ephemeris.set(ephem)
 
     # Load solar bodies of interest from config
-    # TODO: implement default and optional paths
-    with open("data/solar_bodies.yml", "r") as solar_bodies_file:
+    with open(path, "r") as solar_bodies_file:
         solar_bodies_dump = yaml.safe_load(solar_bodies_file)
 
     # Check for empty solar bodies file
@@ -97,6 +99,90 @@ def load(spacecraft_frame, ephem="jpl", num_workers=None):
     return solar_bodies
 
 
+def load_constellation(spacecraft_frames, ephem="jpl", path="data/solar_bodies.yml"):
+    """
+    Function to get the coordinates of solar bodies for each spacecraft of a
+    constellation sharing the same times.
+
+    The geocentric position of each solar body is calculated once from the
+    ephemeris, and the position relative to each spacecraft follows from its
+    position, which is the parallax of near bodies. The aberration due to
+    the spacecraft velocity is neglected.
+
+    Parameters
+    ----------
+    spacecraft_frames : list
+        Spacecraft reference frames with the same observation times.
+    ephem : str, optional
+        Ephemeris selection.
+    path : str, optional
+        Path of the solar bodies file. The default is "data/solar_bodies.yml".
+
+    Raises
+    ------
+    ValueError
+        Error if solar bodies file is empty, or if the spacecraft frames
+        have different times.
+
+    Returns
+    -------
+    constellation_solar_bodies : list
+        Solar system bodies and their properties for each spacecraft.
+
+    """
+
+    # Load solar bodies of interest from config
+    with open(path, "r") as solar_bodies_file:
+        solar_bodies_dump = yaml.safe_load(solar_bodies_file)
+
+    # Check for empty solar bodies file
+    if solar_bodies_dump is None:
+        raise ValueError("Empty solar bodies file")
+
+    # Check spacecraft times
+    obstime = spacecraft_frames[0].obstime
+    for spacecraft_frame in spacecraft_frames[1:]:
+        if len(spacecraft_frame.obstime) != len(obstime) or \
+                np.any(spacecraft_frame.obstime.jd != obstime.jd):
+            raise ValueError("Spacecraft frames have different times")
+
+    # Calculate geocentric positions of included solar bodies once
+    solar_bodies_info = {name: info for name, info in solar_bodies_dump.items()
+                         if info["included"]}
+    positions = geometry.geocentric_positions(list(solar_bodies_info),
+                                              obstime, ephem)
+
+    # Iterate through spacecraft
+    constellation_solar_bodies = []
+    for spacecraft_frame in tqdm(spacecraft_frames, desc="Solar Body Generation"):
+        # Extract spacecraft position
+        spacecraft_position = spacecraft_frame.obsgeoloc.xyz.to_value(u.km)
+
+        # Iterate through solar bodies
+        solar_bodies = []
+        for solar_body_name, solar_body_info in solar_bodies_info.items():
+            # Calculate position relative to the spacecraft
+            relative = positions[solar_body_name].T - spacecraft_position
+            solar_body_coords = SkyCoord(spacecraft_frame.realize_frame(
+                CartesianRepresentation(relative, unit=u.km)))
+
+            # Calculate solar body angular radius from the slant range
+            slant_range = solar_body_coords.distance
+            solar_body_radius = solar_body_info["radius"] * u.m
+            solar_body_angular_radius = np.arcsin(solar_body_radius / slant_range)
+
+            # Create solar body object
+            solar_bodies.append(SolarBody(solar_body_name,
+                                          solar_body_coords,
+                                          solar_body_radius,
+                                          solar_body_angular_radius,
+                                          solar_body_info["soft_radius"] * u.deg))
+
+        constellation_solar_bodies.append(solar_bodies)
+
+    return constellation_solar_bodies
+
+
 def load_worker(worker_params):
     """
     Worker function for loading solar bodies.
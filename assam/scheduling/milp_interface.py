@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+
+
+def interval_cliques(start, end, indices=None):
+    """
+    Function to find the maximal cliques of an interval conflict graph with
+    a sweep over the interval start and end points. Intervals are treated as
+    half-open, so touching intervals do not conflict.
+
+    Parameters
+    ----------
+    start : numpy.ndarray
+        Interval start times.
+    end : numpy.ndarray
+        Interval end times.
+    indices : numpy.ndarray, optional
+        Indices to label the intervals. The default is None which uses the
+        position of the intervals in the input arrays.
+
+    Returns
+    -------
+    cliques : list
+        List of arrays of interval indices in each maximal clique.
+
+    """
+
+    # Set default indices
+    if indices is None:
+        indices = np.arange(len(start))
+
+    # Create events sorted by time, with end events before start events at
+    # equal times so that touching intervals do not conflict
+    times = np.concatenate((start, end))
+    is_start = np.concatenate((np.ones(len(start), dtype=bool),
+                               np.zeros(len(end), dtype=bool)))
+    labels = np.concatenate((indices, indices))
+    order = np.lexsort((is_start, times))
+
+    # Sweep through events, emitting the active set as a maximal clique when
+    # an end event follows a start event
+    cliques = []
+    active = set()
+    pending = False
+    for ievent in order:
+        if is_start[ievent]:
+            active.add(labels[ievent])
+            pending = True
+        else:
+            if pending:
+                cliques.append(np.fromiter(active, dtype=int, count=len(active)))
+                pending = False
+            active.discard(labels[ievent])
+
+    return cliques
+
+
+class MILPInterface():
+
+    def __init__(self, start, end, benefit, itarget, quota, revisit, capacity=1, slew_time=0.0, ispacecraft=None, exclusive=False):
+        """
+        Initialisation function of the MILP interface.
+
+        Parameters
+        ----------
+        start : numpy.ndarray
+            Contact start times [JD].
+        end : numpy.ndarray
+            Contact end times [JD].
+        benefit : numpy.ndarray
+            Contact benefits.
+        itarget : numpy.ndarray
+            Target index of each contact.
+        quota : numpy.ndarray
+            Maximum total scheduled duration per target [days].
+        revisit : numpy.ndarray
+            Minimum time between scheduled contacts per target [days].
+        capacity : int, optional
+            Maximum number of simultaneous contacts. The default is 1.
+        slew_time : float, optional
+            Time required between consecutive contacts [days].
+            The default is 0.0.
+        ispacecraft : numpy.ndarray, optional
+            Spacecraft index of each contact, where the capacity and slew
+            time apply to each spacecraft separately. The default is None
+            which treats all contacts as one spacecraft.
+        exclusive : bool, optional
+            Flag to prevent overlapping contacts of the same target.
+            The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Define state variables
+        self.start = start
+        self.end = end
+        self.benefit = benefit
+        self.itarget = itarget
+        self.quota = quota
+        self.revisit = revisit
+        self.capacity = capacity
+        self.slew_time = slew_time
+        self.ispacecraft = ispacecraft
+        self.exclusive = exclusive
+
+        # Declare empty variables
+        self.model = None
+        self.solution = None
+        self.info = None
+
+    def generate_model(self):
+        """
+        Function to generate the sparse model. Capacity, slew and revisit
+        constraints are expressed over the maximal cliques of the interval
+        conflict graphs rather than over conflicting pairs.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Declare sparse row-wise constraint matrix
+        row_start = [0]
+        row_index = []
+        row_value = []
+        row_upper = []
+
+        def add_row(indices, values, upper):
+            row_index.extend(indices)
+            row_value.extend(values)
+            row_start.append(len(row_index))
+            row_upper.append(upper)
+
+        # Add capacity constraints of each spacecraft, padding the contacts
+        # by the slew time
+        if self.ispacecraft is None:
+            groups = [np.arange(len(self.start))]
+        else:
+            groups = [np.flatnonzero(self.ispacecraft == i)
+                      for i in np.unique(self.ispacecraft)]
+        for indices in groups:
+            for clique in interval_cliques(self.start[indices],
+                                           self.end[indices] + self.slew_time,
+                                           indices):
+                if len(clique) > self.capacity:
+                    add_row(clique, np.ones(len(clique)), self.capacity)
+
+        # Iterate through targets to add quota and revisit constraints
+        duration = self.end - self.start
+        for t in range(len(self.quota)):
+            # Find contacts of the target
+            indices = np.flatnonzero(self.itarget == t)
+
+            # Add quota constraint if it can be violated
+            if np.sum(duration[indices]) > self.quota[t]:
+                add_row(indices, duration[indices], self.quota[t])
+
+            # Add revisit constraints, padding the contacts by the revisit time
+            if self.revisit[t] > 0:
+                for clique in interval_cliques(self.start[indices],
+                                               self.end[indices] + self.revisit[t],
+                                               indices):
+                    if len(clique) > 1:
+                        add_row(clique, np.ones(len(clique)), 1)
+
+            # Add exclusivity constraints, which are otherwise implied by the
+            # revisit constraints
+            elif self.exclusive:
+                for clique in interval_cliques(self.start[indices],
+                                               self.end[indices],
+                                               indices):
+                    if len(clique) > 1:
+                        add_row(clique, np.ones(len(clique)), 1)
+
+        # Store model
+        self.model = {"row_start": np.array(row_start, dtype=np.int32),
+                      "row_index": np.array(row_index, dtype=np.int32),
+                      "row_value": np.array(row_value, dtype=float),
+                      "row_upper": np.array(row_upper, dtype=float)}
+
+    def repair_solution(self, solution):
+        """
+        Function to make a candidate solution feasible by removing the least
+        beneficial contacts from violated constraints.
+
+        Parameters
+        ----------
+        solution : numpy.ndarray
+            Candidate solution of contact selections.
+
+        Returns
+        -------
+        solution : numpy.ndarray
+            Feasible solution of contact selections.
+
+        """
+
+        # Extract model
+        row_start = self.model["row_start"]
+        row_index = self.model["row_index"]
+        row_value = self.model["row_value"]
+        row_upper = self.model["row_upper"]
+
+        # Iterate through constraints, removing contacts until satisfied
+        solution = np.array(solution, dtype=float)
+        for irow in range(len(row_upper)):
+            indices = row_index[row_start[irow]:row_start[irow+1]]
+            values = row_value[row_start[irow]:row_start[irow+1]]
+            selected = indices[solution[indices] > 0.5]
+            selected = selected[np.argsort(self.benefit[selected])]
+            while np.dot(values, solution[indices]) > row_upper[irow] + 1e-9:
+                solution[selected[0]] = 0.0
+                selected = selected[1:]
+
+        return solution
+
+    def solve(self, time_limit=None, mip_gap=None, warm_start=None, verbose=False):
+        """
+        Function to solve the model with HiGHS.
+
+        Parameters
+        ----------
+        time_limit : float, optional
+            Solver time limit [s]. The default is None which applies no limit.
+        mip_gap : float, optional
+            Relative optimality gap at which to terminate. The default is
+            None which uses the solver default.
+        warm_start : numpy.ndarray, optional
+            Initial solution of contact selections, which is repaired to
+            satisfy the constraints. The default is None.
+        verbose : bool, optional
+            Flag to display solver output. The default is False.
+
+        Raises
+        ------
+        ImportError
+            Error if HiGHS is not installed.
+
+        Returns
+        -------
+        solution : numpy.ndarray
+            Boolean array, true for scheduled contacts.
+
+        """
+
+        # Import HiGHS
+        try:
+            import highspy
+        except ImportError as error:
+            raise ImportError("MILP scheduling requires highspy") from error
+
+        # Generate model if required
+        if self.model is None:
+            self.generate_model()
+
+        # Define linear program
+        ncol = len(self.benefit)
+        nrow = len(self.model["row_upper"])
+        lp = highspy.HighsLp()
+        lp.num_col_ = ncol
+        lp.num_row_ = nrow
+        lp.sense_ = highspy.ObjSense.kMaximize
+        lp.col_cost_ = self.benefit
+        lp.col_lower_ = np.zeros(ncol)
+        lp.col_upper_ = np.ones(ncol)
+        lp.row_lower_ = np.full(nrow, -highspy.kHighsInf)
+        lp.row_upper_ = self.model["row_upper"]
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.start_ = self.model["row_start"]
+        lp.a_matrix_.index_ = self.model["row_index"]
+        lp.a_matrix_.value_ = self.model["row_value"]
+        lp.integrality_ = [highspy.HighsVarType.kInteger] * ncol
+
+        # Create solver and set options
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", verbose)
+        if time_limit is not None:
+            h.setOptionValue("time_limit", float(time_limit))
+        if mip_gap is not None:
+            h.setOptionValue("mip_rel_gap", float(mip_gap))
+        h.passModel(lp)
+
+        # Set warm start solution
+        if warm_start is not None:
+            initial = highspy.HighsSolution()
+            initial.col_value = self.repair_solution(warm_start)
+            initial.value_valid = True
+            h.setSolution(initial)
+
+        # Solve model
+        h.run()
+
+        # Extract solution and solver information
+        info = h.getInfo()
+        self.info = {"status": h.modelStatusToString(h.getModelStatus()),
+                     "objective": info.objective_function_value,
+                     "bound": info.mip_dual_bound,
+                     "gap": info.mip_gap,
+                     "runtime": h.getRunTime()}
+        self.solution = np.array(h.getSolution().col_value) > 0.5
+
+        return self.solution
@@ -24,11 +24,122 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import bisect
+import copy
+import heapq
 import operator
 
 import numpy as np
 from tqdm import tqdm
 
+from ..instrumentation import instrument
+from ..propagator.ground_station import StationPass
+from ..visibility import contact_interface
+from .milp_interface import MILPInterface
+
+
+def contact_arrays(contacts):
+    """
+    Function to extract contact properties into arrays.
+
+    Parameters
+    ----------
+    contacts : list
+        List of contacts.
+
+    Returns
+    -------
+    start : numpy.ndarray
+        Contact start times [JD].
+    end : numpy.ndarray
+        Contact end times [JD].
+    benefit : numpy.ndarray
+        Contact benefits.
+    targets : list
+        Unique targets of the contacts.
+    itarget : numpy.ndarray
+        Index of the target of each contact.
+
+    """
+
+    # Extract contact properties
+    ncontacts = len(contacts)
+    start = np.fromiter((contact.start for contact in contacts),
+                        dtype=float, count=ncontacts)
+    end = np.fromiter((contact.end for contact in contacts),
+                      dtype=float, count=ncontacts)
+    benefit = np.fromiter((contact.benefit for contact in contacts),
+                          dtype=float, count=ncontacts)
+
+    # Map contacts to target indices
+    targets = list({id(contact.target): contact.target
+                    for contact in contacts}.values())
+    target_index = {id(target): i for i, target in enumerate(targets)}
+    itarget = np.fromiter((target_index[id(contact.target)]
+                           for contact in contacts),
+                          dtype=int, count=ncontacts)
+
+    return start, end, benefit, targets, itarget
+
+
+def target_parameter(value, target, default=None):
+    """
+    Function to extract a per-target scheduling parameter.
+
+    Parameters
+    ----------
+    value
+        Parameter value, either a scalar applied to all targets, or a
+        dictionary of values keyed by target name.
+    target : assam.visibility.astro_target.AstroTarget
+        Target to extract the parameter for.
+    default : optional
+        Default value if the parameter is not set. The default is None.
+
+    Returns
+    -------
+    value
+        Parameter value for the target.
+
+    """
+
+    # Extract value from dictionary if one is supplied
+    if isinstance(value, dict):
+        value = value.get(target.name, default)
+
+    # Return default value if the parameter is not set
+    if value is None:
+        return default
+    else:
+        return value
+
+
+def diminished_benefit(benefits, factor):
+    """
+    Function to calculate the total benefit of a set of contacts of a single
+    target with diminishing returns, where the k-th most beneficial contact is
+    scaled by factor**k.
+
+    Parameters
+    ----------
+    benefits : list
+        Benefits of the contacts.
+    factor : float
+        Diminishing returns factor.
+
+    Returns
+    -------
+    numpy.float64
+        Total diminished benefit.
+
+    """
+
+    # Sort benefits in descending order
+    benefits = np.sort(np.asarray(benefits, dtype=float))[::-1]
+
+    # Calculate total diminished benefit
+    return np.sum(benefits * factor**np.arange(len(benefits)))
+
 
 class SchedulingModule():
 
@@ -53,6 +164,10 @@ class SchedulingModule():
         # Declare empty variables
         self.contacts = None
         self.scheduled_contacts = None
+        self.solver_info = None
+        self.spacecraft_schedules = None
+        self.downlinks = None
+        self.storage = None
 
     def combine_contacts(self):
         """
@@ -76,6 +191,7 @@ class SchedulingModule():
         # Return contacts
         return contacts
 
+    @instrument(count=lambda _, self: len(self.contacts))
     def simple_dynamic_schedule(self):
         """
         Function to schedule contacts using the simple dynamic linear
@@ -154,3 +270,665 @@ class SchedulingModule():
         
         # Return scheduled contacts and optimal benefit
         return scheduled_contacts, benefit_optimal
+
+    @instrument(count=lambda _, self: len(self.contacts))
+    def constrained_greedy_schedule(self, max_duration=None, min_revisit=None, diminishing_factor=1.0):
+        """
+        Function to schedule contacts using a greedy method with repair,
+        subject to per-target quota, revisit and diminishing returns
+        constraints.
+
+        Contacts are selected in order of their marginal benefit, which is
+        lazily updated as the contacts of each target are scheduled. A
+        contact is rejected if it overlaps with a scheduled contact, exceeds
+        its target's quota, or violates its target's revisit time. The
+        schedule is then repaired by swapping rejected contacts with single
+        conflicting scheduled contacts where this increases the total benefit.
+
+        Parameters
+        ----------
+        max_duration : float or dict, optional
+            Maximum total scheduled duration per target [days], either for all
+            targets or keyed by target name. The default is None which
+            applies no limit.
+        min_revisit : float or dict, optional
+            Minimum time between scheduled contacts of a target [days], either
+            for all targets or keyed by target name. The default is None
+            which applies no limit.
+        diminishing_factor : float or dict, optional
+            Factor applied to the benefit of each successive contact of a
+            target, either for all targets or keyed by target name.
+            The default is 1.0 which applies no diminishing returns.
+
+        Returns
+        -------
+        scheduled_contacts : list
+            List of scheduled contacts.
+        benefit_total : numpy.float64
+            Total benefit corresponding to the scheduled contacts.
+
+        """
+
+        # Extract contacts and their properties
+        contacts = self.contacts
+        ncontacts = len(contacts)
+        start, end, benefit, targets, itarget = contact_arrays(contacts)
+        duration = end - start
+
+        # Extract per-target parameters
+        quota = np.array([target_parameter(max_duration, target, np.inf)
+                          for target in targets], dtype=float)
+        revisit = np.array([target_parameter(min_revisit, target, 0.0)
+                            for target in targets], dtype=float)
+        factor = np.array([target_parameter(diminishing_factor, target, 1.0)
+                           for target in targets], dtype=float)
+
+        # Declare schedule state: the timeline of all scheduled contacts,
+        # the timeline of each target, the used quota, and the scheduled
+        # contact count of each target
+        timeline = []
+        target_timelines = [[] for _ in targets]
+        used = np.zeros(len(targets))
+        count = np.zeros(len(targets), dtype=int)
+
+        def conflicts(i):
+            # Find scheduled contacts overlapping with the contact using the
+            # sorted timeline of (start, end, index) tuples
+            lo = bisect.bisect_right(timeline, (start[i], np.inf, ncontacts))
+            if lo > 0 and timeline[lo-1][1] > start[i]:
+                lo -= 1
+            hi = bisect.bisect_left(timeline, (end[i], -np.inf, -1))
+            return [entry[2] for entry in timeline[lo:hi]]
+
+        def revisit_feasible(i, exclude=None):
+            # Check the revisit time against the neighbouring contacts of the
+            # same target
+            t = itarget[i]
+            entries = [entry for entry in target_timelines[t]
+                       if entry[2] != exclude]
+            k = bisect.bisect_left(entries, (start[i], end[i], i))
+            if k > 0 and start[i] - entries[k-1][1] < revisit[t]:
+                return False
+            if k < len(entries) and entries[k][0] - end[i] < revisit[t]:
+                return False
+            return True
+
+        def add(i):
+            # Add contact to the timelines and update target state
+            entry = (start[i], end[i], i)
+            bisect.insort(timeline, entry)
+            bisect.insort(target_timelines[itarget[i]], entry)
+            used[itarget[i]] += duration[i]
+            count[itarget[i]] += 1
+
+        def remove(i):
+            # Remove contact from the timelines and update target state
+            entry = (start[i], end[i], i)
+            timeline.remove(entry)
+            target_timelines[itarget[i]].remove(entry)
+            used[itarget[i]] -= duration[i]
+            count[itarget[i]] -= 1
+
+        def target_benefit(t, include=(), exclude=()):
+            # Calculate the diminished benefit of a target's contacts
+            indices = [entry[2] for entry in target_timelines[t]
+                       if entry[2] not in exclude] + list(include)
+            return diminished_benefit(benefit[indices], factor[t])
+
+        # Create priority queue of (negative marginal benefit, target count,
+        # contact index), initially without diminishing returns
+        queue = [(-benefit[i], 0, i) for i in range(ncontacts)]
+        heapq.heapify(queue)
+
+        # Greedily select contacts
+        rejected = []
+        with tqdm(total=ncontacts, desc="Scheduling") as pbar:
+            while queue:
+                marginal, k, i = heapq.heappop(queue)
+                t = itarget[i]
+
+                # Update stale marginal benefits lazily
+                if k != count[t]:
+                    marginal = -benefit[i] * factor[t]**count[t]
+                    heapq.heappush(queue, (marginal, count[t], i))
+                    continue
+
+                # Update progress bar
+                pbar.update()
+
+                # Reject contacts violating the constraints
+                if (used[t] + duration[i] > quota[t]
+                        or conflicts(i)
+                        or not revisit_feasible(i)):
+                    rejected.append(i)
+                    continue
+
+                # Schedule contact
+                add(i)
+
+        # Repair schedule by swapping rejected contacts with a single
+        # conflicting contact where this improves the total benefit
+        for i in tqdm(sorted(rejected, key=lambda i: -benefit[i]), desc="Repairing"):
+            # Find conflicting contacts, skipping if no single swap exists
+            conflicting = conflicts(i)
+            if len(conflicting) > 1:
+                continue
+            j = conflicting[0] if conflicting else None
+
+            # Calculate quota change and check feasibility
+            t = itarget[i]
+            freed = duration[j] if j is not None and itarget[j] == t else 0.0
+            if used[t] - freed + duration[i] > quota[t]:
+                continue
+            if not revisit_feasible(i, exclude=j):
+                continue
+
+            # Calculate the change in benefit of the affected targets
+            exclude = () if j is None else (j,)
+            gain = target_benefit(t, include=(i,), exclude=exclude) \
+                - target_benefit(t)
+            if j is not None and itarget[j] != t:
+                gain += target_benefit(itarget[j], exclude=exclude) \
+                    - target_benefit(itarget[j])
+
+            # Swap contacts if the total benefit increases
+            if gain > 0:
+                if j is not None:
+                    remove(j)
+                add(i)
+
+        # Extract scheduled contacts in chronological order
+        scheduled_contacts = [contacts[entry[2]] for entry in timeline]
+
+        # Calculate total benefit
+        benefit_total = np.sum([target_benefit(t) for t in range(len(targets))])
+
+        # Store scheduled contacts
+        self.scheduled_contacts = scheduled_contacts
+
+        # Return scheduled contacts and total benefit
+        return scheduled_contacts, benefit_total
+
+    @instrument(count=lambda _, self: len(self.contacts))
+    def milp_schedule(self, max_duration=None, min_revisit=None, capacity=1, slew_time=0.0, time_limit=None, mip_gap=None, warm_start=False, verbose=False, per_spacecraft=False, exclusive=False):
+        """
+        Function to schedule contacts optimally by solving a mixed-integer
+        linear program with HiGHS. This is intended to benchmark the
+        heuristic schedulers, and does not model diminishing returns.
+
+        Parameters
+        ----------
+        max_duration : float or dict, optional
+            Maximum total scheduled duration per target [days], either for all
+            targets or keyed by target name. The default is None which
+            applies no limit.
+        min_revisit : float or dict, optional
+            Minimum time between scheduled contacts of a target [days], either
+            for all targets or keyed by target name. The default is None
+            which applies no limit.
+        capacity : int, optional
+            Maximum number of simultaneous contacts. The default is 1.
+        slew_time : float, optional
+            Time required between consecutive contacts [days].
+            The default is 0.0.
+        time_limit : float, optional
+            Solver time limit [s]. The default is None which applies no limit.
+        mip_gap : float, optional
+            Relative optimality gap at which to terminate. The default is
+            None which uses the solver default.
+        warm_start : bool, optional
+            Flag to warm start the solver from the simple dynamic schedule.
+            The default is False.
+        verbose : bool, optional
+            Flag to display solver output. The default is False.
+        per_spacecraft : bool, optional
+            Flag to apply the capacity and slew time to the contacts of each
+            spacecraft separately, for constellations. The default is False.
+        exclusive : bool, optional
+            Flag to prevent overlapping contacts of the same target.
+            The default is False.
+
+        Returns
+        -------
+        scheduled_contacts : list
+            List of scheduled contacts.
+        benefit_optimal : numpy.float64
+            Benefit corresponding to the scheduled contacts.
+
+        """
+
+        # Calculate warm start schedule, which also sorts the contacts
+        if warm_start:
+            self.simple_dynamic_schedule()
+            warm_start_ids = {id(contact) for contact in self.scheduled_contacts}
+
+        # Extract contacts and their properties
+        contacts = self.contacts
+        start, end, benefit, targets, itarget = contact_arrays(contacts)
+
+        # Extract per-target parameters
+        quota = np.array([target_parameter(max_duration, target, np.inf)
+                          for target in targets], dtype=float)
+        revisit = np.array([target_parameter(min_revisit, target, 0.0)
+                            for target in targets], dtype=float)
+
+        # Extract spacecraft index of each contact
+        if per_spacecraft:
+            _, ispacecraft = np.unique([str(getattr(contact, "spacecraft", None))
+                                        for contact in contacts],
+                                       return_inverse=True)
+        else:
+            ispacecraft = None
+
+        # Create MILP interface and generate model
+        milp = MILPInterface(start, end, benefit, itarget, quota, revisit,
+                             capacity=capacity, slew_time=slew_time,
+                             ispacecraft=ispacecraft, exclusive=exclusive)
+        milp.generate_model()
+
+        # Create warm start solution
+        if warm_start:
+            initial = np.array([id(contact) in warm_start_ids
+                                for contact in contacts], dtype=float)
+        else:
+            initial = None
+
+        # Solve model
+        with tqdm(total=1, desc="MILP Scheduling") as pbar:
+            solution = milp.solve(time_limit=time_limit,
+                                  mip_gap=mip_gap,
+                                  warm_start=initial,
+                                  verbose=verbose)
+            pbar.update(1)
+
+        # Extract scheduled contacts in chronological order
+        scheduled_contacts = [contacts[i] for i in np.flatnonzero(solution)]
+        scheduled_contacts.sort(key=operator.attrgetter("start"))
+        benefit_optimal = np.sum(benefit[solution])
+
+        # Store solver information and scheduled contacts
+        self.solver_info = milp.info
+        self.scheduled_contacts = scheduled_contacts
+
+        # Return scheduled contacts and optimal benefit
+        return scheduled_contacts, benefit_optimal
+
+    @instrument(count=lambda _, self: len(self.contacts))
+    def constellation_schedule(self, method="simple_dynamic_schedule", exclusive=True, **options):
+        """
+        Function to schedule contacts across the spacecraft of a
+        constellation, where each spacecraft observes one target at a time.
+
+        With the MILP method, all spacecraft are scheduled jointly by one
+        model with the capacity applied to each spacecraft, which gives the
+        optimal constellation schedule.
+
+        With the other methods, spacecraft are scheduled in turn, in order
+        of their total contact benefit, so the constellation schedule is a
+        heuristic even if the method is optimal for a single spacecraft.
+        With exclusive targets, contacts which overlap an observation of
+        the same target already scheduled on another spacecraft are removed
+        first, so that spacecraft do not duplicate observations. Per-target
+        options apply across the whole constellation: each spacecraft is
+        given the quota remaining after the previous spacecraft, contacts
+        violating the revisit time of observations on the previous
+        spacecraft are removed, and the contact benefits are diminished by
+        the number of previous observations of their target.
+
+        Parameters
+        ----------
+        method : str, optional
+            Name of the scheduling method used for each spacecraft.
+            The default is "simple_dynamic_schedule".
+        exclusive : bool, optional
+            Flag to prevent simultaneous observations of the same target by
+            different spacecraft. The default is True.
+        **options
+            Keyword arguments of the scheduling method.
+
+        Raises
+        ------
+        ValueError
+            Error if the scheduling method is invalid.
+        RuntimeError
+            Error if the schedule exceeds the quota of a target.
+
+        Returns
+        -------
+        spacecraft_schedules : dict
+            Scheduled contacts keyed by spacecraft name.
+        benefit_total : numpy.float64
+            Total benefit of the scheduled contacts.
+
+        """
+
+        # Check scheduling method
+        if method in ("constellation_schedule", "downlink_schedule") \
+                or not method.endswith("schedule") or not hasattr(self, method):
+            raise ValueError(f"Invalid scheduling method: {method}")
+
+        # Group contacts by spacecraft
+        spacecraft_contacts = {}
+        for contact in self.contacts:
+            spacecraft = getattr(contact, "spacecraft", None)
+            spacecraft_contacts.setdefault(spacecraft, []).append(contact)
+
+        # Schedule all spacecraft jointly with the MILP method
+        if method == "milp_schedule":
+            scheduled_contacts, benefit_total = self.milp_schedule(
+                per_spacecraft=True, exclusive=exclusive, **options)
+            spacecraft_schedules = {spacecraft: [] for spacecraft in spacecraft_contacts}
+            for contact in scheduled_contacts:
+                spacecraft_schedules[getattr(contact, "spacecraft", None)].append(contact)
+            self.spacecraft_schedules = spacecraft_schedules
+
+            return spacecraft_schedules, benefit_total
+
+        # Order spacecraft by total contact benefit
+        order = sorted(spacecraft_contacts,
+                       key=lambda spacecraft: -sum(contact.benefit
+                                                   for contact in spacecraft_contacts[spacecraft]))
+
+        # Extract per-target options which apply across the constellation
+        max_duration = options.pop("max_duration", None)
+        min_revisit = options.pop("min_revisit", None)
+        diminishing_factor = options.get("diminishing_factor", None)
+
+        # Declare scheduled observation intervals, used quota and scheduled
+        # observation count of each target
+        target_starts = {}
+        target_ends = {}
+        target_used = {}
+        target_count = {}
+
+        # Iterate through spacecraft
+        spacecraft_schedules = {}
+        for spacecraft in order:
+            # Remove contacts overlapping scheduled observations of the
+            # same target, or violating their revisit time
+            contacts = spacecraft_contacts[spacecraft]
+            if exclusive or min_revisit is not None:
+                contacts = [contact for contact in contacts
+                            if not self.__overlaps(target_starts, target_ends, contact,
+                                                   target_parameter(min_revisit, contact.target, 0.0),
+                                                   exclusive)]
+
+            # Diminish the benefit of contacts by the number of observations
+            # of their target scheduled on previous spacecraft, using copies
+            # of the contacts mapped back to the originals
+            originals = {}
+            if diminishing_factor is not None and target_count:
+                diminished = []
+                for contact in contacts:
+                    factor = target_parameter(diminishing_factor, contact.target, 1.0)
+                    count = target_count.get(contact.target.name, 0)
+                    if factor != 1.0 and count > 0:
+                        diminished_contact = copy.copy(contact)
+                        diminished_contact.benefit = contact.benefit * factor**count
+                        originals[id(diminished_contact)] = contact
+                        contact = diminished_contact
+                    diminished.append(contact)
+                contacts = diminished
+
+            # Calculate quota remaining after the previous spacecraft
+            if max_duration is not None:
+                options["max_duration"] = {target.name: max(target_parameter(max_duration, target, np.inf)
+                                                            - target_used.get(target.name, 0.0), 0.0)
+                                           for target in self.targets}
+            if min_revisit is not None:
+                options["min_revisit"] = min_revisit
+
+            # Schedule spacecraft
+            scheduling = SchedulingModule(self.targets)
+            scheduling.contacts = list(contacts)
+            scheduled_contacts, _ = getattr(scheduling, method)(**options)
+            scheduled_contacts = sorted((originals.get(id(contact), contact)
+                                         for contact in scheduled_contacts),
+                                        key=operator.attrgetter("start"))
+            spacecraft_schedules[spacecraft] = scheduled_contacts
+
+            # Add scheduled observations, used quota and count of each target
+            for contact in scheduled_contacts:
+                name = contact.target.name
+                index = bisect.bisect(target_starts.setdefault(name, []),
+                                      contact.start)
+                target_starts[name].insert(index, contact.start)
+                target_ends.setdefault(name, []).insert(index, contact.end)
+                target_used[name] = target_used.get(name, 0.0) \
+                    + (contact.end - contact.start)
+                target_count[name] = target_count.get(name, 0) + 1
+
+        # Check the quota of each target across the constellation
+        if max_duration is not None:
+            for target in self.targets:
+                quota = target_parameter(max_duration, target, np.inf)
+                if target_used.get(target.name, 0.0) > quota + 1e-9:
+                    raise RuntimeError(f"Quota exceeded for target: {target.name}")
+
+        # Store scheduled contacts of all spacecraft
+        self.scheduled_contacts = sorted((contact
+                                          for scheduled_contacts in spacecraft_schedules.values()
+                                          for contact in scheduled_contacts),
+                                         key=operator.attrgetter("start"))
+        self.spacecraft_schedules = spacecraft_schedules
+
+        # Calculate total benefit, diminished across the constellation
+        if diminishing_factor is None:
+            benefit_total = sum(contact.benefit
+                                for contact in self.scheduled_contacts)
+        else:
+            target_benefits = {}
+            for contact in self.scheduled_contacts:
+                target_benefits.setdefault(contact.target.name,
+                                           (contact.target, []))[1].append(contact.benefit)
+            benefit_total = sum(diminished_benefit(benefits,
+                                                   target_parameter(diminishing_factor, target, 1.0))
+                                for target, benefits in target_benefits.values())
+
+        return spacecraft_schedules, benefit_total
+
+    @staticmethod
+    def __overlaps(target_starts, target_ends, contact, revisit=0.0, exclusive=True):
+        """
+        Function to check whether a contact overlaps a scheduled observation
+        of its target, or is within its revisit time.
+
+        Parameters
+        ----------
+        target_starts : dict
+            Sorted start times of scheduled observations keyed by target name.
+        target_ends : dict
+            End times of scheduled observations keyed by target name.
+        contact : assam.visibility.astro_target.TargetContact
+            Contact to check.
+        revisit : float, optional
+            Minimum time between observations of the target [days].
+            The default is 0.0.
+        exclusive : bool, optional
+            Flag to check overlapping observations without a revisit time.
+            The default is True.
+
+        Returns
+        -------
+        bool
+            True if the contact overlaps a scheduled observation or is
+            within its revisit time.
+
+        """
+
+        # Skip check if neither overlaps nor revisit times are excluded
+        if not exclusive and revisit <= 0.0:
+            return False
+
+        # Find scheduled observations starting before the contact ends,
+        # padded by the revisit time
+        starts = target_starts.get(contact.target.name, [])
+        ends = target_ends.get(contact.target.name, [])
+        index = bisect.bisect_left(starts, contact.end + revisit)
+
+        # Check the observations, which do not overlap each other, so only
+        # the latest can end after the contact starts
+        return index > 0 and ends[index - 1] + revisit > contact.start
+
+    @instrument(count=lambda _, self: len(self.contacts))
+    def downlink_schedule(self, ground_stations, storage_capacity, data_rate, initial_volume=0.0, downlink_threshold=0.0, method="simple_dynamic_schedule", **options):
+        """
+        Function to schedule contacts subject to the on-board storage, which
+        is emptied by inserting ground station downlink passes.
+
+        Contacts are first scheduled with the given method. The schedule and
+        the station passes are then walked through in time order while
+        tracking the stored data volume. Whenever a pass starts or a contact
+        ends within a pass, a downlink is inserted if the volume reaches the
+        downlink threshold, lasting until the storage is empty or the pass
+        ends, and contacts overlapping an inserted downlink or overflowing
+        the storage are removed.
+
+        Parameters
+        ----------
+        ground_stations : list
+            Ground stations and their passes.
+        storage_capacity : float
+            On-board storage capacity [Mbit].
+        data_rate : float or dict
+            Data rate of observations [Mbit/s], either for all targets or
+            keyed by target name.
+        initial_volume : float, optional
+            Stored data volume at the start [Mbit]. The default is 0.0.
+        downlink_threshold : float, optional
+            Fraction of the storage capacity above which passes are inserted.
+            The default is 0.0 which downlinks whenever data is stored.
+        method : str, optional
+            Name of the scheduling method used for the contacts.
+            The default is "simple_dynamic_schedule".
+        **options
+            Keyword arguments of the scheduling method.
+
+        Raises
+        ------
+        ValueError
+            Error if the scheduling method is invalid.
+
+        Returns
+        -------
+        scheduled_contacts : list
+            List of scheduled contacts.
+        downlinks : list
+            List of inserted downlink passes.
+        benefit_total : numpy.float64
+            Total benefit of the scheduled contacts.
+
+        """
+
+        # Check scheduling method
+        if method in ("constellation_schedule", "downlink_schedule") \
+                or not method.endswith("schedule") or not hasattr(self, method):
+            raise ValueError(f"Invalid scheduling method: {method}")
+
+        # Schedule contacts without the storage
+        scheduling = SchedulingModule(self.targets)
+        scheduling.contacts = list(self.contacts)
+        candidates, _ = getattr(scheduling, method)(**options)
+        candidates = sorted(candidates, key=operator.attrgetter("start"))
+
+        # Sort station passes
+        passes = sorted((station_pass
+                         for station in ground_stations
+                         for station_pass in station.passes),
+                        key=operator.attrgetter("start"))
+
+        # Declare storage state
+        volume = initial_volume
+        busy_until = -np.inf
+        scheduled_contacts = []
+        downlinks = []
+        open_passes = []
+        times = []
+        volumes = []
+
+        def insert_downlinks():
+            # Insert downlinks in the open passes, in order of their start,
+            # until the storage is below the threshold
+            nonlocal volume, busy_until
+            open_passes[:] = [station_pass for station_pass in open_passes
+                              if station_pass.end > busy_until]
+            for station_pass in list(open_passes):
+                start = max(station_pass.start, busy_until)
+                if start >= station_pass.end or volume <= 0 \
+                        or volume < downlink_threshold * storage_capacity:
+                    continue
+
+                # Insert downlink until the storage is empty or the pass ends
+                station = station_pass.station
+                downlinked = min(volume,
+                                 station.downlink_rate
+                                 * (station_pass.end - start) * 86400)
+                end = start + downlinked / (station.downlink_rate * 86400)
+                downlinks.append(StationPass(station, start, end,
+                                             spacecraft=station_pass.spacecraft))
+                volume -= downlinked
+                busy_until = end
+                times.append(end)
+                volumes.append(volume)
+
+        # Merge contacts and passes in time order, with passes first
+        events = sorted([(contact.start, 1, i)
+                         for i, contact in enumerate(candidates)]
+                        + [(station_pass.start, 0, i)
+                           for i, station_pass in enumerate(passes)])
+
+        # Walk through events, reconsidering the open passes whenever a pass
+        # starts or a contact stores data
+        for _, is_contact, i in tqdm(events, desc="Downlink Scheduling"):
+            if is_contact:
+                # Remove contacts overlapping a downlink or overflowing the
+                # storage
+                contact = candidates[i]
+                rate = target_parameter(data_rate, contact.target, 0.0)
+                contact_volume = rate * contact.duration * 86400
+                if contact.start < busy_until \
+                        or volume + contact_volume > storage_capacity:
+                    continue
+
+                # Schedule contact and store its data
+                scheduled_contacts.append(contact)
+                volume += contact_volume
+                busy_until = contact.end
+                times.append(contact.end)
+                volumes.append(volume)
+            else:
+                # Open pass
+                open_passes.append(passes[i])
+
+            # Insert downlinks in the open passes
+            insert_downlinks()
+
+        # Calculate total benefit
+        benefit_total = np.sum([contact.benefit
+                                for contact in scheduled_contacts])
+
+        # Store scheduled contacts, downlinks and storage profile
+        self.scheduled_contacts = scheduled_contacts
+        self.downlinks = downlinks
+        self.storage = {"time": np.array(times), "volume": np.array(volumes)}
+
+        return scheduled_contacts, downlinks, benefit_total
+
+    def save_schedule(self, path):
+        """
+        Function to save scheduled contacts to a columnar file.
+
+        Parameters
+        ----------
+        path : str
+            Output file path, either Parquet (.parquet) or Arrow IPC
+            (.arrow, .feather, .ipc).
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Stream scheduled contacts to file
+        contact_interface.save_contacts(self.scheduled_contacts, path)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import itertools
+import multiprocessing
+
+from astropy import units as u
+from astropy.time import Time
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+import yaml
+
+from ..propagator.kepler_interface import KeplerInterface
+from ..visibility import catalogue_interface, footprint, geometry
+
+# Define worker state, set once per worker by the pool initialiser
+WORKER_STATE = {}
+
+
+def orbit_grid(**elements):
+    """
+    Function to create a grid of orbits from lists of Keplerian elements.
+
+    Parameters
+    ----------
+    **elements : list or float
+        Values of each Keplerian element, such as SMA=[6921, 7071] and
+        INC=97.57.
+
+    Returns
+    -------
+    list
+        Keplerian elements of each orbit.
+
+    """
+
+    # Convert scalars to lists
+    names = list(elements)
+    values = [np.atleast_1d(elements[name]).tolist() for name in names]
+
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values)]
+
+
+def init_worker(sweep):
+    """
+    Function to initialise multiprocessing workers with the shared target
+    and solar body geometry.
+
+    Parameters
+    ----------
+    sweep : SweepModule
+        Sweep module.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    WORKER_STATE["sweep"] = sweep
+
+
+def sweep_worker(task):
+    """
+    Worker function to evaluate target availability for an orbit.
+
+    Parameters
+    ----------
+    task : tuple
+        Index of the orbit and index of the start time.
+
+    Returns
+    -------
+    task : tuple
+        Index of the orbit and index of the start time.
+    n_contacts : numpy.ndarray
+        Number of contacts of each target.
+    total_duration : numpy.ndarray
+        Total contact duration of each target [days].
+
+    """
+
+    return (task,) + WORKER_STATE["sweep"].evaluate(*task)
+
+
+class SweepModule():
+
+    def __init__(self, orbits, start_times, duration, time_step, targets_path="data/targets.yml", solar_bodies_path="data/solar_bodies.yml", ephem="jpl", j2=True):
+        """
+        Initialisation function for the orbit sweep module, which compares
+        target availability across a grid of orbits and start times.
+
+        The target directions and geocentric solar body positions are
+        calculated once and shared by all orbits, which only propagate
+        their spacecraft and apply the parallax of the solar bodies. Orbits
+        are propagated with the analytic Keplerian propagator, and
+        visibility is geometric, without the aberration applied by the
+        Astropy frame transformations. Rectangular subtargets use their
+        exact footprints, while polygons, which are not stored in catalogue
+        tables, use their bounding circles.
+
+        Parameters
+        ----------
+        orbits : list or dict
+            Keplerian elements of each orbit, or a dict of lists of element
+            values which is expanded into a grid with orbit_grid.
+        start_times : astropy.time.core.Time
+            Start times of the mission.
+        duration : astropy.time.core.TimeDelta
+            Mission duration.
+        time_step : astropy.time.core.TimeDelta
+            Time step for output state.
+        targets_path : str, optional
+            Path of the targets file, either YAML, CSV or FITS.
+            The default is "data/targets.yml".
+        solar_bodies_path : str, optional
+            Path of the solar bodies file.
+            The default is "data/solar_bodies.yml".
+        ephem : str, optional
+            Ephemeris selection. The default is "jpl".
+        j2 : bool, optional
+            Flag to include J2 secular drift. The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Expand orbit grid
+        if isinstance(orbits, dict):
+            orbits = orbit_grid(**orbits)
+        self.orbits = list(orbits)
+
+        # Store times
+        self.start_times = Time(np.atleast_1d(start_times))
+        self.duration = duration
+        self.time_step = time_step
+        self.j2 = j2
+
+        # Load target catalogue and calculate subtarget geometry
+        columns = catalogue_interface.read_catalogue(targets_path)
+        self.geometry = geometry.column_geometry(columns)
+        self.footprints = footprint.column_footprints(columns)
+
+        # Load included solar bodies
+        with open(solar_bodies_path, "r") as solar_bodies_file:
+            solar_bodies_dump = yaml.safe_load(solar_bodies_file)
+        self.solar_bodies = [(name,
+                              info["radius"] / 1000,
+                              np.radians(np.reshape(np.array(info["soft_radius"], dtype=float), (-1, 2))))
+                             for name, info in solar_bodies_dump.items()
+                             if info["included"]]
+
+        # Calculate observation times and geocentric solar body positions for
+        # each start time
+        self.obstimes = []
+        self.body_positions = []
+        for start_time in tqdm(self.start_times, desc="Solar Body Geometry"):
+            nstep = np.rint(self.duration/self.time_step) + 1
+            obstime = start_time + self.time_step * np.arange(0, nstep)
+            self.obstimes.append(obstime)
+            self.body_positions.append(geometry.geocentric_positions(
+                [name for name, _, _ in self.solar_bodies], obstime, ephem))
+
+        # Declare empty variables
+        self.availability = None
+
+    def evaluate(self, iorbit, istart, block_size=4096):
+        """
+        Function to evaluate target availability for an orbit and start time.
+
+        Parameters
+        ----------
+        iorbit : int
+            Index of the orbit.
+        istart : int
+            Index of the start time.
+        block_size : int, optional
+            Number of timesteps per visibility block. The default is 4096.
+
+        Returns
+        -------
+        n_contacts : numpy.ndarray
+            Number of contacts of each target.
+        total_duration : numpy.ndarray
+            Total contact duration of each target [days].
+
+        """
+
+        # Propagate spacecraft
+        start_time = self.start_times[istart]
+        kepler = KeplerInterface(start_time,
+                                 start_time + self.duration,
+                                 self.time_step,
+                                 self.orbits[iorbit],
+                                 j2=self.j2)
+        spacecraft_frame = kepler.load_state()
+        spacecraft_position = np.moveaxis(
+            spacecraft_frame.obsgeoloc.xyz.to_value(u.km), 0, -1)
+
+        # Calculate solar body directions and angular radii from the spacecraft
+        bodies = []
+        for name, radius, soft_radius in self.solar_bodies:
+            vectors, angular_radius = geometry.body_geometry(
+                self.body_positions[istart][name], spacecraft_position, radius)
+            bodies.append((vectors, angular_radius, soft_radius))
+
+        # Calculate target visibility
+        visibility = geometry.subtarget_visibility(self.geometry["vectors"],
+                                                   self.geometry["radii"],
+                                                   bodies,
+                                                   block_size,
+                                                   footprints=self.footprints)
+        visibility = geometry.target_visibility(visibility,
+                                                self.geometry["itarget"],
+                                                len(self.geometry["names"]))
+
+        return geometry.contact_summary(visibility, self.obstimes[istart].jd)
+
+    def run(self, num_workers=None):
+        """
+        Function to evaluate target availability for all orbits and start
+        times in parallel.
+
+        Parameters
+        ----------
+        num_workers : int, optional
+            Number of workers for the multiprocessing pool. The default is None.
+
+        Returns
+        -------
+        availability : pandas.core.frame.DataFrame
+            Availability of each target for each orbit and start time, with
+            the orbit index, start time, Keplerian elements, target name,
+            category and priority, number of contacts, total duration [days]
+            and percentage duration.
+
+        """
+
+        # Create tasks
+        tasks = list(itertools.product(range(len(self.orbits)),
+                                       range(len(self.start_times))))
+
+        # Evaluate orbits
+        ntarget = len(self.geometry["names"])
+        frames = []
+        with multiprocessing.Pool(num_workers,
+                                  initializer=init_worker,
+                                  initargs=(self,)) as p:
+            # Create progress bar
+            with tqdm(total=len(tasks), desc="Orbit Sweep") as pbar:
+                # Iterate through orbits and start times
+                for (iorbit, istart), n_contacts, total_duration in p.imap_unordered(sweep_worker, tasks):
+                    # Calculate percentage duration
+                    jd = self.obstimes[istart].jd
+                    percentage_duration = 100*total_duration / (jd[-1] - jd[0])
+
+                    # Create rows for each target
+                    columns = {"orbit": iorbit,
+                               "start_time": self.start_times[istart].isot}
+                    columns.update(self.orbits[iorbit])
+                    columns.update({"name": self.geometry["names"],
+                                    "category": self.geometry["categories"],
+                                    "priority": self.geometry["priorities"],
+                                    "n_contacts": n_contacts,
+                                    "total_duration": total_duration,
+                                    "percentage_duration": percentage_duration})
+                    frame = pd.DataFrame(columns, index=np.arange(ntarget))
+                    frames.append(frame)
+
+                    # Update progress bar
+                    pbar.update()
+
+        # Combine and sort rows
+        availability = pd.concat(frames, ignore_index=True)
+        availability = availability.sort_values(["orbit", "start_time"],
+                                                kind="stable",
+                                                ignore_index=True)
+
+        # Store availability
+        self.availability = availability
+
+        return availability
+
+    def summary(self):
+        """
+        Function to summarise the mean availability of each orbit and start
+        time over the targets.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            Mean percentage duration and number of targets with contacts for
+            each orbit and start time.
+
+        """
+
+        # Group by orbit and start time
+        keys = [column for column in self.availability.columns
+                if column not in ("name", "category", "priority",
+                                  "n_contacts", "total_duration",
+                                  "percentage_duration")]
+        grouped = self.availability.groupby(keys, sort=False)
+
+        return grouped.agg(mean_percentage_duration=("percentage_duration", "mean"),
+                           n_visible_targets=("n_contacts", lambda n: int(np.count_nonzero(n)))).reset_index()
@@ -24,4 +24,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from .visibility_module import VisibilityModule
+from .. import _lazy
+
+# Define lazily imported attributes and their modules
+LAZY_ATTRIBUTES = {"VisibilityModule": ".visibility_module",
+                   "EarthOccultation": ".constraints",
+                   "Eclipse": ".constraints",
+                   "GeographicExclusion": ".constraints",
+                   "load_exclusion_zones": ".constraints"}
+
+__all__ = list(LAZY_ATTRIBUTES)
+
+# Import attributes on first access
+__getattr__, __dir__ = _lazy.make_lazy(__name__, LAZY_ATTRIBUTES)
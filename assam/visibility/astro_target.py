@@ -24,10 +24,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from astropy import units as u
 from astropy.coordinates import SkyCoord
 import numpy as np
 import pandas as pd
 
+from .footprint import footprint_visibility
+from .geometry import coordinate_vectors
+
 
 def rle(inarray):
     """
@@ -209,11 +213,20 @@ class AstroTarget():
         # Return visibility
         return visibility
 
-    def calculate_contacts(self):
+    def calculate_contacts(self, spacecraft=None, mask=None):
         """
         Function to convert Boolean visibility into a series of
         contact objects.
 
+        Parameters
+        ----------
+        spacecraft : str, optional
+            Name of the spacecraft observing the target. The default is None.
+        mask : numpy.ndarray, optional
+            Global array of booleans shared by all targets, true when targets
+            may be visible, such as outside the South Atlantic Anomaly.
+            The default is None.
+
         Returns
         -------
         contacts : list
@@ -221,15 +234,20 @@ class AstroTarget():
 
         """
 
+        # Apply global mask
+        visibility = self.visibility
+        if mask is not None:
+            visibility = visibility & mask
+
         # Calculate run-length encoding
-        ilength, istart, ivalue = rle(self.visibility)
+        ilength, istart, ivalue = rle(visibility)
 
         # Calculate end index and clip
         iend = istart + ilength
-        iend = np.clip(iend, 0, len(self.visibility)-1)
+        iend = np.clip(iend, 0, len(visibility)-1)
 
         # Remove runs where target is not visible, or if it starts at the end
-        ix = np.where((ivalue == True) & (istart != len(self.visibility)-1))
+        ix = np.where((ivalue == True) & (istart != len(visibility)-1))
         ilength = ilength[ix]
         istart = istart[ix]
         iend = iend[ix]
@@ -239,7 +257,8 @@ class AstroTarget():
         end = self.obstime[iend]
 
         # Create list of contacts
-        contacts = [TargetContact(self, s, e, 1/self.priority, differential_benefit=True)
+        contacts = [TargetContact(self, s, e, 1/self.priority, differential_benefit=True,
+                                  spacecraft=spacecraft)
                     for s, e in zip(start, end)]
 
         # Store contacts
@@ -320,7 +339,7 @@ class AstroTarget():
 
 class AstroSubtarget():
 
-    def __init__(self, name, frame, centre, shape, width, height, angular_radius, coordinates, icrs_coordinates):
+    def __init__(self, name, frame, centre, shape, width, height, angular_radius, coordinates, icrs_coordinates, footprint=None):
         """
         Initialisation function for astronomical subtargets.
 
@@ -344,6 +363,9 @@ class AstroSubtarget():
             Subtarget centre coordinates.
         icrs_coordinates : astropy.coordinates.sky_coordinate.SkyCoord
             Subtarget centre coordinates in ICRS.
+        footprint : assam.visibility.footprint.Footprint, optional
+            Exact footprint of rectangular and polygon subtargets. The
+            default is None, which uses the bounding circle.
 
         Returns
         -------
@@ -361,6 +383,7 @@ class AstroSubtarget():
         self.angular_radius = angular_radius
         self.coordinates = coordinates
         self.icrs_coordinates = icrs_coordinates
+        self.footprint = footprint
 
     def calculate_visibility(self, solar_body):
         """
@@ -380,13 +403,27 @@ class AstroSubtarget():
 
         """
 
-        # Declare visibility list
-        visibility = []
-
         # Calculate angular separation
         angular_separation = solar_body.coordinates.separation(
             self.coordinates)
 
+        # Calculate visibility of the exact footprint, where subtargets
+        # saved without footprints use the bounding circle
+        if getattr(self, "footprint", None) is not None:
+            visibility = footprint_visibility(
+                self.footprint,
+                angular_separation.to_value(u.rad),
+                max(self.angular_radius.to_value(u.rad), self.footprint.radius),
+                solar_body.angular_radius.to_value(u.rad),
+                np.reshape(solar_body.soft_radius.to_value(u.rad), (-1, 2)),
+                lambda: coordinate_vectors(solar_body.coordinates))
+
+            # Return visibility and angular separation
+            return visibility, angular_separation
+
+        # Declare visibility list
+        visibility = []
+
         # Calculate basic visibility
         visibility.append((angular_separation
                            - self.angular_radius
@@ -408,9 +445,6 @@ class AstroSubtarget():
                 np.logical_and(visibility_inner, visibility_outer))
             visibility.append(visibility_soft)
 
-        # Calculate arbitrary geometry
-        # TODO: implement
-
         # Convert visibility list to array
         visibility = np.array(visibility)
 
@@ -423,7 +457,7 @@ class AstroSubtarget():
 
 class TargetContact():
 
-    def __init__(self, target, start, end, benefit, differential_benefit=False, verbose_time=False):
+    def __init__(self, target, start, end, benefit, differential_benefit=False, verbose_time=False, spacecraft=None):
         """
         Initialisation function for a target contact.
 
@@ -443,6 +477,8 @@ class TargetContact():
         verbose_time : bool, optional
             Option to use verbose time which stores the entire time object.
             The default is False.
+        spacecraft : str, optional
+            Name of the spacecraft observing the contact. The default is None.
 
         Returns
         -------
@@ -450,8 +486,9 @@ class TargetContact():
 
         """
 
-        # Store target object
+        # Store target object and spacecraft
         self.target = target
+        self.spacecraft = spacecraft
 
         # Store start/end times and contact duration
         #
@@ -25,19 +25,21 @@ SOFTWARE.
 """
 
 import multiprocessing
-import yaml
 
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 import numpy as np
 from tqdm import tqdm
 
+from . import catalogue_interface, contact_interface, footprint
 from .astro_target import AstroTarget, AstroSubtarget
+from .spatial_index import SubtargetIndex
 
 
-def load(spacecraft_frame, num_workers=None):
+def load(spacecraft_frame, num_workers=None, path="data/targets.yml", cache=True):
     """
-    Function to import targets and their subtargets.
+    Function to import targets and their subtargets, from a YAML catalogue,
+    or from a CSV or FITS table with one row per subtarget.
 
     Parameters
     ----------
@@ -45,7 +47,11 @@ def load(spacecraft_frame, num_workers=None):
         Spacecraft reference frame relative to the Earth's geocentre
         with the same orientation as BCRS/ICRS.
     num_workers : int, optional
-        Number of workers for multiprocessing.
+        Number of workers for multiprocessing of YAML catalogues.
+    path : str, optional
+        Path of the targets file. The default is "data/targets.yml".
+    cache : bool, optional
+        Flag to use the binary cache of YAML catalogues. The default is True.
 
     Raises
     ------
@@ -59,14 +65,13 @@ def load(spacecraft_frame, num_workers=None):
 
     """
 
-    # Load targets from config file
-    # TODO: implement default and optional paths
-    with open("data/targets.yml", "r") as targets_file:
-        targets_dump = yaml.safe_load(targets_file)
+    # Load tables of targets from columns
+    if catalogue_interface.file_format(path) != "yaml":
+        columns = catalogue_interface.read_catalogue(path)
+        return catalogue_interface.catalogue_targets(columns, spacecraft_frame)
 
-    # Check for empty targets file
-    if targets_dump is None:
-        raise ValueError("Empty target file")
+    # Load targets from config file
+    targets_dump = catalogue_interface.load_yaml(path, cache)
 
     # Create list of worker parameters
     worker_params = [(target_dump, spacecraft_frame)
@@ -151,9 +156,22 @@ def load_worker(worker_params):
             height = np.nan
             # Assign angular
             angular_radius = subtarget_info["angular_radius"] * u.deg
+        elif shape == "polygon":
+            # Assign nan width and height
+            width = np.nan
+            height = np.nan
+            # Calculate bounding circle angular radius
+            angular_radius = footprint.polygon_radius(
+                subtarget_info["centre"], subtarget_info["vertices"]) * u.deg
         else:
             raise ValueError(f"Invalid subtarget shape: {target_name}, {subtarget_name}")
 
+        # Calculate exact footprint of rectangles and polygons
+        subtarget_footprint = footprint.subtarget_footprint(
+            frame, subtarget_info["centre"], shape,
+            subtarget_info.get("width"), subtarget_info.get("height"),
+            subtarget_info.get("vertices"))
+
         # Create subtarget object
         subtarget = AstroSubtarget(subtarget_name,
                                    frame,
@@ -162,7 +180,8 @@ def load_worker(worker_params):
                                    width, height,
                                    angular_radius,
                                    coordinates,
-                                   icrs_coordinates)
+                                   icrs_coordinates,
+                                   subtarget_footprint)
 
         # Add subtarget to target object
         target.add_subtarget(subtarget)
@@ -171,6 +190,77 @@ def load_worker(worker_params):
     return target
 
 
-def save():
-    # TODO: implement method to save targets to file
-    pass
+def build_index(targets, nside=None):
+    """
+    Function to build a spatial index over the subtarget centres of the
+    targets, which is built once and shared by visibility calculations.
+    The indexed radii bound the exact footprints of the subtargets.
+
+    Parameters
+    ----------
+    targets : list
+        Targets and their properties.
+    nside : int, optional
+        HEALPix resolution parameter. The default is None, which chooses
+        about one subtarget per pixel.
+
+    Returns
+    -------
+    index : assam.visibility.spatial_index.SubtargetIndex
+        Spatial index of the subtargets, in the order of the targets and
+        their subtargets.
+
+    """
+
+    # Extract subtarget coordinates, radii and target indices
+    subtargets = [(itarget, subtarget)
+                  for itarget, target in enumerate(targets)
+                  for subtarget in target.subtargets]
+    ra = np.array([subtarget.icrs_coordinates.ra.rad
+                   for _, subtarget in subtargets])
+    dec = np.array([subtarget.icrs_coordinates.dec.rad
+                    for _, subtarget in subtargets])
+    radii = np.array([max(subtarget.angular_radius.to_value(u.rad),
+                          subtarget.footprint.radius)
+                      if getattr(subtarget, "footprint", None) is not None
+                      else subtarget.angular_radius.to_value(u.rad)
+                      for _, subtarget in subtargets])
+    itarget = np.array([itarget for itarget, _ in subtargets], dtype=int)
+
+    # Calculate unit vectors
+    vectors = np.stack((np.cos(dec)*np.cos(ra),
+                        np.cos(dec)*np.sin(ra),
+                        np.sin(dec)), axis=-1)
+
+    return SubtargetIndex(vectors, radii, itarget, nside)
+
+
+def save(targets, path, batch_size=65536):
+    """
+    Function to stream the contacts of targets to a columnar file.
+
+    Parameters
+    ----------
+    targets : list
+        Targets and their properties.
+    path : str
+        Output file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    batch_size : int, optional
+        Number of contacts per row group or record batch.
+        The default is 65536.
+
+    Returns
+    -------
+    nrows : int
+        Number of contacts written.
+
+    """
+
+    # Create generator of contacts
+    contacts = (contact
+                for target in targets
+                for contact in target.contacts)
+
+    # Stream contacts to file
+    return contact_interface.save_contacts(contacts, path, batch_size)
@@ -0,0 +1,579 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import pickle
+import stat
+import tempfile
+
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+import numpy as np
+from tqdm import tqdm
+import yaml
+
+from ..pipeline.artifact_interface import hash_file
+from . import footprint
+from .astro_target import AstroTarget, AstroSubtarget
+
+# Define catalogue columns, with one row per subtarget
+STRING_COLUMNS = ("target", "category", "subtarget", "frame", "shape")
+FLOAT_COLUMNS = ("lon", "lat", "width", "height", "angular_radius")
+COLUMNS = STRING_COLUMNS + ("priority",) + FLOAT_COLUMNS
+
+
+def file_format(path):
+    """
+    Function to find the catalogue format from the file extension.
+
+    Parameters
+    ----------
+    path : str
+        Catalogue file path.
+
+    Raises
+    ------
+    ValueError
+        Error if the file extension is not supported.
+
+    Returns
+    -------
+    str
+        Either "yaml", "csv" or "fits".
+
+    """
+
+    # Match extension
+    name = path.lower()
+    if name.endswith((".yml", ".yaml")):
+        return "yaml"
+    elif name.endswith((".csv", ".csv.gz")):
+        return "csv"
+    elif name.endswith((".fits", ".fit", ".fits.gz")):
+        return "fits"
+    else:
+        raise ValueError(f"Invalid catalogue format: {path}")
+
+
+def cache_path(path):
+    """
+    Function to find the path of the binary cache of a YAML catalogue,
+    which is a hidden file next to the catalogue.
+
+    Parameters
+    ----------
+    path : str
+        Catalogue file path.
+
+    Returns
+    -------
+    str
+        Cache file path.
+
+    """
+
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.cache")
+
+
+def load_yaml(path="data/targets.yml", cache=True):
+    """
+    Function to import a YAML catalogue, reusing a binary cache of the parsed
+    catalogue while the file's modification time and content hash are
+    unchanged.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the targets file. The default is "data/targets.yml".
+    cache : bool, optional
+        Flag to read and write the binary cache. The default is True.
+
+    Raises
+    ------
+    ValueError
+        Error if targets file is empty.
+
+    Returns
+    -------
+    catalogue : dict
+        Target information keyed by target name.
+
+    """
+
+    # Load cached catalogue, hashing the file only if it was modified
+    mtime = os.stat(path).st_mtime_ns
+    cached = None
+    if cache and os.path.exists(cache_path(path)):
+        try:
+            with open(cache_path(path), "rb") as cache_file:
+                cached = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            cached = None
+    if cached is not None:
+        if cached["mtime"] == mtime:
+            return cached["catalogue"]
+        digest = hash_file(path)
+        if cached["hash"] == digest:
+            catalogue = cached["catalogue"]
+            save_cache(path, mtime, digest, catalogue)
+            return catalogue
+
+    # Load targets from config file
+    with open(path, "r") as targets_file:
+        catalogue = yaml.safe_load(targets_file)
+
+    # Check for empty targets file
+    if catalogue is None:
+        raise ValueError("Empty target file")
+
+    # Save cache
+    if cache:
+        save_cache(path, mtime, hash_file(path), catalogue)
+
+    return catalogue
+
+
+def save_cache(path, mtime, digest, catalogue):
+    """
+    Function to save the binary cache of a YAML catalogue, writing it to a
+    temporary file first so that interrupted runs do not leave partial
+    caches. The cache is skipped if the catalogue directory is not writable.
+
+    Parameters
+    ----------
+    path : str
+        Catalogue file path.
+    mtime : int
+        Catalogue modification time [ns].
+    digest : str
+        Catalogue content hash.
+    catalogue : dict
+        Target information keyed by target name.
+
+    Returns
+    -------
+    bool
+        True if the cache was saved.
+
+    """
+
+    # Create temporary file, skipping the cache in read-only directories
+    directory = os.path.dirname(path) or "."
+    try:
+        fd, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError:
+        return False
+
+    # Write to temporary file with the permissions of the catalogue, rather
+    # than the private permissions of temporary files, and move into place
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump({"mtime": mtime, "hash": digest, "catalogue": catalogue},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(temporary_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temporary_path, cache_path(path))
+    except OSError:
+        os.remove(temporary_path)
+        return False
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+    return True
+
+
+def catalogue_columns(catalogue):
+    """
+    Function to convert a catalogue keyed by target name into columns with
+    one row per subtarget, where polygons keep only their bounding circles.
+
+    Parameters
+    ----------
+    catalogue : dict
+        Target information keyed by target name.
+
+    Returns
+    -------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    """
+
+    # Extract rows of each subtarget, with the bounding circle angular
+    # radius of polygons
+    rows = [(target_name, target_info["category"], subtarget_name,
+             subtarget_info["frame"], subtarget_info["shape"],
+             target_info["priority"],
+             subtarget_info["centre"][0], subtarget_info["centre"][1],
+             subtarget_info.get("width"), subtarget_info.get("height"),
+             footprint.polygon_radius(subtarget_info["centre"],
+                                      subtarget_info["vertices"])
+             if subtarget_info["shape"] == "polygon"
+             else subtarget_info.get("angular_radius"))
+            for target_name, target_info in catalogue.items()
+            for subtarget_name, subtarget_info in target_info["subtargets"].items()]
+
+    # Transpose rows into columns
+    values = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+    columns = {}
+    for name, value in zip(COLUMNS, values):
+        if name in STRING_COLUMNS:
+            columns[name] = np.array(value, dtype=str)
+        elif name == "priority":
+            columns[name] = np.array(value, dtype=int)
+        else:
+            columns[name] = np.array([np.nan if v is None else v
+                                      for v in value], dtype=float)
+
+    return columns
+
+
+def columns_catalogue(columns):
+    """
+    Function to convert catalogue columns with one row per subtarget into a
+    catalogue keyed by target name, as loaded from YAML.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    Returns
+    -------
+    catalogue : dict
+        Target information keyed by target name.
+
+    """
+
+    # Group rows by target, with missing values as None
+    catalogue = {}
+    for i in range(len(columns["target"])):
+        target_name = str(columns["target"][i])
+        if target_name not in catalogue:
+            catalogue[target_name] = {"category": str(columns["category"][i]),
+                                      "priority": int(columns["priority"][i]),
+                                      "subtargets": {}}
+        values = {name: None if np.isnan(columns[name][i])
+                  else float(columns[name][i])
+                  for name in FLOAT_COLUMNS}
+        catalogue[target_name]["subtargets"][str(columns["subtarget"][i])] = {
+            "frame": str(columns["frame"][i]),
+            "centre": [values["lon"], values["lat"]],
+            "shape": str(columns["shape"][i]),
+            "width": values["width"],
+            "height": values["height"],
+            "angular_radius": values["angular_radius"]}
+
+    return catalogue
+
+
+def check_columns(columns, path):
+    """
+    Function to check and convert the catalogue columns read from a table.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+    path : str
+        Catalogue file path.
+
+    Raises
+    ------
+    ValueError
+        Error if a column is missing.
+
+    Returns
+    -------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    """
+
+    # Check for missing columns
+    missing = [name for name in COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Missing catalogue columns in {path}: {missing}")
+
+    # Convert column types
+    converted = {}
+    for name in COLUMNS:
+        if name in STRING_COLUMNS:
+            converted[name] = np.char.strip(np.asarray(columns[name]).astype(str))
+        elif name == "priority":
+            converted[name] = np.asarray(columns[name]).astype(int)
+        else:
+            converted[name] = np.ma.filled(
+                np.ma.asarray(columns[name], dtype=float), np.nan)
+
+    return converted
+
+
+def read_csv(path):
+    """
+    Function to read a CSV catalogue into columns.
+
+    Parameters
+    ----------
+    path : str
+        Catalogue file path.
+
+    Returns
+    -------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    """
+
+    import pandas as pd
+
+    # Read table with string columns kept as strings
+    table = pd.read_csv(path, dtype={name: str for name in STRING_COLUMNS},
+                        keep_default_na=False, na_values={name: [""]
+                                                          for name in FLOAT_COLUMNS})
+
+    return check_columns({name: table[name].to_numpy() for name in table.columns},
+                         path)
+
+
+def read_fits(path, hdu=1):
+    """
+    Function to read a FITS table catalogue into columns.
+
+    Parameters
+    ----------
+    path : str
+        Catalogue file path.
+    hdu : int or str, optional
+        Table extension. The default is 1.
+
+    Returns
+    -------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    """
+
+    from astropy.table import Table
+
+    # Read table
+    table = Table.read(path, hdu=hdu, format="fits")
+
+    return check_columns({name: table[name] for name in table.colnames}, path)
+
+
+def read_catalogue(path="data/targets.yml", cache=True):
+    """
+    Function to read a YAML, CSV or FITS catalogue into columns.
+
+    Parameters
+    ----------
+    path : str, optional
+        Catalogue file path. The default is "data/targets.yml".
+    cache : bool, optional
+        Flag to use the binary cache of YAML catalogues. The default is True.
+
+    Returns
+    -------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    """
+
+    # Read catalogue by format
+    catalogue_format = file_format(path)
+    if catalogue_format == "yaml":
+        return catalogue_columns(load_yaml(path, cache))
+    elif catalogue_format == "csv":
+        return read_csv(path)
+    else:
+        return read_fits(path)
+
+
+def write_catalogue(columns, path):
+    """
+    Function to write catalogue columns to a CSV or FITS table.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+    path : str
+        Output file path.
+
+    Raises
+    ------
+    ValueError
+        Error if the file format is not a table, or if there are polygon
+        subtargets, which tables do not support.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Check for polygons
+    if np.any(columns["shape"] == "polygon"):
+        raise ValueError(f"Polygon subtargets are not supported in tables: {path}")
+
+    # Write table by format
+    catalogue_format = file_format(path)
+    if catalogue_format == "csv":
+        import pandas as pd
+        pd.DataFrame({name: columns[name] for name in COLUMNS}).to_csv(
+            path, index=False)
+    elif catalogue_format == "fits":
+        from astropy.table import Table
+        Table({name: columns[name] for name in COLUMNS}).write(
+            path, format="fits", overwrite=True)
+    else:
+        raise ValueError(f"Invalid catalogue table format: {path}")
+
+
+def catalogue_targets(columns, spacecraft_frame, chunk_size=1024):
+    """
+    Function to create targets and subtargets from catalogue columns,
+    transforming the coordinates of each frame in vectorised chunks.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame relative to the Earth's geocentre
+        with the same orientation as BCRS/ICRS.
+    chunk_size : int, optional
+        Number of subtargets transformed into the spacecraft frame at once.
+        The default is 1024.
+
+    Raises
+    ------
+    ValueError
+        Error if a subtarget shape is invalid.
+
+    Returns
+    -------
+    targets : list
+        Targets and their properties.
+
+    """
+
+    # Check subtarget shapes
+    shape = columns["shape"]
+    invalid = ~np.isin(shape, ("rectangular", "circular"))
+    if np.any(invalid):
+        i = np.flatnonzero(invalid)[0]
+        raise ValueError(f"Invalid subtarget shape: {columns['target'][i]}, {columns['subtarget'][i]}")
+
+    # Calculate bounding circle angular radii
+    rectangular = shape == "rectangular"
+    angular_radius = np.where(rectangular,
+                              0.5*np.hypot(columns["width"], columns["height"]),
+                              columns["angular_radius"])
+
+    # Transform coordinates of each frame into ICRS and the satellite frame,
+    # and the corners of rectangles into ICRS
+    nrows = len(shape)
+    icrs_coordinates = [None] * nrows
+    coordinates = [None] * nrows
+    footprints = [None] * nrows
+    icrs_lon = np.empty(nrows)
+    icrs_lat = np.empty(nrows)
+    with tqdm(total=nrows, desc="Target Generation") as pbar:
+        for frame in np.unique(columns["frame"]):
+            rows = np.flatnonzero(columns["frame"] == frame)
+            for istart in range(0, len(rows), chunk_size):
+                ichunk = rows[istart:istart+chunk_size]
+                original_coordinates = SkyCoord(columns["lon"][ichunk],
+                                                columns["lat"][ichunk],
+                                                unit="deg", frame=frame)
+                chunk_icrs = original_coordinates.transform_to("icrs")
+                icrs_lon[ichunk] = chunk_icrs.spherical.lon.rad
+                icrs_lat[ichunk] = chunk_icrs.spherical.lat.rad
+                irectangle = ichunk[rectangular[ichunk]]
+                if len(irectangle):
+                    corners = footprint.frame_to_icrs(
+                        footprint.rectangle_vectors(
+                            np.radians(columns["lon"][irectangle]),
+                            np.radians(columns["lat"][irectangle]),
+                            np.radians(columns["width"][irectangle]),
+                            np.radians(columns["height"][irectangle])), frame)
+                    centres = footprint.spherical_vectors(
+                        icrs_lon[irectangle], icrs_lat[irectangle])
+                    for k, i in enumerate(irectangle):
+                        footprints[i] = footprint.Footprint(corners[k],
+                                                            centres[k])
+                chunk_coordinates = original_coordinates[:, None].transform_to(
+                    spacecraft_frame)
+                for k, i in enumerate(ichunk):
+                    icrs_coordinates[i] = chunk_icrs[k]
+                    coordinates[i] = chunk_coordinates[k]
+                pbar.update(len(ichunk))
+
+    # Create targets in order of first appearance, and add subtargets
+    # without updating the target properties of each subtarget
+    targets = []
+    target_index = {}
+    itarget = np.empty(nrows, dtype=int)
+    for i in range(nrows):
+        target_name = columns["target"][i]
+        if target_name not in target_index:
+            target_index[target_name] = len(targets)
+            targets.append(AstroTarget(target_name,
+                                       int(columns["priority"][i]),
+                                       columns["category"][i]))
+        itarget[i] = target_index[target_name]
+        if rectangular[i]:
+            width = columns["width"][i] * u.deg
+            height = columns["height"][i] * u.deg
+        else:
+            width = np.nan
+            height = np.nan
+        subtarget = AstroSubtarget(columns["subtarget"][i],
+                                   columns["frame"][i],
+                                   [columns["lon"][i], columns["lat"][i]] * u.deg,
+                                   shape[i],
+                                   width, height,
+                                   angular_radius[i] * u.deg,
+                                   coordinates[i],
+                                   icrs_coordinates[i],
+                                   footprints[i])
+        targets[itarget[i]].subtargets.append(subtarget)
+
+    # Calculate mean coordinates of all targets at once, matching
+    # AstroTarget.update_properties
+    ntargets = len(targets)
+    mean_lat = np.arctan2(np.bincount(itarget, np.sin(icrs_lat), ntargets),
+                          np.bincount(itarget, np.cos(icrs_lat), ntargets))
+    mean_lon = np.arctan2(np.bincount(itarget, np.sin(icrs_lon), ntargets),
+                          np.bincount(itarget, np.cos(icrs_lon), ntargets))
+    mean_coordinates = SkyCoord(mean_lon, mean_lat, unit="rad", frame="icrs")
+    for target, target_mean_coordinates in zip(targets, mean_coordinates):
+        target.mean_coordinates = target_mean_coordinates
+
+    return targets
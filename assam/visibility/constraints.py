@@ -0,0 +1,693 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import abc
+
+from astropy import units as u
+import numpy as np
+import yaml
+
+from . import geometry
+
+# Define Earth and Sun radii [km]
+EARTH_RADIUS = 6378.137
+SUN_RADIUS = 696340.0
+
+# Define WGS84 Earth flattening
+EARTH_FLATTENING = 1/298.257223563
+
+
+def angle_between(vectors1, vectors2):
+    """
+    Function to calculate the angle between unit vectors.
+
+    Parameters
+    ----------
+    vectors1 : numpy.ndarray
+        Unit vectors with shape (..., 3).
+    vectors2 : numpy.ndarray
+        Unit vectors with shape (..., 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        Angle [rad].
+
+    """
+
+    return np.arccos(np.clip(np.sum(vectors1*vectors2, axis=-1), -1, 1))
+
+
+def shadow_fraction(spacecraft_position, sun_position, earth_radius=EARTH_RADIUS, sun_radius=SUN_RADIUS):
+    """
+    Function to calculate the shadow of the Earth at the spacecraft, using
+    the apparent discs of the Earth and the Sun from the spacecraft.
+
+    Parameters
+    ----------
+    spacecraft_position : numpy.ndarray
+        Geocentric spacecraft positions [km] with shape (T, 3).
+    sun_position : numpy.ndarray
+        Geocentric Sun positions [km] with shape (T, 3).
+    earth_radius : float, optional
+        Earth radius [km]. The default is EARTH_RADIUS.
+    sun_radius : float, optional
+        Sun radius [km]. The default is SUN_RADIUS.
+
+    Returns
+    -------
+    umbra : numpy.ndarray
+        Boolean array, true when the Sun is fully blocked.
+    penumbra : numpy.ndarray
+        Boolean array, true when the Sun is partially or fully blocked.
+
+    """
+
+    # Calculate directions and apparent radii of the Sun and the Earth
+    sun_vectors, sun_angular_radius = geometry.body_geometry(
+        sun_position, spacecraft_position, sun_radius)
+    earth_vectors, earth_angular_radius = geometry.body_geometry(
+        np.zeros_like(spacecraft_position), spacecraft_position, earth_radius)
+
+    # Calculate separation of the discs
+    separation = angle_between(sun_vectors, earth_vectors)
+
+    # Find umbra and penumbra
+    umbra = separation <= earth_angular_radius - sun_angular_radius
+    penumbra = separation < earth_angular_radius + sun_angular_radius
+
+    return umbra, penumbra
+
+
+class VisibilityConstraint(abc.ABC):
+    """
+    Base class of visibility constraints, which are calculated directly from
+    the spacecraft and Sun position vectors. Constraints which do not depend
+    on the target are calculated once as a global mask shared by all targets.
+    """
+
+    # Define whether the constraint depends on the target
+    target_dependent = True
+
+    @abc.abstractmethod
+    def calculate(self, spacecraft_position, sun_position, vectors, radii, jd):
+        """
+        Function to calculate subtarget visibility under the constraint.
+
+        Parameters
+        ----------
+        spacecraft_position : numpy.ndarray
+            Geocentric spacecraft positions [km] with shape (T, 3).
+        sun_position : numpy.ndarray
+            Geocentric Sun positions [km] with shape (T, 3).
+        vectors : numpy.ndarray
+            Subtarget unit vectors with shape (S, 3).
+        radii : numpy.ndarray
+            Subtarget angular radii [rad] with shape (S,).
+        jd : numpy.ndarray
+            UTC Julian dates with shape (T,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (S, T) or (T,), true when visible.
+
+        """
+
+
+class EarthOccultation(VisibilityConstraint):
+
+    def __init__(self, grazing_height=100*u.km, earth_radius=EARTH_RADIUS*u.km):
+        """
+        Initialisation function for the Earth occultation constraint, where
+        a subtarget is occulted if its line of sight passes below the
+        grazing height above the Earth's limb.
+
+        Parameters
+        ----------
+        grazing_height : astropy.units.quantity.Quantity, optional
+            Minimum height of the line of sight above the Earth's surface,
+            accounting for the atmosphere. The default is 100 km.
+        earth_radius : astropy.units.quantity.Quantity, optional
+            Earth radius. The default is 6378.137 km.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store constraint parameters
+        self.grazing_height = grazing_height.to_value(u.km)
+        self.earth_radius = earth_radius.to_value(u.km)
+
+    def calculate(self, spacecraft_position, sun_position, vectors, radii, jd):
+        """
+        Function to calculate subtarget visibility above the Earth's limb.
+
+        Parameters
+        ----------
+        spacecraft_position : numpy.ndarray
+            Geocentric spacecraft positions [km] with shape (T, 3).
+        sun_position : numpy.ndarray
+            Geocentric Sun positions [km] with shape (T, 3), not used.
+        vectors : numpy.ndarray
+            Subtarget unit vectors with shape (S, 3).
+        radii : numpy.ndarray
+            Subtarget angular radii [rad] with shape (S,).
+        jd : numpy.ndarray
+            UTC Julian dates with shape (T,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (S, T), true when visible.
+
+        """
+
+        # Calculate nadir direction and angular radius of the limb at the
+        # grazing height
+        nadir, limb_radius = geometry.body_geometry(
+            np.zeros_like(spacecraft_position), spacecraft_position,
+            self.earth_radius + self.grazing_height)
+
+        # Calculate separation between the subtargets and the nadir
+        separation = np.arccos(np.clip(vectors @ nadir.T, -1, 1))
+
+        return separation - radii[:, None] - limb_radius >= 0
+
+
+class Eclipse(VisibilityConstraint):
+
+    # Define whether the constraint depends on the target
+    target_dependent = False
+
+    def __init__(self, observe="eclipse", shadow="umbra"):
+        """
+        Initialisation function for the eclipse constraint, which limits
+        observations to when the spacecraft is in the Earth's shadow, or to
+        when it is in sunlight.
+
+        Parameters
+        ----------
+        observe : str, optional
+            Either "eclipse" to observe only in the shadow, such as to
+            avoid stray light, or "sunlit" to observe only in sunlight, such
+            as for power. The default is "eclipse".
+        shadow : str, optional
+            Either "umbra" or "penumbra", defining the shadow.
+            The default is "umbra".
+
+        Raises
+        ------
+        ValueError
+            Error if an option is invalid.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Check options
+        if observe not in ("eclipse", "sunlit"):
+            raise ValueError(f"Invalid eclipse observation option: {observe}")
+        if shadow not in ("umbra", "penumbra"):
+            raise ValueError(f"Invalid shadow option: {shadow}")
+
+        # Store options
+        self.observe = observe
+        self.shadow = shadow
+
+    def calculate(self, spacecraft_position, sun_position, vectors, radii, jd):
+        """
+        Function to calculate visibility depending on the spacecraft eclipse
+        state, which is the same for all subtargets.
+
+        Parameters
+        ----------
+        spacecraft_position : numpy.ndarray
+            Geocentric spacecraft positions [km] with shape (T, 3).
+        sun_position : numpy.ndarray
+            Geocentric Sun positions [km] with shape (T, 3).
+        vectors : numpy.ndarray
+            Subtarget unit vectors with shape (S, 3), not used.
+        radii : numpy.ndarray
+            Subtarget angular radii [rad] with shape (S,), not used.
+        jd : numpy.ndarray
+            UTC Julian dates with shape (T,), not used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (T,), true when visible.
+
+        """
+
+        # Calculate shadow
+        umbra, penumbra = shadow_fraction(spacecraft_position, sun_position)
+        in_shadow = umbra if self.shadow == "umbra" else penumbra
+
+        return in_shadow if self.observe == "eclipse" else ~in_shadow
+
+
+def greenwich_sidereal_time(jd):
+    """
+    Function to calculate the Greenwich mean sidereal time, approximating
+    UT1 as UTC.
+
+    Parameters
+    ----------
+    jd : numpy.ndarray
+        UTC Julian dates.
+
+    Returns
+    -------
+    numpy.ndarray
+        Greenwich mean sidereal time [rad].
+
+    """
+
+    # Calculate centuries since J2000
+    d = jd - 2451545.0
+    t = d / 36525
+
+    # Calculate sidereal time
+    gmst = (280.46061837 + 360.98564736629*d
+            + 0.000387933*t**2 - t**3/38710000)
+
+    return np.deg2rad(gmst % 360)
+
+
+def earth_fixed_positions(spacecraft_position, jd):
+    """
+    Function to rotate geocentric spacecraft positions into the Earth-fixed
+    frame in one vectorised pass, with a single precession-nutation matrix
+    at the middle time and the Greenwich mean sidereal time. The drift of
+    precession-nutation across the times, the equation of the equinoxes and
+    polar motion are neglected, which is accurate to hundredths of a degree.
+
+    Parameters
+    ----------
+    spacecraft_position : numpy.ndarray
+        Geocentric GCRS spacecraft positions [km] with shape (T, 3).
+    jd : numpy.ndarray
+        UTC Julian dates with shape (T,).
+
+    Returns
+    -------
+    numpy.ndarray
+        Earth-fixed spacecraft positions [km] with shape (T, 3).
+
+    """
+
+    from erfa import pnm06a
+
+    # Rotate into the true equator and equinox of the middle time
+    jd_middle = 0.5*(jd[0] + jd[-1])
+    matrix = pnm06a(jd_middle, 0.0)
+    position = spacecraft_position @ matrix.T
+
+    # Rotate about the pole by the sidereal time
+    gmst = greenwich_sidereal_time(jd)
+    cos_gmst = np.cos(gmst)
+    sin_gmst = np.sin(gmst)
+    x, y, z = np.moveaxis(position, -1, 0)
+
+    return np.stack((cos_gmst*x + sin_gmst*y,
+                     -sin_gmst*x + cos_gmst*y,
+                     z), axis=-1)
+
+
+def subsatellite_points(spacecraft_position, jd):
+    """
+    Function to calculate the geodetic latitude and longitude of the
+    sub-satellite points from the Earth-fixed positions.
+
+    Parameters
+    ----------
+    spacecraft_position : numpy.ndarray
+        Geocentric GCRS spacecraft positions [km] with shape (T, 3).
+    jd : numpy.ndarray
+        UTC Julian dates with shape (T,).
+
+    Returns
+    -------
+    latitude : numpy.ndarray
+        Geodetic latitude [deg] with shape (T,).
+    longitude : numpy.ndarray
+        Longitude [deg] in [-180, 180) with shape (T,).
+
+    """
+
+    # Calculate longitude and geocentric latitude
+    x, y, z = np.moveaxis(earth_fixed_positions(spacecraft_position, jd),
+                          -1, 0)
+    longitude = np.rad2deg(np.arctan2(y, x))
+    longitude = (longitude + 180) % 360 - 180
+    geocentric_latitude = np.arctan2(z, np.hypot(x, y))
+
+    # Convert to geodetic latitude at the surface
+    latitude = np.rad2deg(np.arctan(np.tan(geocentric_latitude)
+                                    / (1 - EARTH_FLATTENING)**2))
+
+    return latitude, longitude
+
+
+def points_in_polygon(longitude, latitude, vertices):
+    """
+    Function to test whether points are inside a polygon with ray casting,
+    vectorised over the points.
+
+    Parameters
+    ----------
+    longitude : numpy.ndarray
+        Point longitudes [deg].
+    latitude : numpy.ndarray
+        Point latitudes [deg].
+    vertices : numpy.ndarray
+        Polygon vertices as longitude and latitude [deg] with shape (N, 2).
+
+    Returns
+    -------
+    inside : numpy.ndarray
+        Boolean array, true when the point is inside the polygon.
+
+    """
+
+    # Iterate through edges, toggling points whose ray crosses the edge
+    inside = np.zeros(np.shape(longitude), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        if y1 == y2:
+            continue
+        crosses = (y1 > latitude) != (y2 > latitude)
+        x_cross = x1 + (latitude - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (longitude < x_cross)
+
+    return inside
+
+
+class GeographicExclusion(VisibilityConstraint):
+
+    # Define whether the constraint depends on the target
+    target_dependent = False
+
+    def __init__(self, name, vertices, resolution=0.25*u.deg):
+        """
+        Initialisation function for a geographic exclusion zone, such as the
+        South Atlantic Anomaly, where observations are suspended while the
+        sub-satellite point is inside the polygon. The polygon is rasterised
+        once so that each time step is a single lookup.
+
+        Parameters
+        ----------
+        name : str
+            Name of the exclusion zone.
+        vertices : list
+            Polygon vertices as [longitude, latitude] pairs [deg]. Polygons
+            may cross the antimeridian.
+        resolution : astropy.units.quantity.Quantity, optional
+            Raster resolution. The default is 0.25 deg.
+
+        Raises
+        ------
+        ValueError
+            Error if the polygon has fewer than three vertices.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Check vertices
+        vertices = np.asarray(vertices, dtype=float)
+        if vertices.ndim != 2 or vertices.shape[1] != 2 or len(vertices) < 3:
+            raise ValueError(f"Invalid exclusion zone polygon: {name}")
+
+        # Unwrap longitudes so that the polygon may cross the antimeridian
+        vertices[:, 0] = np.rad2deg(np.unwrap(np.deg2rad(vertices[:, 0])))
+
+        # Store exclusion zone properties
+        self.name = name
+        self.vertices = vertices
+        self.resolution = resolution.to_value(u.deg)
+
+        # Calculate raster cell centres
+        nlat = int(np.ceil(180 / self.resolution))
+        nlon = int(np.ceil(360 / self.resolution))
+        latitude = -90 + (np.arange(nlat) + 0.5) * 180 / nlat
+        longitude = -180 + (np.arange(nlon) + 0.5) * 360 / nlon
+        longitude, latitude = np.meshgrid(longitude, latitude)
+
+        # Rasterise polygon, testing the wrapped copies of each cell
+        raster = np.zeros((nlat, nlon), dtype=bool)
+        for offset in (-360, 0, 360):
+            raster |= points_in_polygon(longitude + offset, latitude, vertices)
+
+        # Store raster
+        self.raster = raster
+
+    def contains(self, latitude, longitude):
+        """
+        Function to look up whether geographic points are inside the
+        exclusion zone.
+
+        Parameters
+        ----------
+        latitude : numpy.ndarray
+            Latitude [deg].
+        longitude : numpy.ndarray
+            Longitude [deg] in [-180, 180).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array, true when inside the exclusion zone.
+
+        """
+
+        # Calculate raster indices
+        nlat, nlon = self.raster.shape
+        ilat = np.clip(((latitude + 90) * nlat / 180).astype(int), 0, nlat-1)
+        ilon = np.clip(((longitude + 180) * nlon / 360).astype(int), 0, nlon-1)
+
+        return self.raster[ilat, ilon]
+
+    def calculate(self, spacecraft_position, sun_position, vectors, radii, jd):
+        """
+        Function to calculate visibility outside the exclusion zone, which
+        is the same for all subtargets.
+
+        Parameters
+        ----------
+        spacecraft_position : numpy.ndarray
+            Geocentric spacecraft positions [km] with shape (T, 3).
+        sun_position : numpy.ndarray
+            Geocentric Sun positions [km] with shape (T, 3), not used.
+        vectors : numpy.ndarray
+            Subtarget unit vectors with shape (S, 3), not used.
+        radii : numpy.ndarray
+            Subtarget angular radii [rad] with shape (S,), not used.
+        jd : numpy.ndarray
+            UTC Julian dates with shape (T,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (T,), true when visible.
+
+        """
+
+        # Calculate sub-satellite points and look up exclusion zone
+        latitude, longitude = subsatellite_points(spacecraft_position, jd)
+
+        return ~self.contains(latitude, longitude)
+
+
+def load_exclusion_zones(path="data/exclusion_zones.yml", resolution=0.25*u.deg):
+    """
+    Function to import geographic exclusion zones.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the exclusion zones file.
+        The default is "data/exclusion_zones.yml".
+    resolution : astropy.units.quantity.Quantity, optional
+        Raster resolution. The default is 0.25 deg.
+
+    Returns
+    -------
+    exclusion_zones : list
+        Geographic exclusion constraint objects of included zones.
+
+    """
+
+    # Load exclusion zones file
+    with open(path, "r") as exclusion_zones_file:
+        exclusion_zones_dump = yaml.safe_load(exclusion_zones_file)
+
+    # Return empty list if file is empty
+    if exclusion_zones_dump is None:
+        return []
+
+    # Create exclusion zones
+    exclusion_zones = [GeographicExclusion(name, info["vertices"], resolution)
+                       for name, info in exclusion_zones_dump.items()
+                       if info["included"]]
+
+    return exclusion_zones
+
+
+def constraint_geometry(spacecraft_frame, solar_bodies, ephem="jpl"):
+    """
+    Function to extract the geocentric spacecraft and Sun positions and the
+    times used by the constraints.
+
+    Parameters
+    ----------
+    spacecraft_frame : astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame relative to the Earth's centre of mass
+        with the same orientation as BCRS/ICRS.
+    solar_bodies : list
+        Solar system bodies and their properties. The Sun position is taken
+        from the "sun" body if present, or else calculated.
+    ephem : str, optional
+        Ephemeris selection if the Sun is not a solar body.
+        The default is "jpl".
+
+    Returns
+    -------
+    spacecraft_position : numpy.ndarray
+        Geocentric spacecraft positions [km] with shape (T, 3).
+    sun_position : numpy.ndarray
+        Geocentric Sun positions [km] with shape (T, 3).
+    jd : numpy.ndarray
+        UTC Julian dates with shape (T,).
+
+    """
+
+    # Extract spacecraft position
+    spacecraft_position = np.moveaxis(
+        spacecraft_frame.obsgeoloc.xyz.to_value(u.km), 0, -1)
+
+    # Extract Sun position relative to the spacecraft, or calculate it
+    for solar_body in solar_bodies:
+        if solar_body.name == "sun":
+            relative = solar_body.coordinates.cartesian.xyz.to_value(u.km)
+            sun_position = np.moveaxis(relative, 0, -1) + spacecraft_position
+            break
+    else:
+        sun_position = geometry.geocentric_positions(
+            ["sun"], spacecraft_frame.obstime, ephem)["sun"]
+
+    # Extract UTC Julian dates
+    jd = spacecraft_frame.obstime.utc.jd
+
+    return spacecraft_position, sun_position, jd
+
+
+def global_mask(constraints, spacecraft_position, sun_position, jd):
+    """
+    Function to calculate the global mask of the constraints which do not
+    depend on the target, shared by all targets.
+
+    Parameters
+    ----------
+    constraints : list
+        Visibility constraint objects.
+    spacecraft_position : numpy.ndarray
+        Geocentric spacecraft positions [km] with shape (T, 3).
+    sun_position : numpy.ndarray
+        Geocentric Sun positions [km] with shape (T, 3).
+    jd : numpy.ndarray
+        UTC Julian dates with shape (T,).
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        Array of booleans with shape (T,), true when targets may be visible.
+
+    """
+
+    # Iterate through target-independent constraints to calculate the mask
+    mask = np.ones(len(spacecraft_position), dtype=bool)
+    for constraint in constraints:
+        if constraint.target_dependent:
+            continue
+        mask &= constraint.calculate(spacecraft_position, sun_position,
+                                     None, None, jd)
+
+    return mask
+
+
+def target_visibility(target, constraints, spacecraft_position, sun_position, jd):
+    """
+    Function to calculate target visibility under the list of constraints
+    which depend on the target, where all subtargets must satisfy all
+    constraints.
+
+    Parameters
+    ----------
+    target : AstroTarget
+        Target object.
+    constraints : list
+        Visibility constraint objects.
+    spacecraft_position : numpy.ndarray
+        Geocentric spacecraft positions [km] with shape (T, 3).
+    sun_position : numpy.ndarray
+        Geocentric Sun positions [km] with shape (T, 3).
+    jd : numpy.ndarray
+        UTC Julian dates with shape (T,).
+
+    Returns
+    -------
+    visibility : numpy.ndarray
+        Array of booleans with shape (T,), true when target is visible.
+
+    """
+
+    # Select target-dependent constraints
+    visibility = np.ones(len(spacecraft_position), dtype=bool)
+    constraints = [constraint for constraint in constraints
+                   if constraint.target_dependent]
+    if not constraints:
+        return visibility
+
+    # Extract subtarget vectors and angular radii
+    vectors = np.array([geometry.coordinate_vectors(subtarget.icrs_coordinates)
+                        for subtarget in target.subtargets])
+    radii = np.array([subtarget.angular_radius.to_value(u.rad)
+                      for subtarget in target.subtargets])
+
+    # Iterate through constraints to calculate visibility
+    for constraint in constraints:
+        constraint_visibility = constraint.calculate(
+            spacecraft_position, sun_position, vectors, radii, jd)
+        visibility &= np.all(np.atleast_2d(constraint_visibility), axis=0)
+
+    return visibility
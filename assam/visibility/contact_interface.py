@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import itertools
+import os
+
+import numpy as np
+
+# Define file extensions of supported formats
+FILE_FORMATS = {".parquet": "parquet",
+                ".arrow": "ipc",
+                ".feather": "ipc",
+                ".ipc": "ipc"}
+
+
+def file_format(path):
+    """
+    Function to find the columnar file format from the file extension.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+
+    Raises
+    ------
+    ValueError
+        Error if the file extension is not supported.
+
+    Returns
+    -------
+    str
+        File format, either "parquet" or "ipc".
+
+    """
+
+    # Extract file extension
+    extension = os.path.splitext(path)[1].lower()
+
+    # Check for supported format
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Invalid file format: {extension}")
+
+    return FILE_FORMATS[extension]
+
+
+def import_pyarrow():
+    """
+    Function to import pyarrow, which is an optional dependency.
+
+    Raises
+    ------
+    ImportError
+        Error if pyarrow is not installed.
+
+    Returns
+    -------
+    pa : module
+        Pyarrow module.
+
+    """
+
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Columnar file output requires pyarrow") from error
+
+    return pa
+
+
+class TableWriter():
+
+    def __init__(self, path, schema):
+        """
+        Initialisation function for the streaming table writer. Rows are
+        written incrementally, as Parquet row groups or Arrow IPC record
+        batches, so that large tables are not held in memory.
+
+        Parameters
+        ----------
+        path : str
+            Output file path, with the format set by the extension.
+        schema : pyarrow.lib.Schema
+            Table schema.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Import pyarrow
+        pa = import_pyarrow()
+
+        # Store schema
+        self.schema = schema
+        self.nrows = 0
+
+        # Open writer for the file format
+        if file_format(path) == "parquet":
+            self.writer = pa.parquet.ParquetWriter(path, schema)
+        else:
+            self.writer = pa.ipc.new_file(path, schema)
+
+    def write(self, columns):
+        """
+        Function to write a batch of rows.
+
+        Parameters
+        ----------
+        columns : dict
+            Column arrays of the batch, keyed by column name.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Import pyarrow
+        pa = import_pyarrow()
+
+        # Create and write table
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        self.writer.write_table(table)
+
+        # Update row count
+        self.nrows += table.num_rows
+
+    def close(self):
+        """
+        Function to close the writer.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def contact_schema():
+    """
+    Function to define the schema of contact tables.
+
+    Returns
+    -------
+    schema : pyarrow.lib.Schema
+        Contact table schema.
+
+    """
+
+    # Import pyarrow
+    pa = import_pyarrow()
+
+    # Define schema
+    schema = pa.schema([("target", pa.string()),
+                        ("category", pa.string()),
+                        ("priority", pa.int64()),
+                        ("start", pa.float64()),
+                        ("end", pa.float64()),
+                        ("duration", pa.float64()),
+                        ("benefit", pa.float64()),
+                        ("spacecraft", pa.string())])
+
+    return schema
+
+
+def save_contacts(contacts, path, batch_size=65536):
+    """
+    Function to stream contacts to a columnar file.
+
+    Parameters
+    ----------
+    contacts : iterable
+        Contacts to save, which may be a generator.
+    path : str
+        Output file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    batch_size : int, optional
+        Number of contacts per row group or record batch.
+        The default is 65536.
+
+    Returns
+    -------
+    nrows : int
+        Number of contacts written.
+
+    """
+
+    # Create iterator over contacts
+    contacts = iter(contacts)
+
+    # Open writer
+    with TableWriter(path, contact_schema()) as writer:
+        # Iterate through batches of contacts
+        while True:
+            batch = list(itertools.islice(contacts, batch_size))
+            if not batch:
+                break
+
+            # Extract contact properties
+            start = np.array([contact.start for contact in batch])
+            end = np.array([contact.end for contact in batch])
+            writer.write({"target": [contact.target.name for contact in batch],
+                          "category": [contact.target.category
+                                       for contact in batch],
+                          "priority": [contact.target.priority
+                                       for contact in batch],
+                          "start": start,
+                          "end": end,
+                          "duration": end - start,
+                          "benefit": [contact.benefit for contact in batch],
+                          "spacecraft": [getattr(contact, "spacecraft", None)
+                                         for contact in batch]})
+
+    return writer.nrows
+
+
+def save_stats(stats, path, batch_size=65536):
+    """
+    Function to save a statistics DataFrame to a columnar file.
+
+    Parameters
+    ----------
+    stats : pandas.core.frame.DataFrame
+        Statistics to save.
+    path : str
+        Output file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    batch_size : int, optional
+        Number of rows per row group or record batch. The default is 65536.
+
+    Returns
+    -------
+    nrows : int
+        Number of rows written.
+
+    """
+
+    # Import pyarrow
+    pa = import_pyarrow()
+
+    # Infer schema from the DataFrame
+    schema = pa.Schema.from_pandas(stats, preserve_index=False)
+
+    # Write DataFrame in batches
+    with TableWriter(path, schema) as writer:
+        for istart in range(0, len(stats), batch_size):
+            batch = stats.iloc[istart:istart+batch_size]
+            writer.write({name: batch[name].values for name in stats.columns})
+
+    return writer.nrows
+
+
+def iter_table(path, columns=None):
+    """
+    Function to stream a columnar file as DataFrames, one per row group or
+    record batch.
+
+    Parameters
+    ----------
+    path : str
+        Input file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    columns : list, optional
+        Columns to read. The default is None which reads all columns.
+
+    Yields
+    ------
+    batch : pandas.core.frame.DataFrame
+        Batch of rows.
+
+    """
+
+    # Import pyarrow
+    pa = import_pyarrow()
+
+    # Iterate through row groups or record batches
+    if file_format(path) == "parquet":
+        parquet_file = pa.parquet.ParquetFile(path)
+        for igroup in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(igroup, columns=columns).to_pandas()
+    else:
+        with pa.memory_map(path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for ibatch in range(reader.num_record_batches):
+                batch = reader.get_batch(ibatch)
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield batch.to_pandas()
+
+
+def load_table(path, columns=None):
+    """
+    Function to load a columnar file as a DataFrame.
+
+    Parameters
+    ----------
+    path : str
+        Input file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    columns : list, optional
+        Columns to read. The default is None which reads all columns.
+
+    Returns
+    -------
+    table : pandas.core.frame.DataFrame
+        Loaded table.
+
+    """
+
+    # Import pyarrow
+    pa = import_pyarrow()
+
+    # Read table
+    if file_format(path) == "parquet":
+        table = pa.parquet.read_table(path, columns=columns)
+    else:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+
+    return table.to_pandas()
+
+
+def load_contacts(path, columns=None):
+    """
+    Function to load contacts from a columnar file.
+
+    Parameters
+    ----------
+    path : str
+        Input file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    columns : list, optional
+        Columns to read. The default is None which reads all columns.
+
+    Returns
+    -------
+    contacts : pandas.core.frame.DataFrame
+        Contact table.
+
+    """
+
+    return load_table(path, columns)
+
+
+def load_stats(path, columns=None):
+    """
+    Function to load statistics from a columnar file.
+
+    Parameters
+    ----------
+    path : str
+        Input file path, either Parquet (.parquet) or Arrow IPC
+        (.arrow, .feather, .ipc).
+    columns : list, optional
+        Columns to read. The default is None which reads all columns.
+
+    Returns
+    -------
+    stats : pandas.core.frame.DataFrame
+        Statistics table.
+
+    """
+
+    return load_table(path, columns)
@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from astropy.coordinates import CartesianRepresentation, SkyCoord
+import numpy as np
+
+from .constraints import points_in_polygon
+from .geometry import coordinate_vectors, unit_vectors
+
+
+def spherical_vectors(lon, lat):
+    """
+    Function to calculate unit vectors from spherical coordinates.
+
+    Parameters
+    ----------
+    lon : numpy.ndarray
+        Longitude [rad].
+    lat : numpy.ndarray
+        Latitude [rad].
+
+    Returns
+    -------
+    numpy.ndarray
+        Unit vectors, with shape (..., 3).
+
+    """
+
+    return np.stack((np.cos(lat)*np.cos(lon),
+                     np.cos(lat)*np.sin(lon),
+                     np.sin(lat)), axis=-1)
+
+
+def rectangle_vectors(lon, lat, width, height):
+    """
+    Function to calculate the corners of rectangles aligned with the
+    longitude and latitude directions at their centres, where the sides are
+    great circle arcs through the corners of the gnomonic projection.
+
+    Parameters
+    ----------
+    lon : numpy.ndarray
+        Centre longitude [rad] with shape (N,).
+    lat : numpy.ndarray
+        Centre latitude [rad] with shape (N,).
+    width : numpy.ndarray
+        Angular width [rad] with shape (N,).
+    height : numpy.ndarray
+        Angular height [rad] with shape (N,).
+
+    Returns
+    -------
+    numpy.ndarray
+        Corner unit vectors in the frame of the centres with shape (N, 4, 3).
+
+    """
+
+    # Calculate centre, east and north unit vectors
+    lon = np.asarray(lon, dtype=float)[:, None, None]
+    lat = np.asarray(lat, dtype=float)[:, None, None]
+    centre = spherical_vectors(lon[..., 0], lat[..., 0])
+    east = np.concatenate((-np.sin(lon), np.cos(lon), np.zeros_like(lon)),
+                          axis=-1)
+    north = np.concatenate((-np.sin(lat)*np.cos(lon), -np.sin(lat)*np.sin(lon),
+                            np.cos(lat)), axis=-1)
+
+    # Calculate corners in the tangent plane, in anticlockwise order
+    x = np.tan(0.5*np.asarray(width, dtype=float))[:, None, None] \
+        * np.array([-1, 1, 1, -1])[None, :, None]
+    y = np.tan(0.5*np.asarray(height, dtype=float))[:, None, None] \
+        * np.array([-1, -1, 1, 1])[None, :, None]
+
+    return unit_vectors(centre + x*east + y*north)
+
+
+def frame_to_icrs(vectors, frame):
+    """
+    Function to transform unit vectors from a celestial frame into ICRS.
+
+    Parameters
+    ----------
+    vectors : numpy.ndarray
+        Unit vectors, with shape (..., 3).
+    frame : str
+        Frame of the vectors.
+
+    Returns
+    -------
+    numpy.ndarray
+        ICRS unit vectors, with shape (..., 3).
+
+    """
+
+    # Transform vectors
+    coordinates = SkyCoord(CartesianRepresentation(np.moveaxis(vectors, -1, 0)),
+                           frame=frame, representation_type="cartesian")
+
+    return coordinate_vectors(coordinates.transform_to("icrs"))
+
+
+class Footprint():
+
+    def __init__(self, vertices, centre):
+        """
+        Initialisation function for an exact subtarget footprint, which is a
+        spherical polygon with great circle edges, smaller than a hemisphere.
+
+        Parameters
+        ----------
+        vertices : numpy.ndarray
+            ICRS unit vectors of the vertices with shape (V, 3).
+        centre : numpy.ndarray
+            ICRS unit vector of the subtarget centre.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Store vertices and centre
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.centre = np.asarray(centre, dtype=float)
+
+        # Calculate edge great circle normals, and the tangents at the edge
+        # vertices pointing into the edges
+        ends = np.roll(self.vertices, -1, axis=0)
+        self.normals = unit_vectors(np.cross(self.vertices, ends))
+        self.start_tangents = np.cross(self.normals, self.vertices)
+        self.end_tangents = np.cross(ends, self.normals)
+
+        # Calculate bounding circle radius about the centre
+        self.radius = np.max(np.arccos(np.clip(self.vertices @ self.centre,
+                                               -1, 1)))
+
+        # Calculate gnomonic projection basis about the centre, and the
+        # projected vertices for point in polygon tests
+        axis = np.eye(3)[np.argmin(np.abs(self.centre))]
+        self.east = unit_vectors(np.cross(axis, self.centre))
+        self.north = np.cross(self.centre, self.east)
+        self.projected = np.stack(self.project(self.vertices), axis=-1)
+
+        # Check whether the centre is inside the footprint, which bounds the
+        # distances to the footprint by the distance to the centre
+        self.centre_inside = bool(self.contains(self.centre[None])[0])
+
+    def project(self, points):
+        """
+        Function to project points onto the gnomonic tangent plane at the
+        centre, where great circles are straight lines.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Unit vectors with shape (K, 3).
+
+        Returns
+        -------
+        x : numpy.ndarray
+            Projected east coordinates with shape (K,).
+        y : numpy.ndarray
+            Projected north coordinates with shape (K,).
+
+        """
+
+        # Project points
+        with np.errstate(divide="ignore", invalid="ignore"):
+            depth = points @ self.centre
+            return (points @ self.east) / depth, (points @ self.north) / depth
+
+    def contains(self, points):
+        """
+        Function to test whether points are inside the footprint.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Unit vectors with shape (K, 3).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (K,), true when inside.
+
+        """
+
+        # Test projected points in the hemisphere of the centre
+        x, y = self.project(points)
+        front = points @ self.centre > 0
+        inside = np.zeros(len(points), dtype=bool)
+        inside[front] = points_in_polygon(x[front], y[front], self.projected)
+
+        return inside
+
+    def min_distance(self, points):
+        """
+        Function to calculate the angular distance from points to the
+        nearest point of the footprint, which is zero inside.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Unit vectors with shape (K, 3).
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            Angular distance [rad] with shape (K,).
+
+        """
+
+        # Calculate distances to the vertices
+        vertex_distance = np.arccos(np.clip(points @ self.vertices.T, -1, 1))
+        distance = np.min(vertex_distance, axis=1)
+
+        # Calculate distances to the edge interiors, where the closest point
+        # of the edge great circle lies between the edge vertices
+        height = points @ self.normals.T
+        between = ((points @ self.start_tangents.T >= 0)
+                   & (points @ self.end_tangents.T >= 0))
+        edge_distance = np.where(between,
+                                 np.arcsin(np.clip(np.abs(height), 0, 1)),
+                                 np.inf)
+        distance = np.minimum(distance, np.min(edge_distance, axis=1))
+
+        # Set distance inside the footprint to zero
+        distance[self.contains(points)] = 0.0
+
+        return distance
+
+    def max_distance(self, points):
+        """
+        Function to calculate the angular distance from points to the
+        farthest point of the footprint.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Unit vectors with shape (K, 3).
+
+        Returns
+        -------
+        numpy.ndarray
+            Angular distance [rad] with shape (K,).
+
+        """
+
+        return np.pi - self.min_distance(-points)
+
+
+def footprint_visibility(footprint, separation, bound, body_radius, soft_radii, body_vectors):
+    """
+    Function to calculate subtarget visibility relative to a solar body
+    with the exact footprint. The bounding circle decides times far from the
+    footprint boundary, and the distances from the solar body to the
+    footprint are only calculated for the remaining times.
+
+    Parameters
+    ----------
+    footprint : Footprint
+        Subtarget footprint.
+    separation : numpy.ndarray
+        Angular separation between the subtarget centre and the solar body
+        [rad] with shape (T,).
+    bound : float
+        Bounding circle angular radius of the footprint [rad].
+    body_radius : numpy.ndarray
+        Solar body angular radius [rad] with shape (T,) or ().
+    soft_radii : numpy.ndarray
+        Soft radius bands [rad] with shape (-1, 2).
+    body_vectors : callable
+        Function returning the solar body unit vectors with shape (T, 3),
+        which is only called if the bounding circle is not decisive.
+
+    Returns
+    -------
+    visible : numpy.ndarray
+        Boolean array with shape (T,), true when visible.
+
+    """
+
+    # Extract body radius and whether the centre is inside the footprint
+    body_radius = np.broadcast_to(body_radius, separation.shape)
+    inside = footprint.centre_inside
+    vectors = None
+
+    # Calculate basic visibility, which is certain away from the body,
+    # and certain within the body if the centre is inside the footprint
+    visible = separation - bound - body_radius >= 0
+    uncertain = ~visible & (~inside | (separation >= body_radius))
+    if np.any(uncertain):
+        vectors = body_vectors()
+        distance = footprint.min_distance(vectors[uncertain])
+        visible[uncertain] = distance - body_radius[uncertain] >= 0
+
+    # Calculate soft radius restrictions, which are certain if the
+    # centre is inside the footprint and within the band, or if the
+    # bounding circle does not intersect the band
+    for radius_inner, radius_outer in soft_radii:
+        violating = inside & (separation < radius_outer) \
+            & (separation > radius_inner)
+        uncertain = ~violating & (separation - bound < radius_outer) \
+            & (separation + bound > radius_inner)
+        if np.any(uncertain):
+            if vectors is None:
+                vectors = body_vectors()
+            min_distance = footprint.min_distance(vectors[uncertain])
+            max_distance = footprint.max_distance(vectors[uncertain])
+            violating[uncertain] = (min_distance < radius_outer) \
+                & (max_distance > radius_inner)
+        visible &= ~violating
+
+    return visible
+
+
+def column_footprints(columns):
+    """
+    Function to create the exact footprints of the rectangular subtargets of
+    catalogue columns, where polygons keep only their bounding circles.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    Returns
+    -------
+    footprints : dict
+        Footprints keyed by subtarget row.
+
+    """
+
+    # Find rectangular subtargets
+    rows = np.flatnonzero(columns["shape"] == "rectangular")
+    footprints = {}
+
+    # Calculate corners and centres, transforming them into ICRS by frame
+    for frame in np.unique(columns["frame"][rows]):
+        frame_rows = rows[columns["frame"][rows] == frame]
+        lon = np.radians(columns["lon"][frame_rows])
+        lat = np.radians(columns["lat"][frame_rows])
+        corners = rectangle_vectors(lon, lat,
+                                    np.radians(columns["width"][frame_rows]),
+                                    np.radians(columns["height"][frame_rows]))
+        vectors = frame_to_icrs(
+            np.concatenate((corners, spherical_vectors(lon, lat)[:, None]),
+                           axis=1), frame)
+        for row, row_vectors in zip(frame_rows, vectors):
+            footprints[int(row)] = Footprint(row_vectors[:-1], row_vectors[-1])
+
+    return footprints
+
+
+def subtarget_footprint(frame, centre, shape, width=None, height=None, vertices=None):
+    """
+    Function to create the exact footprint of a subtarget.
+
+    Parameters
+    ----------
+    frame : str
+        Subtarget reference frame.
+    centre : list
+        Subtarget centre longitude and latitude [deg].
+    shape : str
+        Subtarget shape, either "circular", "rectangular" or "polygon".
+    width : float, optional
+        Rectangle width [deg]. The default is None.
+    height : float, optional
+        Rectangle height [deg]. The default is None.
+    vertices : list, optional
+        Polygon vertices as [longitude, latitude] pairs [deg].
+        The default is None.
+
+    Returns
+    -------
+    Footprint or None
+        Footprint, or None for circular subtargets.
+
+    """
+
+    # Calculate vertices in the subtarget frame
+    centre = np.radians(np.asarray(centre, dtype=float))
+    if shape == "rectangular":
+        frame_vertices = rectangle_vectors(centre[:1], centre[1:],
+                                           np.radians([width]),
+                                           np.radians([height]))[0]
+    elif shape == "polygon":
+        vertices = np.radians(np.asarray(vertices, dtype=float))
+        frame_vertices = spherical_vectors(vertices[:, 0], vertices[:, 1])
+    else:
+        return None
+
+    # Transform vertices and centre into ICRS together
+    icrs_vectors = frame_to_icrs(
+        np.concatenate((frame_vertices,
+                        spherical_vectors(centre[:1], centre[1:]))), frame)
+
+    return Footprint(icrs_vectors[:-1], icrs_vectors[-1])
+
+
+def polygon_radius(centre, vertices):
+    """
+    Function to calculate the bounding circle radius of a polygon about its
+    centre.
+
+    Parameters
+    ----------
+    centre : list
+        Centre longitude and latitude [deg].
+    vertices : list
+        Polygon vertices as [longitude, latitude] pairs [deg].
+
+    Returns
+    -------
+    float
+        Bounding circle radius [deg].
+
+    """
+
+    # Calculate angles between the centre and vertices
+    centre = np.radians(np.asarray(centre, dtype=float))
+    vertices = np.radians(np.asarray(vertices, dtype=float))
+    cos_angle = (spherical_vectors(vertices[:, 0], vertices[:, 1])
+                 @ spherical_vectors(centre[0], centre[1]))
+
+    return np.degrees(np.max(np.arccos(np.clip(cos_angle, -1, 1))))
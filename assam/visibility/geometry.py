@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from astropy import units as u
+import numpy as np
+
+from . import spatial_index
+
+
+def unit_vectors(xyz):
+    """
+    Function to normalise vectors.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        Array of vectors, with shape (..., 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of unit vectors, with shape (..., 3).
+
+    """
+
+    return xyz / np.linalg.norm(xyz, axis=-1, keepdims=True)
+
+
+def coordinate_vectors(coordinates):
+    """
+    Function to calculate the unit vectors of coordinates in their frame.
+
+    Parameters
+    ----------
+    coordinates : astropy.coordinates.sky_coordinate.SkyCoord
+        Coordinates.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of unit vectors, with shape (..., 3).
+
+    """
+
+    return unit_vectors(np.moveaxis(coordinates.cartesian.xyz.value, 0, -1))
+
+
+def subtarget_geometry(catalogue):
+    """
+    Function to calculate the ICRS unit vectors and angular radii of the
+    subtargets of a target catalogue. Targets are treated as infinitely
+    distant, so their directions do not depend on the spacecraft position.
+
+    Parameters
+    ----------
+    catalogue : dict
+        Target information keyed by target name, as in the targets file.
+
+    Raises
+    ------
+    ValueError
+        Error if a subtarget shape is invalid.
+
+    Returns
+    -------
+    geometry : dict
+        Target names, categories and priorities, and subtarget unit vectors
+        with shape (S, 3), angular radii [rad] and target indices.
+
+    """
+
+    from .catalogue_interface import catalogue_columns
+
+    return column_geometry(catalogue_columns(catalogue))
+
+
+def column_geometry(columns):
+    """
+    Function to calculate the ICRS unit vectors and angular radii of the
+    subtargets of catalogue columns, with one row per subtarget. Rectangles
+    and polygons are represented by their bounding circles.
+
+    Parameters
+    ----------
+    columns : dict
+        Catalogue columns keyed by name.
+
+    Raises
+    ------
+    ValueError
+        Error if a subtarget shape is invalid.
+
+    Returns
+    -------
+    geometry : dict
+        Target names, categories and priorities, and subtarget unit vectors
+        with shape (S, 3), angular radii [rad] and target indices.
+
+    """
+
+    from astropy.coordinates import SkyCoord
+
+    # Find targets in order of first appearance
+    _, first, itarget = np.unique(columns["target"], return_index=True,
+                                  return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    first = first[order]
+
+    # Calculate bounding circle angular radii
+    shape = columns["shape"]
+    invalid = ~np.isin(shape, ("rectangular", "circular", "polygon"))
+    if np.any(invalid):
+        i = np.flatnonzero(invalid)[0]
+        raise ValueError(f"Invalid subtarget shape: {columns['target'][i]}, {columns['subtarget'][i]}")
+    radii = np.where(shape == "rectangular",
+                     0.5*np.hypot(columns["width"], columns["height"]),
+                     columns["angular_radius"])
+
+    # Convert centres to ICRS unit vectors, grouped by frame
+    frames = columns["frame"]
+    vectors = np.empty((len(frames), 3))
+    for frame in np.unique(frames):
+        ix = frames == frame
+        coordinates = SkyCoord(columns["lon"][ix], columns["lat"][ix],
+                               unit="deg", frame=frame).transform_to("icrs")
+        vectors[ix] = coordinate_vectors(coordinates)
+
+    return {"names": list(columns["target"][first]),
+            "categories": list(columns["category"][first]),
+            "priorities": columns["priority"][first],
+            "vectors": vectors,
+            "radii": np.radians(radii),
+            "itarget": rank[np.reshape(itarget, -1)]}
+
+
+def geocentric_positions(names, obstime, ephem="jpl"):
+    """
+    Function to calculate geocentric positions of solar bodies, which are
+    shared by all spacecraft over the same times.
+
+    Parameters
+    ----------
+    names : list
+        Solar body names.
+    obstime : astropy.time.core.Time
+        Observation times.
+    ephem : str, optional
+        Ephemeris selection. The default is "jpl".
+
+    Returns
+    -------
+    positions : dict
+        Geocentric GCRS positions [km] with shape (T, 3), keyed by name.
+
+    """
+
+    from astropy.coordinates import get_body, solar_system_ephemeris
+
+    # Calculate positions
+    positions = {}
+    with solar_system_ephemeris.set(ephem):
+        for name in names:
+            coordinates = get_body(name, obstime)
+            positions[name] = np.moveaxis(
+                coordinates.cartesian.xyz.to_value(u.km), 0, -1)
+
+    return positions
+
+
+def body_geometry(body_position, spacecraft_position, radius):
+    """
+    Function to calculate the direction and angular radius of a solar body
+    from the spacecraft, including the parallax of near bodies.
+
+    Parameters
+    ----------
+    body_position : numpy.ndarray
+        Geocentric body positions [km] with shape (T, 3).
+    spacecraft_position : numpy.ndarray
+        Geocentric spacecraft positions [km] with shape (T, 3).
+    radius : float
+        Body radius [km].
+
+    Returns
+    -------
+    vectors : numpy.ndarray
+        Unit vectors from the spacecraft to the body with shape (T, 3).
+    angular_radius : numpy.ndarray
+        Angular radius of the body [rad] with shape (T,).
+
+    """
+
+    # Calculate relative position
+    relative = body_position - spacecraft_position
+    distance = np.linalg.norm(relative, axis=-1)
+
+    # Calculate direction and angular radius
+    vectors = relative / distance[:, None]
+    angular_radius = np.arcsin(np.clip(radius / distance, 0, 1))
+
+    return vectors, angular_radius
+
+
+def subtarget_visibility(vectors, radii, bodies, block_size=4096, index=None, footprints=None):
+    """
+    Function to calculate the visibility of subtargets relative to solar
+    bodies, matching AstroSubtarget.calculate_visibility. With a spatial
+    index, only the subtargets near each body's exclusion zone over a block
+    are tested, so smaller blocks give fewer candidates for fast-moving
+    bodies. Subtargets with footprints are refined from their bounding
+    circles to their exact footprints.
+
+    Parameters
+    ----------
+    vectors : numpy.ndarray
+        Subtarget unit vectors with shape (S, 3).
+    radii : numpy.ndarray
+        Subtarget angular radii [rad] with shape (S,).
+    bodies : list
+        Tuples of body unit vectors with shape (T, 3), angular radii [rad]
+        with shape (T,) and soft radius bands [rad] with shape (-1, 2).
+    block_size : int, optional
+        Number of timesteps per block. The default is 4096.
+    index : assam.visibility.spatial_index.SubtargetIndex, optional
+        Spatial index of the subtargets. The default is None.
+    footprints : dict, optional
+        Exact footprints keyed by subtarget row, whose bounding circles must
+        be within the radii when using a spatial index. The default is None
+        which uses bounding circles.
+
+    Returns
+    -------
+    visibility : numpy.ndarray
+        Boolean array with shape (S, T), true when visible.
+
+    """
+
+    # Import module on first use
+    from .footprint import footprint_visibility
+
+    # Declare visibility array and sort the rows with footprints
+    ntime = len(bodies[0][0]) if bodies else 0
+    visibility = np.ones((len(vectors), ntime), dtype=bool)
+    footprint_rows = np.array(sorted(footprints or ()), dtype=int)
+    rows = np.arange(len(vectors))
+    radii = radii[:, None]
+
+    # Iterate through blocks of timesteps and solar bodies
+    for istart in range(0, ntime, block_size):
+        block = slice(istart, istart + block_size)
+        for body_vectors, body_radii, soft_radii in bodies:
+            # Find candidate subtargets near the exclusion zone
+            if index is None:
+                candidates = slice(None)
+            else:
+                caps = spatial_index.exclusion_caps(body_vectors[block],
+                                                    body_radii[block],
+                                                    soft_radii)
+                candidates = np.unique(np.concatenate(
+                    [index.query_block(cap_vectors, cap_radii)
+                     for cap_vectors, cap_radii in caps]))
+                if len(candidates) == 0:
+                    continue
+
+            # Calculate angular separation
+            separation = np.arccos(np.clip(
+                vectors[candidates] @ body_vectors[block].T, -1, 1))
+            candidate_radii = radii[candidates]
+
+            # Calculate basic visibility
+            visible = separation - candidate_radii - body_radii[block] >= 0
+
+            # Calculate soft radius restrictions
+            for radius_inner, radius_outer in soft_radii:
+                visible &= ~((separation + candidate_radii - radius_inner > 0)
+                             & (separation - candidate_radii - radius_outer < 0))
+
+            # Refine candidates with footprints
+            if len(footprint_rows):
+                candidate_rows = rows[candidates]
+                for k in np.flatnonzero(np.isin(candidate_rows, footprint_rows)):
+                    footprint = footprints[candidate_rows[k]]
+                    visible[k] = footprint_visibility(
+                        footprint, separation[k],
+                        max(candidate_radii[k, 0], footprint.radius),
+                        body_radii[block], soft_radii,
+                        lambda: body_vectors[block])
+
+            visibility[candidates, block] &= visible
+
+    return visibility
+
+
+def target_visibility(visibility, itarget, ntarget):
+    """
+    Function to combine subtarget visibility into target visibility, where
+    a target is visible when all its subtargets are visible.
+
+    Parameters
+    ----------
+    visibility : numpy.ndarray
+        Subtarget visibility with shape (S, T).
+    itarget : numpy.ndarray
+        Target index of each subtarget, in ascending order.
+    ntarget : int
+        Number of targets.
+
+    Returns
+    -------
+    numpy.ndarray
+        Target visibility with shape (N, T).
+
+    """
+
+    # Count visible subtargets of each target at each timestep
+    count = np.zeros((ntarget, visibility.shape[1]), dtype=np.int32)
+    np.add.at(count, itarget, visibility)
+
+    return count == np.bincount(itarget, minlength=ntarget)[:, None]
+
+
+def contact_summary(visibility, jd):
+    """
+    Function to summarise contacts from visibility, matching the contacts of
+    AstroTarget.calculate_contacts.
+
+    Parameters
+    ----------
+    visibility : numpy.ndarray
+        Target visibility with shape (N, T).
+    jd : numpy.ndarray
+        Observation times [JD] with shape (T,).
+
+    Returns
+    -------
+    n_contacts : numpy.ndarray
+        Number of contacts of each target.
+    total_duration : numpy.ndarray
+        Total contact duration of each target [days].
+
+    """
+
+    # Check for timesteps
+    if visibility.shape[1] < 2:
+        return (np.zeros(len(visibility), dtype=int),
+                np.zeros(len(visibility)))
+
+    # Count contacts starting before the last timestep
+    starts = visibility[:, :-1].copy()
+    starts[:, 1:] &= ~visibility[:, :-2]
+    n_contacts = starts.sum(axis=1)
+
+    # Sum durations of visible steps, where contacts end at the first
+    # non-visible timestep or the last timestep
+    total_duration = visibility[:, :-1].astype(float) @ np.diff(jd)
+
+    return n_contacts, total_duration
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+
+from .. import _healpix as healpix
+
+# Define safety factor of the pixel radius relative to the mean pixel size
+PIXEL_RADIUS_FACTOR = 1.5
+
+
+def exclusion_caps(body_vectors, body_radii, soft_radii):
+    """
+    Function to calculate the spherical caps which contain the sky region
+    where a solar body can restrict visibility, being the body disc and the
+    soft radius bands.
+
+    Parameters
+    ----------
+    body_vectors : numpy.ndarray
+        Body unit vectors with shape (B, 3).
+    body_radii : numpy.ndarray
+        Body angular radii [rad] with shape (B,).
+    soft_radii : numpy.ndarray
+        Soft radius bands [rad] with shape (-1, 2).
+
+    Returns
+    -------
+    caps : list
+        Tuples of cap unit vectors with shape (B, 3) and cap radii [rad]
+        with shape (B,).
+
+    """
+
+    # Add cap of the body disc
+    caps = [(body_vectors, body_radii)]
+
+    # Add caps of the soft radius bands, where bands reaching the
+    # antipode are caps around the antipode
+    for radius_inner, radius_outer in soft_radii:
+        if radius_outer >= np.pi:
+            caps.append((-body_vectors,
+                         np.full(len(body_vectors), np.pi - radius_inner)))
+        else:
+            caps.append((body_vectors,
+                         np.full(len(body_vectors), radius_outer)))
+
+    return caps
+
+
+class SubtargetIndex():
+
+    def __init__(self, vectors, radii, itarget=None, nside=None):
+        """
+        Initialisation function for the spatial index of subtargets, which
+        buckets the subtarget centres into HEALPix pixels so that the
+        subtargets near a region of sky are found without scanning the
+        catalogue.
+
+        Parameters
+        ----------
+        vectors : numpy.ndarray
+            Subtarget unit vectors with shape (S, 3).
+        radii : numpy.ndarray
+            Subtarget angular radii [rad] with shape (S,).
+        itarget : numpy.ndarray, optional
+            Target index of each subtarget. The default is None.
+        nside : int, optional
+            HEALPix resolution parameter. The default is None, which chooses
+            about one subtarget per pixel, up to 128.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Choose resolution
+        if nside is None:
+            nside = 1
+            while nside < 128 and healpix.nside2npix(nside) < len(vectors):
+                nside *= 2
+
+        # Store subtarget geometry
+        self.vectors = np.asarray(vectors, dtype=float)
+        self.radii = np.asarray(radii, dtype=float)
+        self.itarget = itarget
+        self.max_radius = np.max(self.radii, initial=0.0)
+        self.nside = nside
+
+        # Calculate pixel radius margin and pixel centre vectors
+        npix = healpix.nside2npix(nside)
+        self.pixel_radius = PIXEL_RADIUS_FACTOR * np.sqrt(4*np.pi / npix)
+        self.pixel_vectors = healpix.pix2vec(nside, np.arange(npix))
+
+        # Sort subtargets by pixel, with offsets of each pixel's bucket
+        pixels = healpix.vec2pix(nside, self.vectors)
+        self.order = np.argsort(pixels, kind="stable")
+        self.offsets = np.searchsorted(pixels[self.order], np.arange(npix + 1))
+
+    def __len__(self):
+        """
+        Function to return the number of indexed subtargets.
+
+        Returns
+        -------
+        int
+            Number of subtargets.
+
+        """
+
+        return len(self.vectors)
+
+    def query(self, vector, radius):
+        """
+        Function to find the subtargets intersecting a spherical cap.
+
+        Parameters
+        ----------
+        vector : numpy.ndarray
+            Unit vector of the cap centre.
+        radius : float
+            Cap angular radius [rad].
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices of the subtargets intersecting the cap.
+
+        """
+
+        # Return all subtargets if the search covers the sky
+        search_radius = radius + self.max_radius + self.pixel_radius
+        if search_radius >= np.pi:
+            candidates = np.arange(len(self))
+        else:
+            # Find pixels which can contain intersecting subtargets
+            pixels = healpix.query_disc(self.nside, vector, search_radius,
+                                        self.pixel_vectors)
+
+            # Gather subtargets in the pixel buckets
+            starts = self.offsets[pixels]
+            counts = self.offsets[pixels + 1] - starts
+            positions = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                         + np.arange(np.sum(counts)))
+            candidates = np.sort(self.order[positions])
+
+        # Test candidates against the cap
+        cos_separation = self.vectors[candidates] @ vector
+        return candidates[cos_separation
+                          >= np.cos(np.minimum(radius + self.radii[candidates],
+                                               np.pi))]
+
+    def query_block(self, vectors, radii):
+        """
+        Function to find the subtargets intersecting any of a block of
+        spherical caps, such as a solar body exclusion zone over a block of
+        epochs, using a single cap bounding the block.
+
+        Parameters
+        ----------
+        vectors : numpy.ndarray
+            Unit vectors of the cap centres with shape (B, 3).
+        radii : numpy.ndarray
+            Cap angular radii [rad] with shape (B,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices of the candidate subtargets, which include all
+            subtargets intersecting any of the caps.
+
+        """
+
+        # Calculate bounding cap of the block
+        centre = np.sum(vectors, axis=0)
+        norm = np.linalg.norm(centre)
+        if norm < 1e-12:
+            return np.arange(len(self))
+        centre = centre / norm
+        spread = np.max(np.arccos(np.clip(vectors @ centre, -1, 1)))
+
+        return self.query(centre, np.max(radii) + spread)
@@ -24,15 +24,20 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from astropy import constants as const
+from astropy import units as u
+from astropy.time import Time, TimeDelta
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from . import astro_target_interface
+from . import astro_target_interface, constraints, contact_interface, geometry
+from ..instrumentation import instrument
 
 
 class VisibilityModule():
 
-    def __init__(self, spacecraft_frame, solar_bodies):
+    def __init__(self, spacecraft_frame, solar_bodies, spacecraft=None, constraints=None):
         """
         Initialisation function for the visibility module.
 
@@ -43,6 +48,13 @@ class VisibilityModule():
             with the same orientation as BCRS/ICRS.
         solar_bodies : list
             Solar system bodies and their properties.
+        spacecraft : str, optional
+            Name of the spacecraft, which is stored with its contacts to
+            schedule constellations. The default is None.
+        constraints : list, optional
+            Visibility constraint objects, such as EarthOccultation, Eclipse
+            and GeographicExclusion, which are calculated from the spacecraft
+            position in addition to the solar bodies. The default is None.
 
         Returns
         -------
@@ -53,14 +65,27 @@ class VisibilityModule():
         # Load satellite reference frame and solar bodies
         self.spacecraft_frame = spacecraft_frame
         self.solar_bodies = solar_bodies
+        self.spacecraft = spacecraft
+        self.constraints = [] if constraints is None else list(constraints)
 
         # Declare empty variables
         self.targets = None
+        self.index = None
+        self.mask = None
         self.stats = None
+        self.binned_stats = None
 
-    def get_targets(self):
+    @instrument(count=lambda targets, self: len(targets))
+    def get_targets(self, path="data/targets.yml"):
         """
-        Function to import targets.
+        Function to import targets and build the spatial index of their
+        subtargets.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the targets file, either a YAML catalogue or a CSV or
+            FITS table. The default is "data/targets.yml".
 
         Returns
         -------
@@ -70,27 +95,116 @@ class VisibilityModule():
         """
 
         # Load targets
-        targets = astro_target_interface.load(self.spacecraft_frame)
+        targets = astro_target_interface.load(self.spacecraft_frame,
+                                              path=path)
 
-        # Store output
+        # Store output and spatial index
         self.targets = targets
+        self.index = astro_target_interface.build_index(targets)
 
         return targets
 
-    def calculate_visibility(self):
+    @instrument(count=lambda _, self: len(self.targets))
+    def calculate_visibility(self, indexed=False, block_size=16):
         """
         Function to calculate target visibility.
 
+        Parameters
+        ----------
+        indexed : bool, optional
+            Flag to calculate the visibility of all subtargets at once,
+            using the spatial index to test only the subtargets near each
+            solar body's exclusion zone over each block of timesteps, with
+            the exact footprints of rectangular and polygon subtargets. The
+            visibility is geometric, without the aberration applied by the
+            Astropy frame transformations. The default is False.
+        block_size : int, optional
+            Number of timesteps per block of the indexed calculation.
+            The default is 16.
+
         Returns
         -------
         None.
 
         """
 
+        # Extract constraint geometry and calculate global mask of the
+        # constraints shared by all targets
+        if self.constraints:
+            positions = constraints.constraint_geometry(self.spacecraft_frame,
+                                                        self.solar_bodies)
+            self.mask = constraints.global_mask(self.constraints, *positions)
+
+        # Calculate visibility of all subtargets with the spatial index
+        if indexed:
+            self.__calculate_indexed_visibility(block_size)
+
         # Iterate through targets to calculate visibility
         for target in tqdm(self.targets, desc="Target Visibility"):
-            target.calculate_visibility(self.solar_bodies)
+            if not indexed:
+                target.calculate_visibility(self.solar_bodies)
+
+            # Apply constraints and the global mask, so that the visibility
+            # is consistent with the contacts and statistics
+            if self.constraints:
+                target.visibility &= constraints.target_visibility(
+                    target, self.constraints, *positions)
+            if self.mask is not None:
+                target.visibility &= self.mask
+
+    def __calculate_indexed_visibility(self, block_size):
+        """
+        Function to calculate the visibility of all targets from their
+        subtarget unit vectors, using the spatial index.
 
+        Parameters
+        ----------
+        block_size : int
+            Number of timesteps per block.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Build spatial index if the targets were not imported
+        if self.index is None:
+            self.index = astro_target_interface.build_index(self.targets)
+
+        # Extract solar body directions, angular radii and soft radii
+        bodies = [(geometry.coordinate_vectors(solar_body.coordinates),
+                   solar_body.angular_radius.to_value(u.rad),
+                   np.reshape(solar_body.soft_radius.to_value(u.rad), (-1, 2)))
+                  for solar_body in self.solar_bodies]
+
+        # Extract subtarget footprints, in the order of the spatial index
+        subtargets = [subtarget
+                      for target in self.targets
+                      for subtarget in target.subtargets]
+        footprints = {row: subtarget.footprint
+                      for row, subtarget in enumerate(subtargets)
+                      if getattr(subtarget, "footprint", None) is not None}
+
+        # Calculate subtarget and target visibility
+        visibility = geometry.subtarget_visibility(self.index.vectors,
+                                                   self.index.radii,
+                                                   bodies,
+                                                   block_size,
+                                                   self.index,
+                                                   footprints)
+        visibility = geometry.target_visibility(visibility,
+                                                self.index.itarget,
+                                                len(self.targets))
+
+        # Store visibility of each target
+        obstime = self.spacecraft_frame.obstime
+        for target, target_visibility in zip(self.targets, visibility):
+            target.obstime = obstime
+            target.visibility = target_visibility
+
+    @instrument(count=lambda _, self: sum(len(target.contacts)
+                                         for target in self.targets))
     def calculate_contacts(self):
         """
         Function to calculate target contacts.
@@ -103,12 +217,20 @@ class VisibilityModule():
 
         # Iterate through targets to calculate contacts
         for target in tqdm(self.targets, desc="Target Contacts"):
-            target.calculate_contacts()
+            target.calculate_contacts(self.spacecraft)
 
-    def calculate_overall_stats(self):
+    @instrument(count=lambda stats, self: len(stats))
+    def calculate_overall_stats(self, vectorised=True):
         """
         Function to calculate target statistics.
 
+        Parameters
+        ----------
+        vectorised : bool, optional
+            Flag to calculate the statistics of all targets with grouped
+            reductions over a flat array of contact durations, rather than
+            per target. The default is True.
+
         Returns
         -------
         stats : pandas.core.frame.DataFrame
@@ -116,6 +238,16 @@ class VisibilityModule():
 
         """
 
+        # Calculate statistics with grouped reductions
+        if vectorised:
+            stats = self.__calculate_overall_stats_vectorised()
+
+            # Store statistics
+            self.stats = stats
+
+            # Return overall statistics
+            return stats
+
         # Declare overall statistics list
         stats = []
 
@@ -132,3 +264,264 @@ class VisibilityModule():
         
         # Return overall statistics
         return stats
+
+    def __calculate_overall_stats_vectorised(self):
+        """
+        Function to calculate target statistics with grouped reductions over
+        a flat array of contact durations.
+
+        Returns
+        -------
+        stats : pandas.core.frame.DataFrame
+            Overall statistics of target contacts.
+
+        """
+
+        # Extract contact counts and flat array of contact durations
+        ntargets = len(self.targets)
+        n_contacts = np.fromiter((len(target.contacts)
+                                  for target in self.targets),
+                                 dtype=int, count=ntargets)
+        durations = np.fromiter((contact.duration
+                                 for target in self.targets
+                                 for contact in target.contacts),
+                                dtype=float, count=np.sum(n_contacts))
+
+        # Calculate target index of each contact, and offsets of the first
+        # contact of each target with contacts
+        itarget = np.repeat(np.arange(ntargets), n_contacts)
+        has_contacts = n_contacts > 0
+        offsets = (np.cumsum(n_contacts) - n_contacts)[has_contacts]
+
+        # Calculate total and percentage durations
+        obstime = self.spacecraft_frame.obstime
+        total_duration = np.bincount(itarget, weights=durations,
+                                     minlength=ntargets)
+        percentage_duration = 100*total_duration / (obstime[-1].jd - obstime[0].jd)
+
+        # Calculate mean and standard deviation of durations, using NaN for
+        # targets without contacts
+        mean_duration = np.full(ntargets, np.nan)
+        mean_duration[has_contacts] = total_duration[has_contacts] \
+            / n_contacts[has_contacts]
+        deviation = np.bincount(itarget,
+                                weights=(durations - mean_duration[itarget])**2,
+                                minlength=ntargets)
+        stddev_duration = np.full(ntargets, np.nan)
+        stddev_duration[has_contacts] = np.sqrt(deviation[has_contacts]
+                                                / n_contacts[has_contacts])
+
+        # Calculate minimum and maximum durations
+        min_duration = np.full(ntargets, np.nan)
+        max_duration = np.full(ntargets, np.nan)
+        if len(durations) > 0:
+            min_duration[has_contacts] = np.minimum.reduceat(durations, offsets)
+            max_duration[has_contacts] = np.maximum.reduceat(durations, offsets)
+
+        # Extract mean coordinates, wrapping right ascension at 180 degrees
+        mean_ra = np.array([target.mean_coordinates.ra.deg
+                            for target in self.targets])
+        mean_ra = np.mod(mean_ra + 180, 360) - 180
+        mean_dec = np.array([target.mean_coordinates.dec.deg
+                             for target in self.targets])
+
+        # Create statistics DataFrame
+        stats = pd.DataFrame({"name": [target.name for target in self.targets],
+                              "category": [target.category
+                                           for target in self.targets],
+                              "mean_ra": mean_ra,
+                              "mean_dec": mean_dec,
+                              "n_contacts": n_contacts,
+                              "total_duration": total_duration,
+                              "percentage_duration": percentage_duration,
+                              "mean_duration": mean_duration,
+                              "stddev_duration": stddev_duration,
+                              "min_duration": min_duration,
+                              "max_duration": max_duration})
+
+        return stats
+
+    @instrument(count=lambda stats, self: len(stats))
+    def calculate_binned_stats(self, bins="day", block_size=64):
+        """
+        Function to calculate target availability aggregated into time bins.
+
+        Each time step is weighted by the time until the next step, which is
+        consistent with the contact durations.
+
+        Parameters
+        ----------
+        bins : str or astropy.time.core.TimeDelta, optional
+            Time bins, either "day", "week" (starting on Mondays), "month",
+            "orbit", or a fixed bin width. The default is "day".
+        block_size : int, optional
+            Number of targets to aggregate at once. The default is 64.
+
+        Raises
+        ------
+        ValueError
+            Error if the time bin option is invalid.
+
+        Returns
+        -------
+        binned_stats : pandas.core.frame.DataFrame
+            Availability of each target in each time bin.
+
+        """
+
+        # Extract time steps and their durations
+        obstime = self.spacecraft_frame.obstime
+        jd = obstime.jd
+        step = np.diff(jd, append=jd[-1])
+
+        # Calculate bin labels and start times
+        if bins in ("day", "week", "month"):
+            # Calculate calendar bins
+            days = obstime.datetime64.astype("datetime64[D]")
+            if bins == "day":
+                labels = days
+            elif bins == "week":
+                weekday = (days.astype(int) + 3) % 7
+                labels = days - weekday.astype("timedelta64[D]")
+            else:
+                labels = days.astype("datetime64[M]")
+            labels = labels.astype("datetime64[D]")
+        else:
+            # Calculate bin width
+            if bins == "orbit":
+                bin_width = self.__orbital_period()
+            elif isinstance(bins, (TimeDelta, u.Quantity)):
+                bin_width = bins.to_value(u.day)
+            else:
+                raise ValueError(f"Invalid time bins: {bins}")
+
+            # Calculate fixed width bins from the start time
+            labels = np.floor((jd - jd[0]) / bin_width).astype(int)
+
+        # Find offsets of the first time step in each bin, which are
+        # contiguous as the time steps are sorted
+        offsets = np.concatenate(
+            ([0], np.flatnonzero(labels[1:] != labels[:-1]) + 1))
+        nbins = len(offsets)
+
+        # Calculate bin start and end times
+        if bins in ("day", "week", "month"):
+            bin_start = Time(labels[offsets], scale="utc")
+            if bins == "month":
+                bin_end = Time((labels[offsets].astype("datetime64[M]")
+                                + 1).astype("datetime64[D]"), scale="utc")
+            else:
+                width = 1 if bins == "day" else 7
+                bin_end = Time(labels[offsets]
+                               + np.timedelta64(width, "D"), scale="utc")
+        else:
+            bin_start = obstime[0] + TimeDelta(labels[offsets] * bin_width,
+                                               format="jd")
+            bin_end = bin_start + TimeDelta(bin_width, format="jd")
+        bin_start = bin_start.datetime64
+        bin_end = bin_end.datetime64
+
+        # Calculate sampled duration of each bin
+        bin_duration = np.add.reduceat(step, offsets)
+
+        # Aggregate visible durations in blocks of targets
+        ntargets = len(self.targets)
+        visible_duration = np.empty((ntargets, nbins))
+        for istart in tqdm(range(0, ntargets, block_size), desc="Target Binned Statistics"):
+            # Stack visibility of the block of targets
+            block = self.targets[istart:istart+block_size]
+            visibility = np.array([target.visibility for target in block])
+
+            # Calculate visible duration in each bin
+            visible_duration[istart:istart+len(block)] = np.add.reduceat(
+                np.where(visibility, step, 0.0), offsets, axis=1)
+
+        # Calculate percentage of each bin that targets are visible
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percentage_duration = 100*visible_duration / bin_duration
+
+        # Create tidy DataFrame with a row per target and bin
+        binned_stats = pd.DataFrame({
+            "name": np.repeat([target.name for target in self.targets], nbins),
+            "category": np.repeat([target.category for target in self.targets],
+                                  nbins),
+            "bin_start": np.tile(bin_start, ntargets),
+            "bin_end": np.tile(bin_end, ntargets),
+            "bin_duration": np.tile(bin_duration, ntargets),
+            "visible_duration": visible_duration.ravel(),
+            "percentage_duration": percentage_duration.ravel()})
+
+        # Store binned statistics
+        self.binned_stats = binned_stats
+
+        # Return binned statistics
+        return binned_stats
+
+    def save_contacts(self, path):
+        """
+        Function to save target contacts to a columnar file.
+
+        Parameters
+        ----------
+        path : str
+            Output file path, either Parquet (.parquet) or Arrow IPC
+            (.arrow, .feather, .ipc).
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Stream contacts to file
+        astro_target_interface.save(self.targets, path)
+
+    def save_stats(self, path, binned=False):
+        """
+        Function to save target statistics to a columnar file.
+
+        Parameters
+        ----------
+        path : str
+            Output file path, either Parquet (.parquet) or Arrow IPC
+            (.arrow, .feather, .ipc).
+        binned : bool, optional
+            Flag to save the binned statistics instead of the overall
+            statistics. The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Save statistics to file
+        if binned:
+            contact_interface.save_stats(self.binned_stats, path)
+        else:
+            contact_interface.save_stats(self.stats, path)
+
+    def __orbital_period(self):
+        """
+        Function to calculate the mean orbital period of the spacecraft from
+        its state vectors.
+
+        Returns
+        -------
+        period : float
+            Mean orbital period [days].
+
+        """
+
+        # Extract position and velocity magnitudes
+        r = self.spacecraft_frame.obsgeoloc.norm().to_value(u.km)
+        v = self.spacecraft_frame.obsgeovel.norm().to_value(u.km/u.s)
+
+        # Calculate semi-major axis with the vis-viva equation
+        mu = const.GM_earth.to_value(u.km**3/u.s**2)
+        sma = np.mean(1 / (2/r - v**2/mu))
+
+        # Calculate orbital period
+        period = 2*np.pi*np.sqrt(sma**3/mu) * u.s
+
+        return period.to_value(u.day)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import multiprocessing
+import warnings
+
+import numpy as np
+
+# Declare CuPy module, which is imported on first use
+CUPY = {}
+
+
+def import_cupy():
+    """
+    Function to import CuPy on first use, as importing it is slow.
+
+    Returns
+    -------
+    cp : module
+        CuPy module, or None if it is not installed.
+
+    """
+
+    # Import CuPy if available
+    if "module" not in CUPY:
+        try:
+            import cupy
+        except ImportError:
+            cupy = None
+        CUPY["module"] = cupy
+
+    return CUPY["module"]
+
+
+def cuda_available():
+    """
+    Function to check whether CuPy and a CUDA device are available.
+
+    Returns
+    -------
+    bool
+        True if CUDA can be used.
+
+    """
+
+    # Check for CuPy
+    cp = import_cupy()
+    if cp is None:
+        return False
+
+    # Check for CUDA devices
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def get_array_module(cuda=False):
+    """
+    Function to select the array module, falling back to NumPy if CUDA is
+    requested but not available.
+
+    Parameters
+    ----------
+    cuda : bool, optional
+        Flag to use CUDA. The default is False.
+
+    Returns
+    -------
+    xp : module
+        Array module, either cupy or numpy.
+
+    """
+
+    # Select CuPy if requested and available
+    if cuda:
+        if cuda_available():
+            return import_cupy()
+        warnings.warn("CUDA is not available, falling back to NumPy")
+
+    return np
+
+
+def pool_context(cuda=False):
+    """
+    Function to select the multiprocessing context for workers. CUDA cannot
+    be used in forked children once it is initialised in the parent, so
+    workers are spawned when using CUDA.
+
+    Parameters
+    ----------
+    cuda : bool, optional
+        Flag to use CUDA in the workers. The default is False.
+
+    Returns
+    -------
+    multiprocessing.context.BaseContext
+        Multiprocessing context, which is the default context without CUDA.
+
+    """
+
+    return multiprocessing.get_context("spawn" if cuda else None)
+
+
+def to_host(array):
+    """
+    Function to transfer an array to host memory.
+
+    Parameters
+    ----------
+    array : numpy.ndarray or cupy.ndarray
+        Array on the host or device.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array on the host.
+
+    """
+
+    # Transfer CuPy arrays from the device, which can only exist if CuPy
+    # was imported
+    cp = CUPY.get("module")
+    if cp is not None and isinstance(array, cp.ndarray):
+        return cp.asnumpy(array)
+
+    return np.asarray(array)
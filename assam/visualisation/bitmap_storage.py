@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+# Declare shared memory blocks which could not be closed while in use
+PENDING_HANDLES = []
+
+
+def shared_array(handle, shape, dtype):
+    """
+    Function to create an array backed by a shared memory block, which
+    holds a buffer export so that the block cannot be closed while the array
+    or its views exist.
+
+    Parameters
+    ----------
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block.
+    shape : tuple
+        Array shape.
+    dtype : numpy.dtype
+        Array data type.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array backed by the shared memory block.
+
+    """
+
+    return np.frombuffer(handle.buf, dtype=dtype,
+                         count=int(np.prod(shape))).reshape(shape)
+
+
+def create_array(shape, dtype, path=None):
+    """
+    Function to preallocate an array which can be written by worker
+    processes, either in shared memory or in a memory-mapped file.
+
+    Parameters
+    ----------
+    shape : tuple
+        Array shape.
+    dtype : numpy.dtype
+        Array data type.
+    path : str, optional
+        Path of a .npy file to memory-map. The default is None which uses
+        shared memory.
+
+    Returns
+    -------
+    array : numpy.ndarray
+        Preallocated array.
+    spec : tuple
+        Specification to attach to the array from other processes.
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block, or None for memory-mapped files.
+
+    """
+
+    # Create memory-mapped file
+    if path is not None:
+        array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                          shape=shape)
+        return array, ("memmap", path), None
+
+    # Create shared memory block
+    nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    handle = shared_memory.SharedMemory(create=True, size=nbytes)
+    array = shared_array(handle, shape, dtype)
+    array.fill(0)
+
+    return array, ("shared_memory", handle.name, shape, np.dtype(dtype).str), handle
+
+
+def attach_array(spec):
+    """
+    Function to attach to an array created by create_array.
+
+    Parameters
+    ----------
+    spec : tuple
+        Array specification.
+
+    Returns
+    -------
+    array : numpy.ndarray
+        Attached array.
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block, or None for memory-mapped files, which must be
+        kept while the array is used.
+
+    """
+
+    # Open memory-mapped file
+    if spec[0] == "memmap":
+        return np.load(spec[1], mmap_mode="r+"), None
+
+    # Attach to shared memory block
+    _, name, shape, dtype = spec
+    handle = shared_memory.SharedMemory(name=name)
+    array = shared_array(handle, shape, dtype)
+
+    return array, handle
+
+
+def release_array(array, handle):
+    """
+    Function to release a preallocated array once the workers have written
+    it, without copying it into process memory.
+
+    Shared memory blocks are unlinked so that they are freed once closed,
+    even if the process exits early, but the handle must be kept while the
+    array is used and then closed with close_array.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Preallocated array.
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block, or None for memory-mapped files.
+
+    Returns
+    -------
+    array : numpy.ndarray
+        Array backed by the shared memory block, or the flushed
+        memory-mapped array.
+
+    """
+
+    # Flush memory-mapped files
+    if handle is None:
+        array.flush()
+        return array
+
+    # Unlink the shared memory block, which stays mapped until closed
+    handle.unlink()
+
+    return array
+
+
+def close_array(handle):
+    """
+    Function to close the shared memory block of a released array. Blocks
+    which are still used by arrays are kept and closed by a later call.
+
+    Parameters
+    ----------
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block, or None for memory-mapped files.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Collect the block and the blocks which were previously in use
+    handles = PENDING_HANDLES + ([handle] if handle is not None else [])
+    PENDING_HANDLES.clear()
+
+    # Close the blocks, which fails while arrays export their buffers
+    for handle in handles:
+        try:
+            handle.close()
+        except BufferError:
+            PENDING_HANDLES.append(handle)
+
+
+def discard_array(handle):
+    """
+    Function to free the shared memory block of an array which was not
+    released, such as when the workers writing it failed.
+
+    Parameters
+    ----------
+    handle : multiprocessing.shared_memory.SharedMemory
+        Shared memory block, or None for memory-mapped files.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Unlink and close the shared memory block
+    if handle is not None:
+        handle.unlink()
+        close_array(handle)
+
+
+def bitmap_paths(directory):
+    """
+    Function to define the paths of memory-mapped bitmap stacks.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory.
+
+    Returns
+    -------
+    solar_path : str
+        Path of the solar bitmap stack.
+    target_path : str
+        Path of the target bitmap stack.
+
+    """
+
+    # Create directory
+    os.makedirs(directory, exist_ok=True)
+
+    return (os.path.join(directory, "solar_bitmaps.npy"),
+            os.path.join(directory, "target_bitmaps.npy"))
@@ -25,14 +25,15 @@ SOFTWARE.
 """
 
 from astropy import units as u
-import cupy as cp
-import numpy as np
 
+from .array_backend import cuda_available, get_array_module, to_host
 
-def separation_cuda(coord1, coord2):
+
+def separation_cuda(coord1, coord2, xp=None, keep_on_device=False):
     """
     Function to calculate angular separation between two coordinates using
-    CUDA for the calculations. Based on Astropy's angle utilities.
+    CUDA for the calculations, if available. Based on Astropy's angle
+    utilities.
 
     Parameters
     ----------
@@ -40,14 +41,23 @@ def separation_cuda(coord1, coord2):
         Coordinates of first object.
     coord2 : astropy.coordinates.sky_coordinate.SkyCoord
         Coordindates of second object.
+    xp : module, optional
+        Array module. The default is None which uses CuPy if available.
+    keep_on_device : bool, optional
+        Flag to return the separation as an array in radians on the device,
+        rather than transferring it to the host. The default is False.
 
     Returns
     -------
-    angle : astropy.units.quantity.Quantity
+    angle : astropy.units.quantity.Quantity or array
         Angular separation between the coordinates.
 
     """
 
+    # Select array module
+    if xp is None:
+        xp = get_array_module(cuda=cuda_available())
+
     # TODO: check equivalent reference frames
 
     # Extract angles
@@ -56,27 +66,31 @@ def separation_cuda(coord1, coord2):
     lon2 = coord2.spherical.lon
     lat2 = coord2.spherical.lat
 
-    # Convert to cupy arrays in radians
-    lon1 = cp.array(lon1.rad)
-    lat1 = cp.array(lat1.rad)
-    lon2 = cp.array(lon2.rad)
-    lat2 = cp.array(lat2.rad)
+    # Convert to arrays in radians
+    lon1 = xp.asarray(lon1.rad)
+    lat1 = xp.asarray(lat1.rad)
+    lon2 = xp.asarray(lon2.rad)
+    lat2 = xp.asarray(lat2.rad)
 
     # Calculate angle using Vincenty formula,
     # as used by Astropy angle utilities
-    sdlon = cp.sin(lon2 - lon1)
-    cdlon = cp.cos(lon2 - lon1)
-    slat1 = cp.sin(lat1)
-    slat2 = cp.sin(lat2)
-    clat1 = cp.cos(lat1)
-    clat2 = cp.cos(lat2)
+    sdlon = xp.sin(lon2 - lon1)
+    cdlon = xp.cos(lon2 - lon1)
+    slat1 = xp.sin(lat1)
+    slat2 = xp.sin(lat2)
+    clat1 = xp.cos(lat1)
+    clat2 = xp.cos(lat2)
     num1 = clat2 * sdlon
     num2 = clat1 * slat2 - slat1 * clat2 * cdlon
     denominator = slat1 * slat2 + clat1 * clat2 * cdlon
-    angle = cp.arctan2(np.hypot(num1, num2), denominator)
+    angle = xp.arctan2(xp.hypot(num1, num2), denominator)
+
+    # Return angle on the device if requested
+    if keep_on_device:
+        return angle
 
     # Convert angle to numpy array with astropy units
-    angle = cp.asnumpy(angle) * u.rad
+    angle = to_host(angle) * u.rad
     
     # Return angular separation
     return angle
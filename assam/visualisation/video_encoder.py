@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+
+import numpy as np
+
+# Define colours of the bitmap frames
+BACKGROUND_COLOUR = np.array([255, 255, 255], dtype=np.float32)
+TARGET_COLOUR = np.array([0, 128, 0], dtype=np.float32)
+SOLAR_COLOUR = np.array([255, 0, 0], dtype=np.float32)
+
+# Define video file extensions
+VIDEO_FORMATS = (".mp4", ".mkv", ".avi", ".mov", ".webm", ".gif")
+
+
+def compose_frame(solar_bitmap, target_bitmap, scale=1, solar_alpha=0.5):
+    """
+    Function to compose an RGB frame from solar and target bitmaps on the RA
+    and DEC grid, matching the colours of the bitmap plots.
+
+    Parameters
+    ----------
+    solar_bitmap : numpy.ndarray
+        Boolean array of solar body visibility with shape (DEC, RA).
+    target_bitmap : numpy.ndarray
+        Boolean array of target visibility with shape (DEC, RA).
+    scale : int, optional
+        Integer upscaling factor of the frame. The default is 1.
+    solar_alpha : float, optional
+        Opacity of the solar bitmap over the target bitmap.
+        The default is 0.5.
+
+    Returns
+    -------
+    frame : numpy.ndarray
+        RGB frame with shape (H, W, 3) and type uint8, with north up and
+        right ascension increasing to the left.
+
+    """
+
+    # Colour target and solar layers
+    target_layer = np.where(target_bitmap[..., None], TARGET_COLOUR,
+                            BACKGROUND_COLOUR)
+    solar_layer = np.where(solar_bitmap[..., None], SOLAR_COLOUR,
+                           BACKGROUND_COLOUR)
+
+    # Blend solar layer over target layer
+    frame = (1 - solar_alpha)*target_layer + solar_alpha*solar_layer
+    frame = np.rint(frame).astype(np.uint8)
+
+    # Orient frame with north up and reversed right ascension
+    frame = frame[::-1, ::-1]
+
+    # Upscale frame
+    if scale > 1:
+        frame = np.repeat(np.repeat(frame, scale, axis=0), scale, axis=1)
+
+    return np.ascontiguousarray(frame)
+
+
+def write_png(path, frame, compress_level=1):
+    """
+    Function to write an RGB frame as a PNG file.
+
+    Parameters
+    ----------
+    path : str
+        Output file path.
+    frame : numpy.ndarray
+        RGB frame with shape (H, W, 3) and type uint8.
+    compress_level : int, optional
+        zlib compression level, where low levels are fastest.
+        The default is 1.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    def chunk(tag, data):
+        # Pack chunk with length and checksum
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    # Prepend filter type to each row
+    height, width, _ = frame.shape
+    raw = np.empty((height, 1 + 3*width), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = frame.reshape(height, -1)
+
+    # Write signature, header, image data and end chunks
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", header))
+        file.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level)))
+        file.write(chunk(b"IEND", b""))
+
+
+def is_video(path):
+    """
+    Function to check if a path is a video file.
+
+    Parameters
+    ----------
+    path : str
+        Output path.
+
+    Returns
+    -------
+    bool
+        Flag for a video file.
+
+    """
+
+    return os.path.splitext(path)[1].lower() in VIDEO_FORMATS
+
+
+class VideoWriter():
+
+    def __init__(self, path, shape, fps=24, codec="libx264", crf=18):
+        """
+        Initialisation function for the video writer, which pipes raw RGB
+        frames to a local FFmpeg encoder.
+
+        Parameters
+        ----------
+        path : str
+            Output video path.
+        shape : tuple
+            Frame shape (H, W).
+        fps : float, optional
+            Frames per second. The default is 24.
+        codec : str, optional
+            FFmpeg video codec, which is not used for GIF output.
+            The default is "libx264".
+        crf : int, optional
+            Constant rate factor of the codec. The default is 18.
+
+        Raises
+        ------
+        FileNotFoundError
+            Error if FFmpeg is not available.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Find FFmpeg
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise FileNotFoundError("FFmpeg is required to write videos")
+
+        # Define input and output options
+        height, width = shape
+        command = [ffmpeg, "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24",
+                   "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-"]
+        if os.path.splitext(path)[1].lower() != ".gif":
+            command += ["-c:v", codec, "-crf", str(crf),
+                        "-pix_fmt", "yuv420p",
+                        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        command.append(path)
+
+        # Start encoder
+        self.path = path
+        self.shape = (height, width, 3)
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        """
+        Function to write a frame.
+
+        Parameters
+        ----------
+        frame : numpy.ndarray
+            RGB frame with shape (H, W, 3) and type uint8.
+
+        Raises
+        ------
+        ValueError
+            Error if the frame shape does not match the video.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Check frame shape
+        if frame.shape != self.shape:
+            raise ValueError(f"Invalid frame shape: {frame.shape}")
+
+        # Pipe frame to encoder
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def close(self):
+        """
+        Function to finish encoding.
+
+        Raises
+        ------
+        RuntimeError
+            Error if the encoder fails.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Close pipe and wait for encoder
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"FFmpeg failed to write {self.path}")
+
+    def abort(self):
+        """
+        Function to stop the encoder without checking its exit status, such
+        as when an error occurs while writing frames.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Kill encoder and wait for it, ignoring errors from the closed pipe
+        self.process.kill()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Only check the encoder on a clean exit, so that errors raised while
+        # writing frames are not hidden
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -24,44 +24,260 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import multiprocessing
+import os
 
 from astropy import units as u
-from astropy.coordinates import SkyCoord
-from matplotlib import pyplot as plt
-from matplotlib.colors import ListedColormap
+from astropy.time import Time
 import numpy as np
-import seaborn as sns
 from tqdm import tqdm
 
-from .cuda_methods import separation_cuda
+from . import bitmap_storage, video_encoder
+from .. import _healpix as healpix
+from .array_backend import get_array_module, pool_context, to_host
+from ..instrumentation import instrument
 
 
-def unwrap_generate_bitmap(arg, **kwarg):
+def unit_vectors(coordinates):
     """
-    Wrapper function to enable multiprocessing of the generate_bitmap method,
-    as found at:
-        http://www.rueckstiess.net/research/snippets/show/ca1d7d90
+    Function to calculate the unit vectors of coordinates in their frame.
 
     Parameters
     ----------
-    arg
-        Arguments.
-    **kwarg
-        Keyword arguments.
+    coordinates : astropy.coordinates.sky_coordinate.SkyCoord
+        Coordinates.
 
     Returns
     -------
-    function
-        Unwrapped generate bitmap function.
+    vectors : numpy.ndarray
+        Array of unit vectors, with shape (..., 3).
 
     """
-    return VisualisationModule.generate_bitmap(*arg, **kwarg)
+
+    # Extract cartesian components and normalise
+    xyz = np.moveaxis(coordinates.cartesian.xyz.value, 0, -1)
+    vectors = xyz / np.linalg.norm(xyz, axis=-1, keepdims=True)
+
+    return vectors
+
+
+# Define worker state, set once per worker by the pool initialiser
+WORKER_STATE = {}
+
+
+def init_worker(module, solar_spec=None, target_spec=None, packed=False):
+    """
+    Function to initialise multiprocessing workers with read-only inputs,
+    and attach to the preallocated bitmap stacks.
+
+    Parameters
+    ----------
+    module : VisualisationModule
+        Visualisation module.
+    solar_spec : tuple, optional
+        Specification of the solar bitmap stack. The default is None.
+    target_spec : tuple, optional
+        Specification of the target bitmap stack. The default is None.
+    packed : bool, optional
+        Flag for bit-packed bitmap stacks. The default is False.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Store module
+    WORKER_STATE["module"] = module
+    WORKER_STATE["packed"] = packed
+
+    # Attach to bitmap stacks
+    if solar_spec is not None:
+        WORKER_STATE["solar"] = bitmap_storage.attach_array(solar_spec)
+        WORKER_STATE["target"] = bitmap_storage.attach_array(target_spec)
+
+
+def generate_bitmap_worker(index):
+    """
+    Worker function to generate bitmaps and write them in place.
+
+    Parameters
+    ----------
+    index : int
+        Index for the generated timestep.
+
+    Returns
+    -------
+    index : int
+        Index for the generated timestep.
+
+    """
+
+    # Generate bitmaps
+    solar_bitmap, target_bitmap = WORKER_STATE["module"].generate_bitmap(index)
+
+    # Pack bitmaps along the last axis
+    if WORKER_STATE["packed"]:
+        solar_bitmap = np.packbits(solar_bitmap, axis=-1)
+        target_bitmap = np.packbits(target_bitmap, axis=-1)
+
+    # Write bitmaps to stacks
+    WORKER_STATE["solar"][0][index] = solar_bitmap
+    WORKER_STATE["target"][0][index] = target_bitmap
+
+    return index
+
+
+def init_render_worker(module, solar_bitmaps=None, target_bitmaps=None, options=None):
+    """
+    Function to initialise multiprocessing workers for frame rendering.
+
+    Parameters
+    ----------
+    module : VisualisationModule
+        Visualisation module.
+    solar_bitmaps : numpy.ndarray, optional
+        Generated solar bitmap stack, which is inherited by forked workers
+        rather than pickled with the module. The default is None.
+    target_bitmaps : numpy.ndarray, optional
+        Generated target bitmap stack. The default is None.
+    options : dict, optional
+        Rendering options. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Restore bitmap stacks, which are excluded when pickling the module
+    module.solar_bitmaps = solar_bitmaps
+    module.target_bitmaps = target_bitmaps
+
+    # Store module and options
+    WORKER_STATE["module"] = module
+    WORKER_STATE["options"] = options or {}
+
+
+def render_frame_worker(index):
+    """
+    Worker function to render a bitmap frame, either returning it or writing
+    it as a PNG file.
+
+    Parameters
+    ----------
+    index : int
+        Index for the rendered timestep.
+
+    Returns
+    -------
+    numpy.ndarray or int
+        RGB frame, or the index if the frame was written to a file.
+
+    """
+
+    # Render frame
+    module = WORKER_STATE["module"]
+    options = WORKER_STATE["options"]
+    frame = module.render_frame(index, scale=options.get("scale", 1))
+
+    # Write frame as a PNG file
+    directory = options.get("directory")
+    if directory is not None:
+        video_encoder.write_png(os.path.join(directory, f"bitmap_{index:06d}.png"),
+                                frame)
+        return index
+
+    return frame
+
+
+def init_plot_worker(module, solar_bitmaps=None, target_bitmaps=None, options=None):
+    """
+    Function to initialise multiprocessing workers for figure plotting,
+    creating one figure per worker.
+
+    Parameters
+    ----------
+    module : VisualisationModule
+        Visualisation module.
+    solar_bitmaps : numpy.ndarray, optional
+        Generated solar bitmap stack. The default is None.
+    target_bitmaps : numpy.ndarray, optional
+        Generated target bitmap stack. The default is None.
+    options : dict, optional
+        Plotting options. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Import plotting packages on first use
+    from matplotlib import pyplot as plt
+
+    # Use a non-interactive backend
+    plt.switch_backend("Agg")
+
+    # Initialise module and options
+    init_render_worker(module, solar_bitmaps, target_bitmaps, options)
+
+    # Create figure
+    WORKER_STATE["figure"] = module.create_bitmap_figure(WORKER_STATE["options"]["dpi"])
+
+
+def plot_frame_worker(index):
+    """
+    Worker function to update the worker figure and save it to disk.
+
+    Parameters
+    ----------
+    index : int
+        Index for the plotted timestep.
+
+    Returns
+    -------
+    index : int
+        Index for the plotted timestep.
+
+    """
+
+    # Update figure
+    figure = WORKER_STATE["figure"]
+    options = WORKER_STATE["options"]
+    WORKER_STATE["module"].update_bitmap_figure(figure, index)
+
+    # Save figure
+    file_format = options["file_format"]
+    figure[0].savefig(os.path.join(options["directory"],
+                                   f"bitmap_{index:06d}.{file_format}"),
+                      dpi=options["dpi"])
+
+    return index
+
+
+def sky_coverage_worker(block):
+    """
+    Worker function to count visible timesteps of each pixel in a block.
+
+    Parameters
+    ----------
+    block : tuple
+        Index of the first timestep of the block, and index after the last
+        timestep of the block.
+
+    Returns
+    -------
+    count : numpy.ndarray
+        Number of timesteps where each pixel is visible.
+
+    """
+
+    return WORKER_STATE["module"].sky_coverage_block(*block)
 
 
 class VisualisationModule():
 
-    def __init__(self, spacecraft_frame, solar_bodies, targets, stats, npix=(721, 361), cuda=False):
+    def __init__(self, spacecraft_frame, solar_bodies, targets, stats, npix=(721, 361), cuda=False, chunk_size=8192, stamps=True, pixelisation="equirectangular", nside=64):
         """
         Initialisation function for the visualisation module.
 
@@ -79,7 +295,30 @@ class VisualisationModule():
         npix : tuple, optional
             Number of sample points in RA and DEC. The default is (721, 361).
         cuda : boolean, optional
-            Flag to use CUDA. The default is False.
+            Flag to use CUDA, falling back to NumPy if CuPy or a CUDA device
+            is not available. Worker pools are then spawned rather than
+            forked, so scripts must guard their entry point with
+            if __name__ == "__main__". The default is False.
+        chunk_size : int, optional
+            Number of pixels per matrix product when calculating target
+            bitmaps. The default is 8192.
+        stamps : bool, optional
+            Flag to rasterise footprints by only testing the pixels within
+            their bounding boxes, rather than all pixels. This is not used
+            with CUDA, where the dense calculation is faster.
+            The default is True.
+        pixelisation : str, optional
+            Sky pixelisation of the bitmaps, either "equirectangular" for the
+            RA and DEC grid, or "healpix" for an equal-area HEALPix
+            tessellation in the RING scheme. The RA and DEC grid is always
+            used for plotting. The default is "equirectangular".
+        nside : int, optional
+            HEALPix resolution parameter. The default is 64.
+
+        Raises
+        ------
+        ValueError
+            Error if the pixelisation option is invalid.
 
         Returns
         -------
@@ -93,15 +332,70 @@ class VisualisationModule():
         self.targets = targets
         self.stats = stats
 
-        # Import CUDA functions
-        self.cuda = cuda
+        # Select array backend
+        self.cuda = get_array_module(cuda) is not np
 
         # Create angle vectors and mesh
         self.theta = np.linspace(-180, 180, npix[0]) * u.deg
         self.phi = np.linspace(-90, 90, npix[1]) * u.deg
         self.theta_grid, self.phi_grid = np.meshgrid(self.theta, self.phi)
 
-    def generate_bitmap(self, index=0):
+        # Calculate unit vectors of the grid
+        theta_rad = self.theta_grid.ravel().to_value(u.rad)
+        phi_rad = self.phi_grid.ravel().to_value(u.rad)
+        grid_vectors = np.column_stack((np.cos(phi_rad)*np.cos(theta_rad),
+                                        np.cos(phi_rad)*np.sin(theta_rad),
+                                        np.sin(phi_rad)))
+
+        # Define bitmap pixels
+        self.pixelisation = pixelisation
+        self.nside = nside
+        if pixelisation == "equirectangular":
+            # Use grid pixels
+            self.grid_vectors = grid_vectors
+            self.bitmap_shape = self.theta_grid.shape
+            self.image_pixels = None
+        elif pixelisation == "healpix":
+            # Use HEALPix pixels, and find the pixel of each grid point for
+            # plotting
+            self.grid_vectors = healpix.pix2vec(nside,
+                                                np.arange(healpix.nside2npix(nside)))
+            self.bitmap_shape = (healpix.nside2npix(nside),)
+            self.image_pixels = healpix.vec2pix(nside, grid_vectors).reshape(
+                self.theta_grid.shape)
+        else:
+            raise ValueError(f"Invalid pixelisation: {pixelisation}")
+        self.chunk_size = chunk_size
+        self.stamps = stamps
+        self.grid_vectors_device = None
+
+        # Calculate unit vectors and radii of the solar bodies at each time
+        self.solar_vectors = [unit_vectors(solar_body.coordinates)
+                              for solar_body in solar_bodies]
+        self.solar_angular_radii = [solar_body.angular_radius.to_value(u.rad)
+                                    for solar_body in solar_bodies]
+        self.solar_soft_radii = [np.reshape(solar_body.soft_radius.to_value(u.rad), (-1, 2))
+                                 for solar_body in solar_bodies]
+
+        # Calculate unit vectors and cosine of the radius of the subtargets at
+        # each time
+        subtargets = [subtarget
+                      for target in targets
+                      for subtarget in target.subtargets]
+        self.subtarget_vectors = [unit_vectors(subtarget.coordinates)
+                                  for subtarget in subtargets]
+        self.subtarget_radii = np.array([subtarget.angular_radius.to_value(u.rad)
+                                         for subtarget in subtargets])
+        self.subtarget_cos_radii = np.cos(self.subtarget_radii)
+
+        # Declare empty variables
+        self.solar_bitmaps = None
+        self.target_bitmaps = None
+        self.bitmap_handles = []
+        self.bitmaps_packed = False
+        self.sky_coverage = None
+
+    def generate_bitmap(self, index=0, include_targets=True):
         """
         Function to generate visual bitmap.
 
@@ -109,101 +403,279 @@ class VisualisationModule():
         ----------
         index : int, optional
             Index for the generated timestep. The default is 0.
+        include_targets : bool, optional
+            Flag to generate the target bitmap. The default is True.
 
         Returns
         -------
         solar_bitmap : numpy.ndarray
             Boolean array of solar body visibility.
         target_bitmap : numpy.ndarray
-            Boolean array of target visibility.
+            Boolean array of target visibility, or None if targets are not
+            included.
 
         """
 
-        # Generate coordinate grid at index time
-        frame = self.spacecraft_frame[index]
-        frame.representation_type = "spherical"
-        coordinates_grid = SkyCoord(ra=self.theta_grid.ravel(),
-                                    dec=self.phi_grid.ravel(),
-                                    frame=frame)
+        # Generate bitmaps from footprint stamps if not using CUDA
+        if self.stamps and not self.cuda:
+            return self.__generate_bitmap_stamps(index, include_targets)
 
-        # Generate bitmap array (all pixels false initially)
-        solar_bitmap = np.empty(self.theta_grid.shape)
-        solar_bitmap.fill(False)
+        # Select array module
+        xp = get_array_module(self.cuda)
 
-        target_bitmap = np.empty(self.theta_grid.shape)
-        target_bitmap.fill(False)
+        # Extract bitmap shape and unit vectors, which are kept on the device
+        shape = self.bitmap_shape
+        if self.grid_vectors_device is None:
+            self.grid_vectors_device = xp.asarray(self.grid_vectors)
+        grid_vectors = self.grid_vectors_device
 
-        # Iterate through planets
-        for solar_body in self.solar_bodies:
-            # Extract solar body coordinates
-            solar_body_coordinates = solar_body.coordinates[index]
-
-            # Calculate separation vector
-            if self.cuda:
-                separation = separation_cuda(solar_body_coordinates,
-                                             coordinates_grid)
-            else:
-                separation = solar_body_coordinates.separation(
-                    coordinates_grid)
-
-            # Reshape to separation array
-            separation_array = separation.reshape(self.theta_grid.shape)
+        # Calculate separation between the grid and all solar bodies with a
+        # single matrix product
+        solar_vectors = xp.asarray([vectors[index]
+                                    for vectors in self.solar_vectors])
+        separation = xp.arccos(xp.clip(grid_vectors @ solar_vectors.T, -1, 1))
 
+        # Iterate through solar bodies
+        solar_bitmap = xp.zeros(separation.shape[0], dtype=bool)
+        for ibody, solar_body in enumerate(self.solar_bodies):
             # Calculate hard radius array
-            hard_radius_array = separation_array <= solar_body.angular_radius[index]
+            solar_bitmap |= separation[:, ibody] <= self.solar_angular_radii[ibody][index]
 
             # Calculate soft radius array
-            soft_radius_array = np.empty(self.theta_grid.shape)
-            soft_radius_array.fill(False)
-            for (r1, r2) in solar_body.soft_radius:
-                soft_radius_temp = np.logical_and(
-                    separation_array >= r1, separation_array <= r2)
-                soft_radius_array = np.logical_or(
-                    soft_radius_array, soft_radius_temp)
-
-            # Calculate solar body bitmap
-            # TODO: store bitmaps for each solar body
-            solar_body_bitmap = np.logical_or(
-                hard_radius_array, soft_radius_array)
-
-            # Update overall solar body bitmap array
-            # TODO: update method to combine bitmaps
-            solar_bitmap = np.logical_or(solar_bitmap, solar_body_bitmap)
-
-        # Iterate through targets
-        # TODO: store bitmaps per target
-        for target in self.targets:
-            for subtarget in target.subtargets:
-                # Extract target coordinates
-                subtarget_coordinates = subtarget.coordinates[index]
-
-                # Calculate separation vector
-                if self.cuda:
-                    separation = separation_cuda(subtarget_coordinates,
-                                                 coordinates_grid)
-                else:
-                    separation = subtarget_coordinates.separation(coordinates_grid)
+            for r1, r2 in self.solar_soft_radii[ibody]:
+                solar_bitmap |= (separation[:, ibody] >= r1) \
+                    & (separation[:, ibody] <= r2)
+
+        # Transfer solar bitmap to the host, and return if targets are not
+        # included
+        solar_bitmap = to_host(solar_bitmap).reshape(shape)
+        if not include_targets:
+            return solar_bitmap, None
+
+        # Calculate whether each pixel is within any subtarget, with a matrix
+        # product per chunk of pixels to limit memory
+        subtarget_vectors = xp.asarray([vectors[index]
+                                        for vectors in self.subtarget_vectors])
+        subtarget_cos_radii = xp.asarray(self.subtarget_cos_radii)
+        target_bitmap = xp.zeros(grid_vectors.shape[0], dtype=bool)
+        if len(subtarget_vectors) > 0:
+            for istart in range(0, grid_vectors.shape[0], self.chunk_size):
+                cos_separation = grid_vectors[istart:istart+self.chunk_size] \
+                    @ subtarget_vectors.T
+                target_bitmap[istart:istart+self.chunk_size] = xp.any(
+                    cos_separation >= subtarget_cos_radii, axis=1)
+
+        # Transfer target bitmap to the host
+        target_bitmap = to_host(target_bitmap).reshape(shape)
+
+        # Return bitmaps
+        return solar_bitmap, target_bitmap
+
+    def __generate_bitmap_stamps(self, index=0, include_targets=True):
+        """
+        Function to generate visual bitmap by rasterising the footprints of
+        solar bodies and subtargets within their bounding boxes.
+
+        Parameters
+        ----------
+        index : int, optional
+            Index for the generated timestep. The default is 0.
+        include_targets : bool, optional
+            Flag to generate the target bitmap. The default is True.
 
-                # Reshape to separation array
-                separation_array = separation.reshape(self.theta_grid.shape)
+        Returns
+        -------
+        solar_bitmap : numpy.ndarray
+            Boolean array of solar body visibility.
+        target_bitmap : numpy.ndarray
+            Boolean array of target visibility, or None if targets are not
+            included.
 
-                # Calculate subtarget array
-                subtarget_array = separation_array <= subtarget.angular_radius
+        """
 
-                # Update overall target bitmap array
-                target_bitmap = np.logical_or(target_bitmap, subtarget_array)
+        # Extract bitmap shape and declare flat bitmaps
+        shape = self.bitmap_shape
+        solar_bitmap = np.zeros(len(self.grid_vectors), dtype=bool)
+        target_bitmap = np.zeros(len(self.grid_vectors), dtype=bool)
+
+        # Iterate through solar bodies
+        for ibody in range(len(self.solar_bodies)):
+            # Extract solar body direction and radii
+            vector = self.solar_vectors[ibody][index]
+            hard_radius = self.solar_angular_radii[ibody][index]
+            soft_radii = self.solar_soft_radii[ibody]
+
+            # Find pixels within the bounding box of the outermost radius
+            outer_radius = np.max(soft_radii[:, 1], initial=hard_radius)
+            pixels = self.__footprint_pixels(vector, outer_radius)
+
+            # Calculate separation of the pixels
+            separation = np.arccos(
+                np.clip(self.grid_vectors[pixels] @ vector, -1, 1))
+
+            # Calculate hard and soft radius pixels
+            footprint = separation <= hard_radius
+            for r1, r2 in soft_radii:
+                footprint |= (separation >= r1) & (separation <= r2)
+
+            # Update overall solar body bitmap
+            solar_bitmap[pixels[footprint]] = True
+
+        # Return if targets are not included
+        if not include_targets:
+            return solar_bitmap.reshape(shape), None
+
+        # Iterate through subtargets
+        for isubtarget, vectors in enumerate(self.subtarget_vectors):
+            # Find pixels within the bounding box of the subtarget
+            vector = vectors[index]
+            pixels = self.__footprint_pixels(vector,
+                                             self.subtarget_radii[isubtarget])
+
+            # Calculate subtarget pixels and update overall target bitmap
+            footprint = self.grid_vectors[pixels] @ vector \
+                >= self.subtarget_cos_radii[isubtarget]
+            target_bitmap[pixels[footprint]] = True
 
         # Return bitmaps
-        return solar_bitmap, target_bitmap
+        return solar_bitmap.reshape(shape), target_bitmap.reshape(shape)
+
+    def __footprint_pixels(self, vector, radius):
+        """
+        Function to find the pixels in the bounding box of a circular
+        footprint in right ascension and declination, accounting for
+        footprints containing the poles and wrapping in right ascension.
+        For HEALPix bitmaps, the pixels in the rings crossing the footprint
+        are used instead.
+
+        Parameters
+        ----------
+        vector : numpy.ndarray
+            Unit vector of the footprint centre.
+        radius : float
+            Footprint angular radius [rad].
+
+        Returns
+        -------
+        pixels : numpy.ndarray
+            Flat indices of the pixels within the bounding box.
+
+        """
+
+        # Find candidate pixels from HEALPix rings
+        if self.pixelisation == "healpix":
+            return healpix.disc_candidates(self.nside, vector, radius)
+
+        # Extract grid size and spacing
+        ny, nx = self.theta_grid.shape
+        dtheta = 360 / (nx - 1)
+        dphi = 180 / (ny - 1)
+
+        # Calculate centre and radius in degrees, with a margin for rounding
+        ra = np.degrees(np.arctan2(vector[1], vector[0]))
+        dec = np.degrees(np.arcsin(np.clip(vector[2], -1, 1)))
+        radius = np.degrees(radius) + 1e-6
+
+        # Find rows within the declination range
+        row_min = max(0, int(np.ceil((dec - radius + 90) / dphi)))
+        row_max = min(ny - 1, int(np.floor((dec + radius + 90) / dphi)))
+        rows = np.arange(row_min, row_max + 1)
+
+        # Find columns within the right ascension range, using all columns if
+        # the footprint contains a pole
+        if dec + radius >= 90 or dec - radius <= -90:
+            columns = np.arange(nx)
+        else:
+            # Calculate right ascension half-width of the footprint
+            half_width = np.degrees(np.arcsin(np.sin(np.radians(radius))
+                                              / np.cos(np.radians(dec))))
+            column_min = int(np.ceil((ra - half_width + 180) / dtheta))
+            column_max = int(np.floor((ra + half_width + 180) / dtheta))
+
+            # Wrap columns, where the first and last columns coincide
+            if column_max - column_min + 1 >= nx - 1:
+                columns = np.arange(nx)
+            else:
+                columns = np.arange(column_min, column_max + 1) % (nx - 1)
+                if np.any(columns == 0):
+                    columns = np.append(columns, nx - 1)
+
+        # Calculate flat pixel indices
+        pixels = (rows[:, np.newaxis] * nx + columns[np.newaxis, :]).ravel()
+
+        return pixels
+
+    def __getstate__(self):
+        """
+        Function to get the state for pickling, excluding device arrays and
+        bitmap stacks, which workers do not need.
+
+        Returns
+        -------
+        state : dict
+            Object state.
+
+        """
+
+        # Copy state and remove device arrays and bitmap stacks
+        state = self.__dict__.copy()
+        state["grid_vectors_device"] = None
+        state["solar_bitmaps"] = None
+        state["target_bitmaps"] = None
+        state["bitmap_handles"] = []
+
+        return state
+
+    def __del__(self):
+        """
+        Function to release the bitmap stacks when the module is deleted.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.release_bitmaps()
 
-    def generate_bitmaps(self, num_workers=None):
+    def release_bitmaps(self):
+        """
+        Function to release the generated bitmap stacks, closing their shared
+        memory blocks.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Remove bitmap stacks and close their shared memory blocks
+        self.solar_bitmaps = None
+        self.target_bitmaps = None
+        for handle in getattr(self, "bitmap_handles", ()):
+            bitmap_storage.close_array(handle)
+        self.bitmap_handles = []
+
+    @instrument(count=lambda _, self: len(self.spacecraft_frame.obstime))
+    def generate_bitmaps(self, num_workers=None, packed=False, memmap_dir=None):
         """
         Function to generate multiple bitmaps in one call.
 
+        The bitmaps are written in place by the workers into preallocated
+        stacks with shape (T, ...), either in shared memory or in memory-mapped
+        .npy files. Workers are initialised once with the module, rather than
+        receiving it with each task.
+
         Parameters
         ----------
         num_workers : int, optional
             Number of workers for the multiprocessing pool. The default is None.
+        packed : bool, optional
+            Flag to bit-pack the bitmaps along their last axis, reducing
+            memory by a factor of eight. The default is False.
+        memmap_dir : str, optional
+            Directory to store the bitmap stacks as memory-mapped .npy files.
+            The default is None which uses shared memory.
 
         Returns
         -------
@@ -211,39 +683,265 @@ class VisualisationModule():
 
         """
 
-        # Declare bitmap lists
-        # TODO: consider numpy arrays
-        solar_bitmaps = []
-        target_bitmaps = []
-
         # Find number of timesteps
         nindex = len(self.spacecraft_frame.obstime)
 
-        # Generate bitmaps
-        with multiprocessing.Pool(num_workers) as p:
-            # Create progress bar
-            with tqdm(total=nindex, desc="Bitmap Generation") as pbar:
-                # Iterate through timesteps
-                # TODO: find a more acceptable way to make this loop parallel
-                for solar_bitmap, target_bitmap in p.imap(unwrap_generate_bitmap, zip([self]*nindex, range(nindex))):
-                    # Store bitmaps
-                    solar_bitmaps.append(solar_bitmap)
-                    target_bitmaps.append(target_bitmap)
-                    # Update progress bar
-                    pbar.update()
+        # Calculate shape of the bitmap stacks
+        if packed:
+            shape = (nindex,) + self.bitmap_shape[:-1] \
+                + ((self.bitmap_shape[-1] + 7) // 8,)
+            dtype = np.uint8
+        else:
+            shape = (nindex,) + self.bitmap_shape
+            dtype = bool
+
+        # Release previous bitmap stacks and preallocate new stacks
+        self.release_bitmaps()
+        if memmap_dir is None:
+            solar_path, target_path = None, None
+        else:
+            solar_path, target_path = bitmap_storage.bitmap_paths(memmap_dir)
+        solar_handle, target_handle = None, None
+        try:
+            solar_bitmaps, solar_spec, solar_handle = bitmap_storage.create_array(
+                shape, dtype, solar_path)
+            target_bitmaps, target_spec, target_handle = bitmap_storage.create_array(
+                shape, dtype, target_path)
+
+            # Generate bitmaps
+            with pool_context(self.cuda).Pool(num_workers,
+                                               initializer=init_worker,
+                                               initargs=(self, solar_spec, target_spec, packed)) as p:
+                # Create progress bar
+                with tqdm(total=nindex, desc="Bitmap Generation") as pbar:
+                    # Iterate through timesteps
+                    for _ in p.imap_unordered(generate_bitmap_worker, range(nindex), chunksize=16):
+                        # Update progress bar
+                        pbar.update()
+        except BaseException:
+            # Free the shared memory blocks if the workers failed, after
+            # dropping the arrays which use them
+            solar_bitmaps, target_bitmaps = None, None
+            bitmap_storage.discard_array(solar_handle)
+            bitmap_storage.discard_array(target_handle)
+            raise
 
         # Store bitmaps
-        self.solar_bitmaps = solar_bitmaps
-        self.target_bitmaps = target_bitmaps
+        self.solar_bitmaps = bitmap_storage.release_array(solar_bitmaps,
+                                                          solar_handle)
+        self.target_bitmaps = bitmap_storage.release_array(target_bitmaps,
+                                                           target_handle)
+        self.bitmap_handles = [solar_handle, target_handle]
+        self.bitmaps_packed = packed
+
+    def get_bitmaps(self, index=0):
+        """
+        Function to get the generated bitmaps of a timestep, unpacking them
+        if required.
+
+        Parameters
+        ----------
+        index : int, optional
+            Index of the timestep. The default is 0.
+
+        Returns
+        -------
+        solar_bitmap : numpy.ndarray
+            Boolean array of solar body visibility.
+        target_bitmap : numpy.ndarray
+            Boolean array of target visibility.
+
+        """
+
+        # Extract bitmaps
+        solar_bitmap = np.asarray(self.solar_bitmaps[index])
+        target_bitmap = np.asarray(self.target_bitmaps[index])
+
+        # Unpack bitmaps
+        if self.bitmaps_packed:
+            count = self.bitmap_shape[-1]
+            solar_bitmap = np.unpackbits(solar_bitmap, axis=-1,
+                                         count=count).astype(bool)
+            target_bitmap = np.unpackbits(target_bitmap, axis=-1,
+                                          count=count).astype(bool)
 
-    def __plot_bitmap(self, index=0):
+        return solar_bitmap, target_bitmap
+
+    def sky_coverage_block(self, istart, istop):
         """
-        Function to generate bitmap plot.
+        Function to count the number of timesteps in a block where each pixel
+        is not excluded by solar bodies.
+
+        Parameters
+        ----------
+        istart : int
+            Index of the first timestep of the block.
+        istop : int
+            Index after the last timestep of the block.
+
+        Returns
+        -------
+        count : numpy.ndarray
+            Number of timesteps where each pixel is visible.
+
+        """
+
+        # Accumulate visible pixels
+        count = np.zeros(self.bitmap_shape, dtype=np.int64)
+        for index in range(istart, istop):
+            solar_bitmap, _ = self.generate_bitmap(index, include_targets=False)
+            count += ~solar_bitmap
+
+        return count
+
+    @instrument(count=lambda _, self: len(self.spacecraft_frame.obstime))
+    def generate_sky_coverage(self, num_workers=None, block_size=256):
+        """
+        Function to calculate the fraction of timesteps where each pixel of
+        the sky is not excluded by solar bodies, without storing bitmaps.
+
+        Parameters
+        ----------
+        num_workers : int, optional
+            Number of workers for the multiprocessing pool. The default is None.
+        block_size : int, optional
+            Number of timesteps per task. The default is 256.
+
+        Returns
+        -------
+        sky_coverage : numpy.ndarray
+            Fraction of timesteps where each pixel is visible.
+
+        """
+
+        # Find number of timesteps and create blocks of timesteps
+        nindex = len(self.spacecraft_frame.obstime)
+        blocks = [(istart, min(istart + block_size, nindex))
+                  for istart in range(0, nindex, block_size)]
+
+        # Accumulate visible pixels
+        count = np.zeros(self.bitmap_shape, dtype=np.int64)
+        with pool_context(self.cuda).Pool(num_workers,
+                                           initializer=init_worker,
+                                           initargs=(self,)) as p:
+            # Create progress bar
+            with tqdm(total=nindex, desc="Sky Coverage") as pbar:
+                # Iterate through blocks of timesteps
+                for (istart, istop), block_count in zip(blocks, p.imap(sky_coverage_worker, blocks)):
+                    count += block_count
+                    pbar.update(istop - istart)
+
+        # Calculate visible fraction
+        sky_coverage = count / nindex
+
+        # Store sky coverage
+        self.sky_coverage = sky_coverage
+
+        return sky_coverage
+
+    def bitmap_image(self, bitmap):
+        """
+        Function to convert a bitmap to the RA and DEC grid for plotting.
+
+        Parameters
+        ----------
+        bitmap : numpy.ndarray
+            Bitmap array.
+
+        Returns
+        -------
+        numpy.ndarray
+            Bitmap array on the RA and DEC grid.
+
+        """
+
+        # Sample HEALPix bitmaps at the grid points
+        if self.image_pixels is not None:
+            return bitmap[self.image_pixels]
+
+        return bitmap
+
+    def time_indices(self, start_time=None, end_time=None):
+        """
+        Function to find the indices of timesteps within a date range.
+
+        Parameters
+        ----------
+        start_time : astropy.time.core.Time or str, optional
+            Start of the date range. The default is None.
+        end_time : astropy.time.core.Time or str, optional
+            End of the date range. The default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            Indices of timesteps within the date range.
+
+        """
+
+        # Find observation times in days
+        jd = self.spacecraft_frame.obstime.jd
+
+        # Mask timesteps outside the date range
+        mask = np.ones(len(jd), dtype=bool)
+        if start_time is not None:
+            mask &= jd >= Time(start_time).jd
+        if end_time is not None:
+            mask &= jd <= Time(end_time).jd
+
+        return np.flatnonzero(mask)
+
+    def render_frame(self, index=0, scale=1):
+        """
+        Function to render a bitmap as an RGB frame without matplotlib,
+        generating the bitmap if they have not been generated.
 
         Parameters
         ----------
         index : int, optional
-            Index for the plotted timestep. The default is 0.
+            Index for the rendered timestep. The default is 0.
+        scale : int, optional
+            Integer upscaling factor of the frame. The default is 1.
+
+        Returns
+        -------
+        numpy.ndarray
+            RGB frame with shape (H, W, 3) and type uint8.
+
+        """
+
+        # Get or generate bitmaps
+        if self.solar_bitmaps is not None:
+            solar_bitmap, target_bitmap = self.get_bitmaps(index)
+        else:
+            solar_bitmap, target_bitmap = self.generate_bitmap(index)
+
+        return video_encoder.compose_frame(self.bitmap_image(solar_bitmap),
+                                           self.bitmap_image(target_bitmap),
+                                           scale=scale)
+
+    @instrument(count=lambda _, self: len(self.spacecraft_frame.obstime))
+    def render_bitmaps(self, path, start_time=None, end_time=None, num_workers=None, fps=24, scale=1):
+        """
+        Function to stream bitmaps into a video file or a PNG image sequence,
+        rendering frames in parallel.
+
+        Parameters
+        ----------
+        path : str
+            Output path, which is a video file if it has a video extension,
+            such as ".mp4" or ".gif", and is otherwise a directory of PNG
+            images. Videos are encoded by FFmpeg.
+        start_time : astropy.time.core.Time or str, optional
+            Start of the date range. The default is None.
+        end_time : astropy.time.core.Time or str, optional
+            End of the date range. The default is None.
+        num_workers : int, optional
+            Number of workers for the multiprocessing pool. The default is None.
+        fps : float, optional
+            Frames per second of videos. The default is 24.
+        scale : int, optional
+            Integer upscaling factor of the frames. The default is 1.
 
         Returns
         -------
@@ -251,28 +949,224 @@ class VisualisationModule():
 
         """
 
-        # Extract observation time and bitmaps
-        obstime = self.spacecraft_frame.obstime[index]
-        solar_bitmap = self.solar_bitmaps[index]
-        target_bitmap = self.target_bitmaps[index]
+        # Find timesteps within the date range
+        indices = self.time_indices(start_time, end_time)
+
+        # Define rendering options, writing PNG images in the workers
+        video = video_encoder.is_video(path)
+        options = {"scale": scale}
+        if not video:
+            os.makedirs(path, exist_ok=True)
+            options["directory"] = path
+
+        # Define frame shape
+        shape = (scale*self.theta_grid.shape[0], scale*self.theta_grid.shape[1])
+
+        # Render frames
+        with pool_context(self.cuda).Pool(num_workers,
+                                           initializer=init_render_worker,
+                                           initargs=(self, self.solar_bitmaps,
+                                                     self.target_bitmaps, options)) as p:
+            # Create progress bar
+            with tqdm(total=len(indices), desc="Bitmap Rendering") as pbar:
+                if video:
+                    # Pipe frames to the encoder in order
+                    with video_encoder.VideoWriter(path, shape, fps=fps) as writer:
+                        for frame in p.imap(render_frame_worker, indices, chunksize=4):
+                            writer.write(frame)
+                            pbar.update()
+                else:
+                    # Write frames in any order
+                    for _ in p.imap_unordered(render_frame_worker, indices, chunksize=4):
+                        pbar.update()
+
+    def create_bitmap_figure(self, dpi=300):
+        """
+        Function to create a bitmap figure, whose artists are updated for
+        each timestep rather than recreated.
+
+        Parameters
+        ----------
+        dpi : float, optional
+            Figure resolution. The default is 300.
+
+        Returns
+        -------
+        figure : tuple
+            Figure, target image, solar image and datetime text artists.
+
+        """
+
+        # Import plotting packages on first use
+        from matplotlib import pyplot as plt
+        from matplotlib.colors import ListedColormap
 
         # Create figure
-        plt.figure(figsize=((5.5, 4)), dpi=300)
+        fig = plt.figure(figsize=((5.5, 4)), dpi=dpi)
+        ax = fig.gca()
 
         # Define colourmaps
         cmap_target = ListedColormap(["white", "green"])
         cmap_solar = ListedColormap(["white", "red"])
 
-        # Plot target bitmap
-        plt.contourf(self.theta_grid, self.phi_grid, target_bitmap,
-                     cmap=cmap_target,
-                     antialiased=False)
+        # Create target and solar images
+        empty = np.zeros(self.theta_grid.shape, dtype=np.uint8)
+        extent = (-180, 180, -90, 90)
+        target_image = ax.imshow(empty,
+                                 cmap=cmap_target,
+                                 vmin=0,
+                                 vmax=1,
+                                 origin="lower",
+                                 extent=extent,
+                                 interpolation="nearest")
+        solar_image = ax.imshow(empty,
+                                cmap=cmap_solar,
+                                vmin=0,
+                                vmax=1,
+                                alpha=0.5,
+                                origin="lower",
+                                extent=extent,
+                                interpolation="nearest")
+
+        # Reverse axes
+        ax.invert_xaxis()
+
+        # Set square aspect
+        ax.set_aspect(aspect=1)
+
+        # Add axis labels
+        ax.set_xlabel("Right Ascension [deg]")
+        ax.set_ylabel("Declination [deg]")
 
-        # Plot solar bitmap
-        plt.contourf(self.theta_grid, self.phi_grid, solar_bitmap,
-                     cmap=cmap_solar,
-                     alpha=0.5,
-                     antialiased=False)
+        # Set ticks
+        ax.set_xticks(np.arange(-180, 240, step=60))
+        ax.set_yticks(np.arange(-90, 120, step=30))
+
+        # Add grid
+        ax.grid(alpha=0.25)
+
+        # Add datetime text box
+        props = dict(boxstyle="round", facecolor="white", alpha=0.75)
+        text = ax.text(0.975, 0.95,
+                       "",
+                       transform=ax.transAxes,
+                       fontsize=9,
+                       verticalalignment="top",
+                       horizontalalignment="right",
+                       bbox=props)
+
+        return fig, target_image, solar_image, text
+
+    def update_bitmap_figure(self, figure, index=0):
+        """
+        Function to update a bitmap figure with the bitmaps of a timestep.
+
+        Parameters
+        ----------
+        figure : tuple
+            Figure and artists from create_bitmap_figure.
+        index : int, optional
+            Index for the plotted timestep. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Get or generate bitmaps
+        if self.solar_bitmaps is not None:
+            solar_bitmap, target_bitmap = self.get_bitmaps(index)
+        else:
+            solar_bitmap, target_bitmap = self.generate_bitmap(index)
+
+        # Update images and datetime
+        _, target_image, solar_image, text = figure
+        target_image.set_data(self.bitmap_image(target_bitmap).astype(np.uint8))
+        solar_image.set_data(self.bitmap_image(solar_bitmap).astype(np.uint8))
+        text.set_text(self.spacecraft_frame.obstime[index].fits)
+
+    def plot_bitmaps(self, path=None, start_time=None, end_time=None, num_workers=None, dpi=300, file_format="png"):
+        """
+        Function to plot multiple bitmaps in one call.
+
+        Without a path, a figure is created for each timestep. With a path,
+        each worker of a multiprocessing pool creates one figure, updates
+        its images for each timestep and saves it to disk.
+
+        Parameters
+        ----------
+        path : str, optional
+            Output directory of the saved figures. The default is None.
+        start_time : astropy.time.core.Time or str, optional
+            Start of the date range. The default is None.
+        end_time : astropy.time.core.Time or str, optional
+            End of the date range. The default is None.
+        num_workers : int, optional
+            Number of workers for the multiprocessing pool. The default is None.
+        dpi : float, optional
+            Figure resolution. The default is 300.
+        file_format : str, optional
+            File format of the saved figures. The default is "png".
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Find timesteps within the date range
+        indices = self.time_indices(start_time, end_time)
+
+        # Create a figure for each timestep
+        if path is None:
+            for index in tqdm(indices, desc="Bitmap Plotting"):
+                figure = self.create_bitmap_figure(dpi)
+                self.update_bitmap_figure(figure, index)
+            return
+
+        # Define plotting options
+        os.makedirs(path, exist_ok=True)
+        options = {"directory": path, "dpi": dpi, "file_format": file_format}
+
+        # Save figures in parallel
+        with pool_context(self.cuda).Pool(num_workers,
+                                           initializer=init_plot_worker,
+                                           initargs=(self, self.solar_bitmaps,
+                                                     self.target_bitmaps, options)) as p:
+            # Create progress bar
+            with tqdm(total=len(indices), desc="Bitmap Plotting") as pbar:
+                # Iterate through timesteps
+                for _ in p.imap_unordered(plot_frame_worker, indices, chunksize=4):
+                    pbar.update()
+
+    def plot_sky_coverage(self):
+        """
+        Function to plot the fraction of time that each region of the sky is
+        not excluded by solar bodies.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Import plotting packages on first use
+        from matplotlib import pyplot as plt
+        import seaborn as sns
+
+        # Create figure
+        plt.figure(figsize=((5.5, 4)), dpi=300)
+
+        # Plot sky coverage
+        image = 100*self.bitmap_image(self.sky_coverage)
+        plt.contourf(self.theta_grid, self.phi_grid, image,
+                     levels=np.linspace(0, 100, 11),
+                     cmap=sns.color_palette("crest", as_cmap=True))
+
+        # Add colour bar
+        clb = plt.colorbar()
+        clb.ax.set_ylabel("Visible Duration [%]")
 
         # Reverse axes
         ax = plt.gca()
@@ -292,39 +1186,69 @@ class VisualisationModule():
         # Add grid
         plt.grid(alpha=0.25)
 
-        # Add datetime in text box
-        textstr = obstime.fits
-        props = dict(boxstyle="round", facecolor="white", alpha=0.75)
-        ax.text(0.975, 0.95,
-                textstr,
-                transform=ax.transAxes,
-                fontsize=9,
-                verticalalignment="top",
-                horizontalalignment="right",
-                bbox=props)
+    def use_binned_plots(self, binned=None, max_points=10000):
+        """
+        Function to decide whether summary plots aggregate targets into bins
+        rather than drawing each target.
+
+        Parameters
+        ----------
+        binned : bool, optional
+            Flag for binned plots. The default is None which uses binned plots
+            if there are more than max_points targets.
+        max_points : int, optional
+            Maximum number of targets drawn individually when binned is None.
+            The default is 10000.
+
+        Returns
+        -------
+        bool
+            Flag for binned plots.
 
-    def plot_bitmaps(self):
         """
-        Function to plot multiple bitmaps in one call.
+
+        # Use binned plots for large catalogues
+        if binned is None:
+            return len(self.stats) > max_points
+
+        return binned
+
+    def target_sky_image(self, values=None, bins=(360, 180)):
+        """
+        Function to aggregate targets on an RA and DEC grid.
+
+        Parameters
+        ----------
+        values : numpy.ndarray, optional
+            Values of each target which are averaged in each bin. The default
+            is None which counts targets in each bin.
+        bins : tuple, optional
+            Number of bins in RA and DEC. The default is (360, 180).
 
         Returns
         -------
-        None.
+        image : numpy.ma.MaskedArray
+            Image with shape (DEC, RA), where empty bins are masked.
 
         """
 
-        # TODO: date range input
+        # Count targets in each bin
+        ra = self.stats["mean_ra"].to_numpy(dtype=float)
+        dec = self.stats["mean_dec"].to_numpy(dtype=float)
+        bin_range = [[-180, 180], [-90, 90]]
+        count, _, _ = np.histogram2d(ra, dec, bins=bins, range=bin_range)
 
-        # Find number of timesteps
-        nindex = len(self.spacecraft_frame.obstime)
+        # Average values in each bin
+        if values is None:
+            image = count
+        else:
+            total, _, _ = np.histogram2d(ra, dec, bins=bins, range=bin_range,
+                                         weights=values)
+            image = total / np.maximum(count, 1)
 
-        # Iterate through timesteps
-        # TODO: make parallel
-        for index in tqdm(range(nindex), desc="Bitmap Plotting"):
-            # Plot bitmaps
-            self.__plot_bitmap(index)
+        return np.ma.masked_where(count.T == 0, image.T)
 
-    def plot_target_scatter(self, legend=False):
+    def plot_target_scatter(self, legend=False, binned=None, max_points=10000, bins=(360, 180)):
         """
         Function to plot a scatter of targets.
 
@@ -332,23 +1256,50 @@ class VisualisationModule():
         ----------
         legend : bool, optional
             Flag for adding a legend. The default is False.
+        binned : bool, optional
+            Flag to plot the number of targets in RA and DEC bins as a single
+            image. The default is None which uses binned plots if there are
+            more than max_points targets.
+        max_points : int, optional
+            Maximum number of targets drawn individually when binned is None.
+            The default is 10000.
+        bins : tuple, optional
+            Number of bins in RA and DEC. The default is (360, 180).
 
         Returns
         -------
         None.
 
         """
+
+        # Import plotting packages on first use
+        from matplotlib import pyplot as plt
+        import seaborn as sns
         
         # Create figure
         plt.figure(figsize=((5.5, 4)), dpi=300)
 
-        # Plot targets with different colors and markers for each category
-        ax = sns.scatterplot(data=self.stats,
-                             x="mean_ra",
-                             y="mean_dec",
-                             style="category",
-                             hue="category",
-                             legend=legend)
+        if self.use_binned_plots(binned, max_points):
+            # Plot number of targets in each bin
+            ax = plt.gca()
+            image = ax.imshow(self.target_sky_image(bins=bins),
+                              cmap="crest",
+                              origin="lower",
+                              extent=(-180, 180, -90, 90),
+                              aspect="auto",
+                              interpolation="nearest")
+
+            # Add colour bar
+            clb = ax.figure.colorbar(image)
+            clb.ax.set_ylabel("Targets [-]")
+        else:
+            # Plot targets with different colors and markers for each category
+            ax = sns.scatterplot(data=self.stats,
+                                 x="mean_ra",
+                                 y="mean_dec",
+                                 style="category",
+                                 hue="category",
+                                 legend=legend)
 
         # Set axis labels
         ax.set(xlabel="Right Ascension [deg]", ylabel="Declination [deg]")
@@ -367,7 +1318,7 @@ class VisualisationModule():
         # Enable grid
         plt.grid()
 
-    def plot_target_duration_scatter(self, legend=False):
+    def plot_target_duration_scatter(self, legend=False, binned=None, max_points=10000, bins=(360, 180)):
         """
         Function to plot a scatter of targets where their colour varies
         depending on visibility.
@@ -376,12 +1327,25 @@ class VisualisationModule():
         ----------
         legend : bool, optional
             Flag for adding a legend. The default is False.
+        binned : bool, optional
+            Flag to plot the mean visibility of targets in RA and DEC bins as
+            a single image. The default is None which uses binned plots if
+            there are more than max_points targets.
+        max_points : int, optional
+            Maximum number of targets drawn individually when binned is None.
+            The default is 10000.
+        bins : tuple, optional
+            Number of bins in RA and DEC. The default is (360, 180).
 
         Returns
         -------
         None.
 
         """
+
+        # Import plotting packages on first use
+        from matplotlib import pyplot as plt
+        import seaborn as sns
         
         # Create figure
         plt.figure(figsize=((5.5, 4)), dpi=300)
@@ -395,19 +1359,31 @@ class VisualisationModule():
         sm = plt.cm.ScalarMappable(cmap="crest", norm=norm)
         sm.set_array([])
 
-        # Plot targets with different markers for each category but a common
-        # palette depending on total duration
-        ax = sns.scatterplot(data=self.stats,
-                             x="mean_ra",
-                             y="mean_dec",
-                             style="category",
-                             hue="percentage_duration",
-                             palette="crest",
-                             hue_norm=norm,
-                             legend=legend)
+        if self.use_binned_plots(binned, max_points):
+            # Plot mean total duration of the targets in each bin
+            ax = plt.gca()
+            values = percentage.to_numpy(dtype=float)
+            ax.imshow(self.target_sky_image(values, bins=bins),
+                      cmap="crest",
+                      norm=norm,
+                      origin="lower",
+                      extent=(-180, 180, -90, 90),
+                      aspect="auto",
+                      interpolation="nearest")
+        else:
+            # Plot targets with different markers for each category but a
+            # common palette depending on total duration
+            ax = sns.scatterplot(data=self.stats,
+                                 x="mean_ra",
+                                 y="mean_dec",
+                                 style="category",
+                                 hue="percentage_duration",
+                                 palette="crest",
+                                 hue_norm=norm,
+                                 legend=legend)
 
         # Add colour bar
-        clb = ax.figure.colorbar(sm)
+        clb = ax.figure.colorbar(sm, ax=ax)
         clb.ax.set_ylabel("Visible Duration [%]")
 
         # Set axis labels
@@ -427,7 +1403,7 @@ class VisualisationModule():
         # Enable grid
         plt.grid()
 
-    def plot_target_duration_boxplot(self, xlim=None, buffer=5):
+    def plot_target_duration_boxplot(self, xlim=None, buffer=5, binned=None, max_points=10000, bins=200):
         """
         Function to plot box plot and scatter of target visibility.
 
@@ -438,27 +1414,46 @@ class VisualisationModule():
         
         buffer : float, optional
             X axis buffer value. The default is 5.
+        binned : bool, optional
+            Flag to draw box plots from precomputed quartiles, overlaid with
+            a histogram of each category as a single image rather than a
+            strip of points. The default is None which uses binned plots if
+            there are more than max_points targets.
+        max_points : int, optional
+            Maximum number of targets drawn individually when binned is None.
+            The default is 10000.
+        bins : int, optional
+            Number of visible duration bins. The default is 200.
 
         Returns
         -------
         None.
 
         """
+
+        # Import plotting packages on first use
+        from matplotlib import pyplot as plt
+        import seaborn as sns
         
         # Create figure
         plt.figure(figsize=((5.5, 4)), dpi=300)
 
-        # Plot box plots and overlay with data points
-        ax = sns.boxplot(data=self.stats,
-                         x="percentage_duration",
-                         y="category",
-                         color="white",
-                         whis=100)
-        sns.stripplot(data=self.stats,
-                      x="percentage_duration",
-                      y="category",
-                      linewidth=0.5,
-                      alpha=0.75)
+        if self.use_binned_plots(binned, max_points):
+            # Plot box plots from quartiles and overlay with histograms
+            ax = plt.gca()
+            self.__plot_binned_boxplot(ax, bins)
+        else:
+            # Plot box plots and overlay with data points
+            ax = sns.boxplot(data=self.stats,
+                             x="percentage_duration",
+                             y="category",
+                             color="white",
+                             whis=100)
+            sns.stripplot(data=self.stats,
+                          x="percentage_duration",
+                          y="category",
+                          linewidth=0.5,
+                          alpha=0.75)
 
         # Set axis labels
         ax.set(xlabel="Visible Duration [%]", ylabel="Category [-]")
@@ -502,3 +1497,81 @@ class VisualisationModule():
         
         # Enable grid
         plt.grid()
+
+    def __plot_binned_boxplot(self, ax, bins=200):
+        """
+        Function to plot horizontal box plots of target visibility for each
+        category from precomputed quartiles, overlaid with a histogram image.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes
+            Plot axes.
+        bins : int, optional
+            Number of visible duration bins. The default is 200.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        # Group visible durations by category in order of appearance
+        categories = self.stats["category"].to_numpy()
+        percentage = self.stats["percentage_duration"].to_numpy(dtype=float)
+        names, first, codes = np.unique(categories, return_index=True,
+                                        return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        codes = rank[codes.ravel()]
+        names = names[order]
+
+        # Calculate histograms of each category normalised to their maximum
+        edges = np.linspace(0, 100, bins + 1)
+        histogram, _, _ = np.histogram2d(codes, percentage,
+                                         bins=(len(names), edges),
+                                         range=[[-0.5, len(names) - 0.5], [0, 100]])
+        histogram /= np.maximum(histogram.max(axis=1, keepdims=True), 1)
+
+        # Plot histograms with a row for each category
+        ax.imshow(np.ma.masked_equal(histogram, 0),
+                  cmap="crest",
+                  alpha=0.75,
+                  origin="upper",
+                  extent=(0, 100, len(names) - 0.5, -0.5),
+                  aspect="auto",
+                  interpolation="nearest")
+
+        # Calculate quartiles and extremes of each category
+        box_stats = []
+        for icategory, name in enumerate(names):
+            values = percentage[codes == icategory]
+            q1, med, q3 = np.percentile(values, [25, 50, 75])
+            box_stats.append({"label": name,
+                              "med": med,
+                              "q1": q1,
+                              "q3": q3,
+                              "whislo": values.min(),
+                              "whishi": values.max(),
+                              "fliers": []})
+
+        # Define horizontal orientation, where the vert keyword is
+        # deprecated from matplotlib 3.10
+        import matplotlib
+        version = tuple(int(part) for part in matplotlib.__version__.split(".")[:2])
+        if version >= (3, 10):
+            orientation = {"orientation": "horizontal"}
+        else:
+            orientation = {"vert": False}
+
+        # Plot box plots
+        ax.bxp(box_stats,
+               positions=np.arange(len(names)),
+               widths=0.8,
+               **orientation,
+               showfliers=False,
+               patch_artist=True,
+               boxprops={"facecolor": "none"},
+               medianprops={"color": "black"})
+        ax.set_ylim(len(names) - 0.5, -0.5)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import synthetic
+
+
+class TimeTargetLoading():
+    """
+    Benchmark of loading targets from a targets file.
+    """
+
+    params = ([10, 100, 1000], [288, 2016])
+    param_names = ["n_targets", "n_steps"]
+
+    def setup(self, n_targets, n_steps):
+        self.frame = synthetic.spacecraft_frame(n_steps)
+        self.path = synthetic.target_catalogue_file(n_targets)
+
+    def teardown(self, n_targets, n_steps):
+        os.remove(self.path)
+
+    def time_load(self, n_targets, n_steps):
+        from assam.visibility import astro_target_interface
+        astro_target_interface.load(self.frame, num_workers=1, path=self.path)
+
+
+class TimeSolarBodyLoading():
+    """
+    Benchmark of loading solar bodies with the built-in ephemeris.
+    """
+
+    params = ([288, 2016, 8640],)
+    param_names = ["n_steps"]
+
+    def setup(self, n_steps):
+        self.frame = synthetic.spacecraft_frame(n_steps)
+        self.path = synthetic.solar_bodies_file()
+
+    def teardown(self, n_steps):
+        os.remove(self.path)
+
+    def time_load(self, n_steps):
+        from assam.propagator import solar_body_interface
+        solar_body_interface.load(self.frame, ephem="builtin", num_workers=1,
+                                  path=self.path)
+
+
+class TimeVisibility():
+    """
+    Benchmark of target visibility, contacts and statistics.
+    """
+
+    params = ([10, 100], [288, 2016])
+    param_names = ["n_targets", "n_steps"]
+
+    def setup(self, n_targets, n_steps):
+        from assam.visibility import VisibilityModule
+
+        # Create visibility module with generated targets
+        self.visibility = VisibilityModule(synthetic.spacecraft_frame(n_steps),
+                                           synthetic.solar_bodies(n_steps))
+        self.visibility.targets = synthetic.targets(n_targets, n_steps)
+
+    def time_visibility(self, n_targets, n_steps):
+        self.visibility.calculate_visibility()
+
+    def time_contacts(self, n_targets, n_steps):
+        self.visibility.calculate_visibility()
+        self.visibility.calculate_contacts()
+
+
+class TimeStats():
+    """
+    Benchmark of overall and binned statistics.
+    """
+
+    params = ([10, 100], [2016, 8640])
+    param_names = ["n_targets", "n_steps"]
+
+    def setup(self, n_targets, n_steps):
+        from assam.visibility import VisibilityModule
+
+        # Create visibility module with generated targets and contacts
+        self.visibility = VisibilityModule(synthetic.spacecraft_frame(n_steps),
+                                           synthetic.solar_bodies(n_steps))
+        self.visibility.targets = synthetic.targets(n_targets, n_steps,
+                                                    visibility=True)
+
+    def time_overall_stats(self, n_targets, n_steps):
+        self.visibility.calculate_overall_stats()
+
+    def time_overall_stats_loop(self, n_targets, n_steps):
+        self.visibility.calculate_overall_stats(vectorised=False)
+
+    def time_binned_stats(self, n_targets, n_steps):
+        self.visibility.calculate_binned_stats(bins="day")
+
+
+class TimeScheduling():
+    """
+    Benchmark of scheduling methods on generated contacts.
+    """
+
+    params = ([1000, 10000, 100000],
+              ["simple_dynamic_schedule", "constrained_greedy_schedule"])
+    param_names = ["n_contacts", "method"]
+
+    def setup(self, n_contacts, method):
+        from assam.scheduling import SchedulingModule
+
+        # Create scheduling module with generated contacts
+        self.scheduling = SchedulingModule(synthetic.contacts(n_contacts))
+        self.scheduling.combine_contacts()
+
+    def time_schedule(self, n_contacts, method):
+        getattr(self.scheduling, method)()
+
+
+class TimeBitmaps():
+    """
+    Benchmark of bitmap generation.
+    """
+
+    params = ([(181, 91), (721, 361)], [True, False])
+    param_names = ["npix", "stamps"]
+
+    def setup(self, npix, stamps):
+        from assam.visualisation.visualisation_module import VisualisationModule
+
+        # Create visualisation module with generated targets
+        n_steps = 288
+        self.visualisation = VisualisationModule(
+            synthetic.spacecraft_frame(n_steps),
+            synthetic.solar_bodies(n_steps),
+            synthetic.targets(100, n_steps),
+            None,
+            npix=npix,
+            stamps=stamps)
+
+    def time_generate_bitmap(self, npix, stamps):
+        self.visualisation.generate_bitmap(0)
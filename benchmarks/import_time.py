@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Define repository path, which is added to the path of the fresh
+# interpreters so that the local package is imported
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Define imported modules
+MODULES = ["assam",
+           "assam.scheduling",
+           "assam.scheduling.scheduling_module",
+           "assam.visibility",
+           "assam.visibility.visibility_module",
+           "assam.propagator",
+           "assam.visualisation",
+           "assam.visualisation.visualisation_module"]
+
+# Define heavy dependencies which are reported if they are imported
+HEAVY_MODULES = ["astropy", "cupy", "matplotlib", "pandas", "seaborn",
+                 "scipy", "highspy", "pyarrow"]
+
+# Define script which is run in a fresh interpreter
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+duration = time.perf_counter() - start
+loaded = [name for name in {heavy} if name in sys.modules]
+print(json.dumps({{"duration": duration, "loaded": loaded}}))
+"""
+
+
+def time_import(module, repeat=5):
+    """
+    Function to time the import of a module in fresh interpreters.
+
+    Parameters
+    ----------
+    module : str
+        Module name.
+    repeat : int, optional
+        Number of repetitions. The default is 5.
+
+    Returns
+    -------
+    result : dict
+        Median and minimum import time in seconds, and the heavy
+        dependencies imported with the module.
+
+    """
+
+    # Add repository to the path of the fresh interpreters
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [REPO_PATH] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+
+    # Import module in fresh interpreters
+    durations = []
+    for _ in range(repeat):
+        script = SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", script],
+                                check=True,
+                                capture_output=True,
+                                env=env,
+                                text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        durations.append(result["duration"])
+
+    return {"module": module,
+            "median": statistics.median(durations),
+            "min": min(durations),
+            "loaded": result["loaded"]}
+
+
+def main():
+    """
+    Function to benchmark the import time of the assam package.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Benchmark assam import times")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true",
+                        help="print results as JSON")
+    args = parser.parse_args()
+
+    # Time imports
+    results = [time_import(module, args.repeat) for module in args.modules]
+
+    # Print results
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"{result['module']:<45} "
+              f"{1000*result['median']:8.1f} ms  "
+              f"{', '.join(result['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    # Execute import benchmark
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import time
+
+# Add benchmarks directory to path and run from the repository
+BENCHMARK_PATH = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, BENCHMARK_PATH)
+
+# Define benchmark modules
+MODULES = ["bench_stages"]
+
+
+def benchmark_cases(pattern=None):
+    """
+    Function to find benchmark cases, which follow the asv layout of classes
+    with params, param_names, setup, teardown and time_ methods.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Substring of the selected benchmark names. The default is None.
+
+    Returns
+    -------
+    cases : list
+        Benchmark classes, method names and parameter combinations.
+
+    """
+
+    # Iterate through benchmark classes and methods
+    cases = []
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for class_name, benchmark in inspect.getmembers(module, inspect.isclass):
+            if benchmark.__module__ != module_name:
+                continue
+            for method_name, _ in inspect.getmembers(benchmark, inspect.isfunction):
+                # Select timing methods
+                name = f"{module_name}.{class_name}.{method_name}"
+                if not method_name.startswith("time_"):
+                    continue
+                if pattern is not None and pattern not in name:
+                    continue
+
+                # Create parameter combinations
+                params = getattr(benchmark, "params", ())
+                for param in itertools.product(*params):
+                    cases.append((name, benchmark, method_name, param))
+
+    return cases
+
+
+def run_case(benchmark, method_name, param, repeat=3, max_time=60.0):
+    """
+    Function to time a benchmark case.
+
+    Parameters
+    ----------
+    benchmark : type
+        Benchmark class.
+    method_name : str
+        Timing method name.
+    param : tuple
+        Parameter combination.
+    repeat : int, optional
+        Number of repetitions. The default is 3.
+    max_time : float, optional
+        Time after which no further repetitions are run [s].
+        The default is 60.
+
+    Returns
+    -------
+    durations : list
+        Duration of each repetition [s].
+
+    """
+
+    # Set up benchmark
+    instance = benchmark()
+    if hasattr(instance, "setup"):
+        instance.setup(*param)
+
+    # Time repetitions
+    durations = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            getattr(instance, method_name)(*param)
+            durations.append(time.perf_counter() - start)
+            if sum(durations) > max_time:
+                break
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown(*param)
+
+    return durations
+
+
+def main():
+    """
+    Function to run the benchmark suite.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Run assam benchmarks")
+    parser.add_argument("pattern", nargs="?", default=None,
+                        help="substring of the selected benchmark names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=60.0)
+    parser.add_argument("--quick", action="store_true",
+                        help="only run the first parameter of each sweep")
+    parser.add_argument("--json", default=None,
+                        help="path of a JSON file to write the results to")
+    args = parser.parse_args()
+
+    # Run from the repository so that data paths resolve
+    os.chdir(os.path.dirname(BENCHMARK_PATH))
+
+    # Select cases
+    cases = benchmark_cases(args.pattern)
+    if args.quick:
+        seen = set()
+        cases = [case for case in cases
+                 if case[0] not in seen and not seen.add(case[0])]
+
+    # Run cases
+    results = []
+    for name, benchmark, method_name, param in cases:
+        durations = run_case(benchmark, method_name, param, args.repeat,
+                             args.max_time)
+        result = {"name": name,
+                  "params": dict(zip(benchmark.param_names, map(str, param))),
+                  "min": min(durations),
+                  "median": sorted(durations)[len(durations)//2],
+                  "repeat": len(durations)}
+        results.append(result)
+        print(f"{name:<55} "
+              f"{', '.join(f'{k}={v}' for k, v in result['params'].items()):<45} "
+              f"{1000*result['min']:10.1f} ms", flush=True)
+
+    # Write results
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    # Execute benchmarks
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import os
+import sys
+import tempfile
+
+import numpy as np
+import yaml
+
+# Add repository to path when run from the benchmarks directory
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+if REPO_PATH not in sys.path:
+    sys.path.insert(0, REPO_PATH)
+
+# Define default orbit and mission start
+KEPLERIAN_ELEMENTS = {"SMA": 6921,
+                      "ECC": 0,
+                      "INC": 97.57,
+                      "RAAN": 90,
+                      "AOP": 0,
+                      "TA": 0}
+START_TIME = "2021-03-20 12:00"
+
+# Define target categories
+CATEGORIES = ["Galactic Centre", "Galactic Mid-plane", "Magellanic Clouds",
+              "Exoplanet", "Extragalactic"]
+
+
+@functools.lru_cache(maxsize=8)
+def spacecraft_frame(n_steps, time_step=5):
+    """
+    Function to generate a spacecraft frame with the analytic Keplerian
+    propagator, which stands in for GMAT.
+
+    Parameters
+    ----------
+    n_steps : int
+        Number of timesteps.
+    time_step : float, optional
+        Time step [min]. The default is 5.
+
+    Returns
+    -------
+    astropy.coordinates.builtin_frames.gcrs.GCRS
+        Spacecraft reference frame.
+
+    """
+
+    from astropy import units as u
+    from astropy.time import Time, TimeDelta
+
+    from assam.propagator.kepler_interface import KeplerInterface
+
+    # Propagate orbit
+    start_time = Time(START_TIME)
+    step = TimeDelta(time_step*u.min)
+    kepler = KeplerInterface(start_time, start_time + (n_steps - 1)*step,
+                             step, KEPLERIAN_ELEMENTS)
+
+    return kepler.load_state()
+
+
+def solar_bodies_file(names=("sun", "earth", "moon")):
+    """
+    Function to write a solar bodies file including a subset of the bodies.
+
+    Parameters
+    ----------
+    names : tuple, optional
+        Names of the included solar bodies.
+        The default is ("sun", "earth", "moon").
+
+    Returns
+    -------
+    path : str
+        Path of the solar bodies file.
+
+    """
+
+    # Load solar bodies
+    with open(os.path.join(REPO_PATH, "data", "solar_bodies.yml")) as file:
+        solar_bodies_dump = yaml.safe_load(file)
+
+    # Include subset of solar bodies
+    for name, info in solar_bodies_dump.items():
+        info["included"] = name in names
+
+    # Write file
+    fd, path = tempfile.mkstemp(suffix=".yml")
+    with os.fdopen(fd, "w") as file:
+        yaml.safe_dump(solar_bodies_dump, file)
+
+    return path
+
+
+@functools.lru_cache(maxsize=8)
+def solar_bodies(n_steps, names=("sun", "earth", "moon")):
+    """
+    Function to generate solar bodies with the built-in ephemeris, which
+    runs offline.
+
+    Parameters
+    ----------
+    n_steps : int
+        Number of timesteps.
+    names : tuple, optional
+        Names of the included solar bodies.
+        The default is ("sun", "earth", "moon").
+
+    Returns
+    -------
+    list
+        Solar system bodies and their properties.
+
+    """
+
+    from assam.propagator import solar_body_interface
+
+    # Load solar bodies
+    path = solar_bodies_file(names)
+    try:
+        return solar_body_interface.load(spacecraft_frame(n_steps),
+                                         ephem="builtin",
+                                         num_workers=1,
+                                         path=path)
+    finally:
+        os.remove(path)
+
+
+def target_catalogue(n_targets, n_subtargets=1, seed=0):
+    """
+    Function to generate a target catalogue with targets distributed
+    uniformly on the sky, in the format of the targets file.
+
+    Parameters
+    ----------
+    n_targets : int
+        Number of targets.
+    n_subtargets : int, optional
+        Number of subtargets of each target. The default is 1.
+    seed : int, optional
+        Random seed. The default is 0.
+
+    Returns
+    -------
+    catalogue : dict
+        Target information keyed by target name.
+
+    """
+
+    # Sample target centres uniformly on the sphere
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0, 360, n_targets)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_targets)))
+
+    # Create targets
+    catalogue = {}
+    for itarget in range(n_targets):
+        subtargets = {}
+        for isubtarget in range(n_subtargets):
+            # Offset subtargets around the target centre
+            centre = [float((ra[itarget] + 0.5*isubtarget) % 360),
+                      float(np.clip(dec[itarget] + 0.5*isubtarget, -90, 90))]
+
+            # Alternate between circular and rectangular subtargets
+            if isubtarget % 2 == 0:
+                subtargets[f"region_{isubtarget}"] = {
+                    "frame": "icrs", "centre": centre, "shape": "circular",
+                    "width": None, "height": None,
+                    "angular_radius": float(rng.uniform(0.1, 2))}
+            else:
+                subtargets[f"region_{isubtarget}"] = {
+                    "frame": "icrs", "centre": centre, "shape": "rectangular",
+                    "width": float(rng.uniform(0.1, 3)),
+                    "height": float(rng.uniform(0.1, 3)),
+                    "angular_radius": None}
+
+        catalogue[f"target_{itarget}"] = {
+            "category": CATEGORIES[itarget % len(CATEGORIES)],
+            "priority": int(rng.integers(1, 5)),
+            "subtargets": subtargets}
+
+    return catalogue
+
+
+def target_catalogue_file(n_targets, n_subtargets=1, seed=0):
+    """
+    Function to write a generated target catalogue to a temporary targets
+    file.
+
+    Parameters
+    ----------
+    n_targets : int
+        Number of targets.
+    n_subtargets : int, optional
+        Number of subtargets of each target. The default is 1.
+    seed : int, optional
+        Random seed. The default is 0.
+
+    Returns
+    -------
+    path : str
+        Path of the targets file, which the caller removes.
+
+    """
+
+    # Write catalogue
+    fd, path = tempfile.mkstemp(suffix=".yml")
+    with os.fdopen(fd, "w") as file:
+        yaml.safe_dump(target_catalogue(n_targets, n_subtargets, seed), file)
+
+    return path
+
+
+def targets(n_targets, n_steps, n_subtargets=1, seed=0, visibility=False):
+    """
+    Function to generate target objects, optionally with their visibility
+    and contacts.
+
+    Parameters
+    ----------
+    n_targets : int
+        Number of targets.
+    n_steps : int
+        Number of timesteps.
+    n_subtargets : int, optional
+        Number of subtargets of each target. The default is 1.
+    seed : int, optional
+        Random seed. The default is 0.
+    visibility : bool, optional
+        Flag to calculate visibility and contacts. The default is False.
+
+    Returns
+    -------
+    target_list : list
+        Targets and their properties.
+
+    """
+
+    from assam.visibility import astro_target_interface
+
+    # Generate targets
+    frame = spacecraft_frame(n_steps)
+    catalogue = target_catalogue(n_targets, n_subtargets, seed)
+    target_list = [astro_target_interface.load_worker((target_dump, frame))
+                   for target_dump in catalogue.items()]
+
+    # Calculate visibility and contacts
+    if visibility:
+        bodies = solar_bodies(n_steps)
+        for target in target_list:
+            target.calculate_visibility(bodies)
+            target.calculate_contacts()
+
+    return target_list
+
+
+def contacts(n_contacts, n_targets=100, span=365.0, mean_duration=0.02, seed=0):
+    """
+    Function to generate contacts with random start times and durations,
+    without calculating visibility.
+
+    Parameters
+    ----------
+    n_contacts : int
+        Number of contacts.
+    n_targets : int, optional
+        Number of targets. The default is 100.
+    span : float, optional
+        Time span of the contacts [days]. The default is 365.
+    mean_duration : float, optional
+        Mean contact duration [days]. The default is 0.02.
+    seed : int, optional
+        Random seed. The default is 0.
+
+    Returns
+    -------
+    target_list : list
+        Targets with their contacts.
+
+    """
+
+    from assam.visibility.astro_target import AstroTarget, TargetContact
+
+    # Sample contact times, durations and targets
+    rng = np.random.default_rng(seed)
+    start = 2459294.0 + np.sort(rng.uniform(0, span, n_contacts))
+    duration = rng.exponential(mean_duration, n_contacts)
+    itarget = rng.integers(0, n_targets, n_contacts)
+
+    # Create targets
+    target_list = [AstroTarget(f"target_{i}", int(rng.integers(1, 5)),
+                               CATEGORIES[i % len(CATEGORIES)])
+                   for i in range(n_targets)]
+    for target in target_list:
+        target.contacts = []
+
+    # Create contacts without astropy times
+    for s, d, i in zip(start, duration, itarget):
+        contact = TargetContact.__new__(TargetContact)
+        contact.target = target_list[i]
+        contact.start = s
+        contact.end = s + d
+        contact.duration = d
+        contact.benefit = d / target_list[i].priority
+        target_list[i].contacts.append(contact)
+
+    return target_list
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add repository to path when run from the tests directory
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+if REPO_PATH not in sys.path:
+    sys.path.insert(0, REPO_PATH)
+
+
+@pytest.fixture
+def make_contacts():
+    """
+    Fixture to create targets with contacts from (target, start, end,
+    benefit) tuples, without astropy times or visibility.
+
+    Returns
+    -------
+    callable
+        Function returning the targets and their contacts in input order.
+
+    """
+
+    from assam.visibility.astro_target import AstroTarget, TargetContact
+
+    def make(entries, spacecraft=None):
+        # Create targets in order of appearance
+        targets = {}
+        for name, _, _, _ in entries:
+            if name not in targets:
+                targets[name] = AstroTarget(name, 1, "Test")
+                targets[name].contacts = []
+
+        # Create contacts
+        contacts = []
+        for name, start, end, benefit in entries:
+            contact = TargetContact.__new__(TargetContact)
+            contact.target = targets[name]
+            contact.spacecraft = spacecraft
+            contact.start = start
+            contact.end = end
+            contact.duration = end - start
+            contact.benefit = benefit
+            targets[name].contacts.append(contact)
+            contacts.append(contact)
+
+        return list(targets.values()), contacts
+
+    return make
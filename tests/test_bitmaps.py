@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import types
+
+import pytest
+
+from assam.visualisation import visualisation_module
+from assam.visualisation.visualisation_module import VisualisationModule
+
+
+def failing_worker(index):
+    raise RuntimeError(f"Failed bitmap: {index}")
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"),
+                    reason="shared memory blocks are not listed")
+def test_failed_workers_free_shared_memory(monkeypatch):
+    # The shared memory blocks of the bitmap stacks must be unlinked if the
+    # workers fail, rather than only when the stacks are released
+    module = VisualisationModule.__new__(VisualisationModule)
+    module.spacecraft_frame = types.SimpleNamespace(obstime=range(4))
+    module.bitmap_shape = (3, 5)
+    module.cuda = False
+    module.bitmap_handles = []
+    monkeypatch.setattr(visualisation_module, "generate_bitmap_worker",
+                        failing_worker)
+
+    before = set(os.listdir("/dev/shm"))
+    with pytest.raises(RuntimeError, match="Failed bitmap"):
+        module.generate_bitmaps(num_workers=1)
+    assert set(os.listdir("/dev/shm")) - before == set()
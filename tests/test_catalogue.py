@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import pickle
+import stat
+
+import pytest
+
+from assam.pipeline import mission_interface
+from assam.visibility import catalogue_interface
+
+# Define repository target catalogue
+TARGETS_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))), "data", "targets.yml")
+
+
+@pytest.mark.parametrize("extension", ["csv", "fits"])
+def test_pipeline_loads_table_catalogues(tmp_path, extension):
+    # The pipeline catalogue stage must give the same targets from a table
+    # as from the YAML catalogue it was written from
+    catalogue = catalogue_interface.load_yaml(TARGETS_PATH, cache=False)
+    path = str(tmp_path / f"targets.{extension}")
+    catalogue_interface.write_catalogue(
+        catalogue_interface.catalogue_columns(catalogue), path)
+
+    assert mission_interface.load_target_catalogue(path) == catalogue
+
+
+def test_cache_has_catalogue_permissions(tmp_path):
+    # The binary cache must be readable by the users who can read the
+    # catalogue, rather than private to its writer
+    path = tmp_path / "targets.yml"
+    path.write_bytes(open(TARGETS_PATH, "rb").read())
+    os.chmod(path, 0o644)
+    catalogue_interface.load_yaml(str(path))
+
+    cache = catalogue_interface.cache_path(str(path))
+    assert stat.S_IMODE(os.stat(cache).st_mode) == 0o644
+
+
+def write_catalogue(path, priority, mtime_ns):
+    """
+    Function to write a catalogue of one target with a given modification
+    time.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Catalogue file path.
+    priority : int
+        Target priority.
+    mtime_ns : int
+        Modification time [ns].
+
+    Returns
+    -------
+    None.
+
+    """
+
+    path.write_text(f"""
+target:
+    category: Test
+    priority: {priority}
+    subtargets:
+        region:
+            frame: icrs
+            centre: [10, 20]
+            shape: circular
+            angular_radius: 1.0
+""")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def fail_parse(*args, **kwargs):
+    raise AssertionError("Catalogue parsed instead of cached")
+
+
+def test_cache_reused_until_catalogue_changes(tmp_path, monkeypatch):
+    path = tmp_path / "targets.yml"
+    write_catalogue(path, 1, 10**18)
+    catalogue = catalogue_interface.load_yaml(str(path))
+    assert os.path.exists(catalogue_interface.cache_path(str(path)))
+
+    # Unchanged catalogues are loaded from the cache
+    with monkeypatch.context() as patch:
+        patch.setattr(catalogue_interface.yaml, "safe_load", fail_parse)
+        assert catalogue_interface.load_yaml(str(path)) == catalogue
+
+        # Touched catalogues with unchanged content are loaded from the
+        # cache, which is updated with the new modification time
+        os.utime(path, ns=(2*10**18, 2*10**18))
+        assert catalogue_interface.load_yaml(str(path)) == catalogue
+        with open(catalogue_interface.cache_path(str(path)), "rb") as file:
+            assert pickle.load(file)["mtime"] == 2*10**18
+
+    # Edited catalogues are parsed again
+    write_catalogue(path, 2, 3*10**18)
+    assert catalogue_interface.load_yaml(str(path))["target"]["priority"] == 2
+
+
+def test_cache_recovered_or_skipped(tmp_path, monkeypatch):
+    path = tmp_path / "targets.yml"
+    write_catalogue(path, 1, 10**18)
+    cache = catalogue_interface.cache_path(str(path))
+
+    # Disabled caches are not written
+    catalogue = catalogue_interface.load_yaml(str(path), cache=False)
+    assert not os.path.exists(cache)
+
+    # Corrupt caches are replaced
+    with open(cache, "wb") as file:
+        file.write(b"corrupt")
+    assert catalogue_interface.load_yaml(str(path)) == catalogue
+    with open(cache, "rb") as file:
+        assert pickle.load(file)["catalogue"] == catalogue
+
+    # Caches are skipped in read-only directories, without leaving
+    # temporary files
+    os.remove(cache)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("Read-only directory")
+
+    monkeypatch.setattr(catalogue_interface.os, "replace", read_only)
+    assert catalogue_interface.load_yaml(str(path)) == catalogue
+    assert os.listdir(tmp_path) == ["targets.yml"]
+
+
+def test_empty_catalogue(tmp_path):
+    path = tmp_path / "targets.yml"
+    path.write_text("")
+    with pytest.raises(ValueError, match="Empty target file"):
+        catalogue_interface.load_yaml(str(path))
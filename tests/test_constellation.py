@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+from assam.scheduling import SchedulingModule
+
+pytest.importorskip("highspy")
+
+
+def constellation(make_contacts):
+    """
+    Function to create contacts of two spacecraft, where scheduling the
+    spacecraft in turn uses the quota of the first target on the first
+    spacecraft, although only the second spacecraft can observe it.
+
+    Parameters
+    ----------
+    make_contacts : callable
+        Contact factory fixture.
+
+    Returns
+    -------
+    scheduling : assam.scheduling.SchedulingModule
+        Scheduling module with the contacts.
+    contacts : list
+        Contacts of the first and second spacecraft.
+
+    """
+
+    targets, first = make_contacts([("t1", 0.0, 0.5, 0.5),
+                                    ("t2", 0.0, 0.45, 0.45)], spacecraft="a")
+    _, second = make_contacts([("t1", 1.0, 1.5, 0.5)], spacecraft="b")
+    second[0].target = targets[0]
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = first + second
+    return scheduling, first + second
+
+
+def test_constellation_milp_is_joint_optimum(make_contacts):
+    # The joint model observes the second target on the first spacecraft
+    scheduling, contacts = constellation(make_contacts)
+    schedules, benefit = scheduling.constellation_schedule(
+        method="milp_schedule", max_duration=0.6)
+
+    assert benefit == pytest.approx(0.95)
+    assert schedules == {"a": [contacts[1]], "b": [contacts[2]]}
+
+
+def test_constellation_heuristic_respects_quota(make_contacts):
+    # Scheduling in turn is suboptimal, but keeps the quota across the
+    # constellation
+    scheduling, contacts = constellation(make_contacts)
+    schedules, benefit = scheduling.constellation_schedule(
+        method="constrained_greedy_schedule", max_duration=0.6)
+
+    assert benefit == pytest.approx(0.5)
+    assert schedules == {"a": [contacts[0]], "b": []}
+
+
+def test_constellation_milp_capacity_per_spacecraft(make_contacts):
+    # Overlapping contacts of different targets on different spacecraft are
+    # both scheduled
+    targets, first = make_contacts([("t1", 0.0, 1.0, 1.0)], spacecraft="a")
+    other_targets, second = make_contacts([("t2", 0.5, 1.5, 1.0)],
+                                          spacecraft="b")
+    scheduling = SchedulingModule(targets + other_targets)
+    scheduling.contacts = first + second
+
+    _, benefit = scheduling.constellation_schedule(method="milp_schedule")
+    assert benefit == pytest.approx(2.0)
+
+
+def test_constellation_milp_exclusive_targets(make_contacts):
+    # Overlapping contacts of the same target on different spacecraft are
+    # only both scheduled without exclusive targets
+    targets, first = make_contacts([("t1", 0.0, 1.0, 1.0)], spacecraft="a")
+    _, second = make_contacts([("t1", 0.2, 0.8, 0.9)], spacecraft="b")
+    second[0].target = targets[0]
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = first + second
+
+    _, benefit = scheduling.constellation_schedule(method="milp_schedule")
+    assert benefit == pytest.approx(1.0)
+
+    _, benefit = scheduling.constellation_schedule(method="milp_schedule",
+                                                   exclusive=False)
+    assert benefit == pytest.approx(1.9)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from astropy import units as u
+from astropy.coordinates import (GCRS, ITRS, CartesianRepresentation,
+                                 EarthLocation)
+from astropy.time import Time
+from astropy.utils import iers
+import numpy as np
+import pytest
+
+from assam.visibility import constraints
+
+# Define geocentric Sun position at 1 au along the x axis
+SUN_POSITION = np.array([1.495978707e8, 0.0, 0.0])
+
+
+def limb_directions(centre, radius, nsamples=3600):
+    """
+    Function to sample the directions of the limb of an apparent disc.
+
+    Parameters
+    ----------
+    centre : numpy.ndarray
+        Unit vector of the disc centre.
+    radius : float
+        Disc angular radius [rad].
+    nsamples : int, optional
+        Number of samples. The default is 3600.
+
+    Returns
+    -------
+    numpy.ndarray
+        Unit vectors with shape (nsamples, 3).
+
+    """
+
+    axis = np.eye(3)[np.argmin(np.abs(centre))]
+    east = np.cross(axis, centre)
+    east /= np.linalg.norm(east)
+    north = np.cross(centre, east)
+    angle = np.linspace(0, 2*np.pi, nsamples, endpoint=False)[:, None]
+    return np.cos(radius)*centre + np.sin(radius)*(np.cos(angle)*east
+                                                   + np.sin(angle)*north)
+
+
+def ray_height(position, directions):
+    """
+    Function to calculate the minimum geocentric distance of rays from a
+    position, which is the distance of the position for rays pointing away
+    from the Earth.
+
+    Parameters
+    ----------
+    position : numpy.ndarray
+        Geocentric position [km].
+    directions : numpy.ndarray
+        Unit vectors of the rays with shape (N, 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        Minimum distance [km] with shape (N,).
+
+    """
+
+    t = np.maximum(-directions @ position, 0)
+    return np.linalg.norm(position + t[:, None]*directions, axis=1)
+
+
+def test_shadow_fraction_matches_ray_casting():
+    # Positions behind the Earth cross the umbra and penumbra edges, which
+    # are compared with rays cast to the limb of the Sun's disc
+    y = np.arange(6250.0, 6500.0, 0.7)
+    positions = np.stack((np.full_like(y, -7000.0), y, np.zeros_like(y)),
+                         axis=-1)
+    sun_positions = np.tile(SUN_POSITION, (len(y), 1))
+    umbra, penumbra = constraints.shadow_fraction(positions, sun_positions)
+
+    blocked = []
+    for position in positions:
+        relative = SUN_POSITION - position
+        distance = np.linalg.norm(relative)
+        directions = limb_directions(relative / distance,
+                                     np.arcsin(constraints.SUN_RADIUS / distance))
+        blocked.append(ray_height(position, directions) < constraints.EARTH_RADIUS)
+    blocked = np.array(blocked)
+
+    assert np.array_equal(umbra, np.all(blocked, axis=1))
+    assert np.array_equal(penumbra, np.any(blocked, axis=1))
+    assert 0 < np.sum(umbra) < np.sum(penumbra) < len(y)
+
+
+def test_shadow_fraction_sunlit_side():
+    # The day side is never in shadow, and the anti-Sun direction at low
+    # altitude is in the umbra
+    positions = np.array([[7000.0, 0, 0], [0, 7000.0, 0], [-7000.0, 0, 0]])
+    umbra, penumbra = constraints.shadow_fraction(
+        positions, np.tile(SUN_POSITION, (3, 1)))
+
+    assert list(umbra) == [False, False, True]
+    assert list(penumbra) == [False, False, True]
+
+
+def test_earth_occultation_limb():
+    # Directions are visible if their rays stay above the grazing height,
+    # and subtargets are visible if all directions of their discs are
+    rng = np.random.default_rng(0)
+    position = np.array([7000.0, 0, 0])
+    vectors = rng.normal(size=(2000, 3))
+    vectors /= np.linalg.norm(vectors, axis=1)[:, None]
+    radii = np.zeros(len(vectors))
+    occultation = constraints.EarthOccultation(grazing_height=100*u.km)
+    visible = occultation.calculate(position[None], None, vectors, radii,
+                                    None)[:, 0]
+
+    expected = ray_height(position, vectors) >= constraints.EARTH_RADIUS + 100
+    assert np.array_equal(visible, expected)
+    assert 0 < np.sum(visible) < len(vectors)
+
+    radius = np.radians(2.0)
+    visible = occultation.calculate(position[None], None, vectors[:100],
+                                    np.full(100, radius), None)[:, 0]
+    expected = [np.all(ray_height(position, limb_directions(vector, radius))
+                       >= constraints.EARTH_RADIUS + 100)
+                for vector in vectors[:100]]
+    assert np.array_equal(visible, expected)
+
+
+def test_subsatellite_points_match_astropy():
+    # Sub-satellite points are the geodetic coordinates of the surface
+    # point below the spacecraft along the geocentric radius, compared with
+    # the Astropy ITRS transformation
+    rng = np.random.default_rng(0)
+    times = Time("2021-03-01") + np.linspace(0, 1, 200)*u.day
+    distance = constraints.EARTH_RADIUS + rng.uniform(400, 2000, len(times))
+    positions = rng.normal(size=(len(times), 3))
+    positions *= (distance / np.linalg.norm(positions, axis=1))[:, None]
+    latitude, longitude = constraints.subsatellite_points(positions,
+                                                          times.utc.jd)
+
+    with iers.conf.set_temp("auto_download", False):
+        itrs = GCRS(CartesianRepresentation(positions.T*u.km),
+                    obstime=times).transform_to(ITRS(obstime=times))
+    directions = itrs.cartesian.xyz.to_value(u.km).T
+    directions /= np.linalg.norm(directions, axis=1)[:, None]
+    a = constraints.EARTH_RADIUS
+    b = a * (1 - constraints.EARTH_FLATTENING)
+    surface_radius = 1 / np.sqrt((directions[:, 0]**2 + directions[:, 1]**2)/a**2
+                                 + directions[:, 2]**2/b**2)
+    surface = EarthLocation.from_geocentric(
+        *(directions*surface_radius[:, None]).T, unit=u.km)
+
+    assert np.all(longitude >= -180) and np.all(longitude < 180)
+    assert latitude == pytest.approx(surface.lat.deg, abs=0.01)
+    assert (longitude - surface.lon.deg + 180) % 360 - 180 \
+        == pytest.approx(0, abs=0.01)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+from assam.propagator.ground_station import GroundStation, StationPass
+from assam.scheduling import SchedulingModule
+
+
+def station_passes(intervals, downlink_rate=1.0):
+    """
+    Function to create a ground station with the given passes.
+
+    Parameters
+    ----------
+    intervals : list
+        Start and end times of the passes [days].
+    downlink_rate : float, optional
+        Downlink data rate [Mbit/s]. The default is 1.0.
+
+    Returns
+    -------
+    station : assam.propagator.ground_station.GroundStation
+        Ground station with its passes.
+
+    """
+
+    station = GroundStation("station", 0, 0, 0, 0, downlink_rate)
+    station.passes = [StationPass(station, start, end)
+                      for start, end in intervals]
+    return station
+
+
+def test_downlink_inserted_after_contact_within_pass(make_contacts):
+    # A contact fills the storage during a pass which started while the
+    # storage was empty, so the rest of the pass must be used
+    targets, contacts = make_contacts([("a", 0.1, 0.2, 1.0),
+                                       ("b", 1.1, 1.2, 1.0)])
+    station = station_passes([(0.0, 1.0)])
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = contacts
+
+    # Each contact stores 8.64 Mbit, so both only fit with a downlink
+    scheduled, downlinks, benefit = scheduling.downlink_schedule(
+        [station], storage_capacity=10.0, data_rate=1e-3)
+
+    assert scheduled == contacts
+    assert benefit == pytest.approx(2.0)
+    assert len(downlinks) == 1
+    assert downlinks[0].start == pytest.approx(0.2)
+    assert downlinks[0].end == pytest.approx(0.2 + 8.64 / 86400)
+    assert scheduling.storage["volume"].max() <= 10.0
+
+
+def test_downlink_threshold_and_overflow(make_contacts):
+    # Below the threshold no downlink is inserted, so the second contact
+    # overflows the storage
+    targets, contacts = make_contacts([("a", 0.1, 0.2, 1.0),
+                                       ("b", 1.1, 1.2, 1.0)])
+    station = station_passes([(0.0, 1.0)])
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = contacts
+
+    scheduled, downlinks, _ = scheduling.downlink_schedule(
+        [station], storage_capacity=10.0, data_rate=1e-3,
+        downlink_threshold=0.9)
+
+    assert scheduled == contacts[:1]
+    assert downlinks == []
+
+
+def test_downlink_removes_overlapping_contacts(make_contacts):
+    # A slow downlink occupies the spacecraft until the end of the pass,
+    # past the start of the next contact, which is removed
+    targets, contacts = make_contacts([("a", 0.1, 0.2, 1.0),
+                                       ("b", 0.25, 0.3, 1.0)])
+    station = station_passes([(0.0, 1.0)], downlink_rate=1e-4)
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = contacts
+
+    scheduled, downlinks, _ = scheduling.downlink_schedule(
+        [station], storage_capacity=10.0, data_rate=1e-3)
+
+    assert scheduled == contacts[:1]
+    assert len(downlinks) == 1
+    assert downlinks[0].start == pytest.approx(0.2)
+    assert downlinks[0].end == pytest.approx(1.0)
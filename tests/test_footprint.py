@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+import pytest
+
+from assam.visibility import footprint
+
+# Define footprints in ICRS: a rectangle, and a concave polygon
+FOOTPRINTS = {
+    "rectangle": footprint.subtarget_footprint("icrs", [30, 20], "rectangular",
+                                               width=10, height=4),
+    "polygon": footprint.subtarget_footprint(
+        "icrs", [-60, -10], "polygon",
+        vertices=[[-66, -16], [-54, -16], [-54, -4], [-58, -4], [-58, -12],
+                  [-66, -12]])}
+
+
+def boundary_samples(shape, nsamples=4000):
+    """
+    Function to sample the great circle edges of a footprint densely.
+
+    Parameters
+    ----------
+    shape : footprint.Footprint
+        Footprint.
+    nsamples : int, optional
+        Number of samples per edge. The default is 4000.
+
+    Returns
+    -------
+    numpy.ndarray
+        Unit vectors of the samples with shape (S, 3).
+
+    """
+
+    samples = []
+    t = np.linspace(0, 1, nsamples)[:, None]
+    for a, b in zip(shape.vertices, np.roll(shape.vertices, -1, axis=0)):
+        angle = np.arccos(np.clip(a @ b, -1, 1))
+        samples.append((np.sin((1 - t)*angle)*a + np.sin(t*angle)*b)
+                       / np.sin(angle))
+    return np.concatenate(samples)
+
+
+def nearby_points(shape, npoints=500, spread=15.0, seed=0):
+    """
+    Function to sample random points around a footprint, and their antipodes.
+
+    Parameters
+    ----------
+    shape : footprint.Footprint
+        Footprint.
+    npoints : int, optional
+        Number of points. The default is 500.
+    spread : float, optional
+        Maximum offset from the centre [deg]. The default is 15.0.
+    seed : int, optional
+        Random seed. The default is 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Unit vectors with shape (2*npoints, 3).
+
+    """
+
+    rng = np.random.default_rng(seed)
+    offsets = rng.uniform(-1, 1, (npoints, 3)) * np.tan(np.radians(spread))
+    points = shape.centre + offsets - np.outer(offsets @ shape.centre,
+                                               shape.centre)
+    points /= np.linalg.norm(points, axis=1)[:, None]
+    return np.concatenate((points, -points))
+
+
+@pytest.mark.parametrize("name", FOOTPRINTS)
+def test_distances_match_dense_sampling(name):
+    # The exact distances must match the distances to the densely sampled
+    # boundary, with points inside the footprint at zero distance
+    shape = FOOTPRINTS[name]
+    points = nearby_points(shape)
+    samples = boundary_samples(shape)
+    sampled = np.arccos(np.clip(points @ samples.T, -1, 1))
+
+    inside = shape.contains(points)
+    min_distance = shape.min_distance(points)
+    assert 0 < np.sum(inside) < len(points) // 2
+    assert np.all(min_distance[inside] == 0)
+    assert np.allclose(min_distance[~inside], np.min(sampled[~inside], axis=1),
+                       atol=1e-6)
+
+    max_distance = shape.max_distance(points)
+    antipode_inside = shape.contains(-points)
+    assert np.all(max_distance[antipode_inside] == pytest.approx(np.pi))
+    assert np.allclose(max_distance[~antipode_inside],
+                       np.max(sampled[~antipode_inside], axis=1), atol=1e-6)
+
+
+def test_rectangle_contains_tangent_plane_rectangle():
+    # Rectangles are bounded by great circles through the corners of their
+    # gnomonic projection, so containment matches the projected rectangle
+    shape = FOOTPRINTS["rectangle"]
+    lon, lat = np.radians(30), np.radians(20)
+    east = np.array([-np.sin(lon), np.cos(lon), 0])
+    north = np.array([-np.sin(lat)*np.cos(lon), -np.sin(lat)*np.sin(lon),
+                      np.cos(lat)])
+    points = nearby_points(shape)[:500]
+    depth = points @ shape.centre
+    expected = ((np.abs(points @ east / depth) <= np.tan(np.radians(5)))
+                & (np.abs(points @ north / depth) <= np.tan(np.radians(2))))
+
+    assert np.array_equal(shape.contains(points), expected)
+    assert shape.radius == pytest.approx(np.max(np.arccos(
+        shape.vertices @ shape.centre)))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+import pytest
+
+from assam.propagator.ground_station import GroundStation
+
+
+def station_passes(visibility):
+    """
+    Function to calculate the passes of a station with the given visibility
+    at daily Julian dates.
+
+    Parameters
+    ----------
+    visibility : list
+        Boolean visibility of each time step.
+
+    Returns
+    -------
+    list
+        Start and end times of the passes [JD].
+
+    """
+
+    station = GroundStation("station", 0, 0, 0, 0, 2.0)
+    station.visibility = np.array(visibility, dtype=bool)
+    jd = 2459000.0 + np.arange(len(visibility))
+    passes = station.calculate_passes(jd)
+    assert station.passes is passes
+    return [(p.start - 2459000.0, p.end - 2459000.0) for p in passes]
+
+
+@pytest.mark.parametrize("visibility, expected", [
+    # Never and always visible
+    ([0, 0, 0, 0], []),
+    ([1, 1, 1, 1], [(0, 3)]),
+    # Visible at the first time step, ending at the first hidden step
+    ([1, 1, 0, 0], [(0, 2)]),
+    ([1, 0, 0, 0], [(0, 1)]),
+    # Visible at the last time step, clipped to the last time step
+    ([0, 0, 1, 1], [(2, 3)]),
+    # Single sample at the last time step, which has no duration
+    ([0, 0, 0, 1], []),
+    # Single interior sample and multiple passes
+    ([0, 1, 0, 0], [(1, 2)]),
+    ([1, 0, 1, 1, 0, 1], [(0, 1), (2, 4)]),
+    # Single time step
+    ([1], []),
+])
+def test_calculate_passes_edges(visibility, expected):
+    assert station_passes(visibility) == expected
+
+
+def test_pass_capacity_and_spacecraft():
+    station = GroundStation("station", 0, 0, 0, 0, 2.0)
+    station.visibility = np.array([0, 1, 1, 0], dtype=bool)
+    passes = station.calculate_passes(np.array([0.0, 0.25, 0.5, 0.75]), "sat")
+
+    assert len(passes) == 1
+    assert passes[0].spacecraft == "sat"
+    assert passes[0].duration == pytest.approx(0.5)
+    assert passes[0].capacity == pytest.approx(2.0 * 0.5 * 86400)
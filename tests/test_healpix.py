@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+import pytest
+
+from assam import _healpix as healpix
+
+
+@pytest.mark.parametrize("nside", [1, 2, 4, 8, 16])
+def test_pix2vec_vec2pix_round_trip(nside):
+    # Pixel centres are unit vectors which lie in their own pixels
+    ipix = np.arange(healpix.nside2npix(nside))
+    vectors = healpix.pix2vec(nside, ipix)
+
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
+    assert np.array_equal(healpix.vec2pix(nside, vectors), ipix)
+
+
+@pytest.mark.parametrize("nside", [1, 4, 16])
+def test_vec2pix_equal_area(nside):
+    # Uniformly distributed points fall equally into the pixels, within the
+    # pixel radius assumed by the spatial index
+    rng = np.random.default_rng(0)
+    npix = healpix.nside2npix(nside)
+    vectors = rng.normal(size=(500*npix, 3))
+    vectors /= np.linalg.norm(vectors, axis=1)[:, None]
+    ipix = healpix.vec2pix(nside, vectors)
+
+    counts = np.bincount(ipix, minlength=npix)
+    assert np.all(np.abs(counts - 500) < 6*np.sqrt(500))
+    separation = np.arccos(np.clip(np.sum(
+        vectors * healpix.pix2vec(nside, ipix), axis=1), -1, 1))
+    assert np.all(separation <= 1.5*np.sqrt(4*np.pi / npix))
+
+
+@pytest.mark.parametrize("radius", [0.01, 0.2, 1.0, 3.0])
+def test_query_disc_matches_brute_force(radius):
+    # Disc queries find every pixel centre within the disc, including discs
+    # around the poles
+    nside = 8
+    vectors = healpix.pix2vec(nside, np.arange(healpix.nside2npix(nside)))
+    for centre in ([0, 0, 1], [0, 0, -1], [0.6, 0.0, 0.8], [0.3, -0.9, 0.1]):
+        centre = np.array(centre) / np.linalg.norm(centre)
+        expected = np.flatnonzero(vectors @ centre >= np.cos(radius))
+        assert np.array_equal(
+            np.sort(healpix.query_disc(nside, centre, radius)), expected)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import logging
+
+from assam.pipeline import PipelineModule
+from assam.pipeline.artifact_interface import hash_function
+
+
+def first_stage(scale=1):
+    return 1 * scale
+
+
+def edited_stage(scale=1):
+    return 2 * scale
+
+
+def test_function_hash_depends_on_source():
+    # Functions with equal names but different sources, and partial
+    # functions with different arguments, must have different hashes
+    assert hash_function(first_stage) == hash_function(first_stage)
+    assert hash_function(first_stage) != hash_function(edited_stage)
+    assert hash_function(functools.partial(first_stage, scale=2)) \
+        != hash_function(functools.partial(first_stage, scale=3))
+
+
+def test_stage_rerun_when_function_changes(tmp_path):
+    # A stage with an unchanged name, version and parameters must rerun when
+    # its function changes, and be loaded otherwise
+    pipeline = PipelineModule(cache_dir=str(tmp_path), verbose=False)
+    pipeline.add_stage("value", first_stage)
+    assert pipeline.run()["value"] == 1
+    assert pipeline.executed == ["value"]
+
+    pipeline = PipelineModule(cache_dir=str(tmp_path), verbose=False)
+    pipeline.add_stage("value", first_stage)
+    assert pipeline.run()["value"] == 1
+    assert pipeline.executed == []
+
+    pipeline = PipelineModule(cache_dir=str(tmp_path), verbose=False)
+    pipeline.add_stage("value", edited_stage)
+    assert pipeline.run()["value"] == 2
+    assert pipeline.executed == ["value"]
+
+
+def test_stage_status_logged(tmp_path, caplog):
+    # Stage status must be logged rather than printed
+    pipeline = PipelineModule(cache_dir=str(tmp_path))
+    pipeline.add_stage("value", first_stage)
+    with caplog.at_level(logging.INFO, logger="assam.pipeline.pipeline_module"):
+        pipeline.run()
+    assert "Stage value: run" in caplog.text
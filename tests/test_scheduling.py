@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+"""
+MIT License
+
+Copyright (c) 2020-2021 Max Hallgarten La Casta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from assam.scheduling import SchedulingModule
+
+
+def random_contacts(make_contacts, seed, ncontacts=8, ntargets=3):
+    """
+    Function to create a scheduling module with random contacts.
+
+    Parameters
+    ----------
+    make_contacts : callable
+        Contact factory fixture.
+    seed : int
+        Random seed.
+    ncontacts : int, optional
+        Number of contacts. The default is 8.
+    ntargets : int, optional
+        Number of targets. The default is 3.
+
+    Returns
+    -------
+    scheduling : assam.scheduling.SchedulingModule
+        Scheduling module with the contacts.
+
+    """
+
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0, 3, ncontacts)
+    end = start + rng.uniform(0.1, 0.6, ncontacts)
+    entries = [(f"t{rng.integers(ntargets)}", s, e, b)
+               for s, e, b in zip(start, end, rng.uniform(0.1, 1, ncontacts))]
+    targets, contacts = make_contacts(entries)
+    scheduling = SchedulingModule(targets)
+    scheduling.contacts = contacts
+    return scheduling
+
+
+def feasible(contacts, max_duration=np.inf, min_revisit=0.0):
+    """
+    Function to check whether contacts can be scheduled together.
+
+    Parameters
+    ----------
+    contacts : list
+        Scheduled contacts.
+    max_duration : float, optional
+        Maximum total duration per target. The default is no limit.
+    min_revisit : float, optional
+        Minimum time between contacts of a target. The default is 0.0.
+
+    Returns
+    -------
+    bool
+        True if no contacts overlap and the target constraints are met.
+
+    """
+
+    for a, b in itertools.combinations(contacts, 2):
+        if a.start < b.end and b.start < a.end:
+            return False
+        if a.target is b.target and max(a.start, b.start) \
+                - min(a.end, b.end) < min_revisit:
+            return False
+    for target in {id(contact.target): contact.target
+                   for contact in contacts}.values():
+        duration = sum(contact.duration for contact in contacts
+                       if contact.target is target)
+        if duration > max_duration:
+            return False
+    return True
+
+
+def optimum(contacts, **constraints):
+    """
+    Function to find the optimal benefit by enumerating all subsets.
+
+    Parameters
+    ----------
+    contacts : list
+        Contacts.
+    **constraints
+        Constraints passed to feasible.
+
+    Returns
+    -------
+    float
+        Optimal total benefit.
+
+    """
+
+    return max(sum(contact.benefit for contact in subset)
+               for n in range(len(contacts) + 1)
+               for subset in itertools.combinations(contacts, n)
+               if feasible(subset, **constraints))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_simple_dynamic_schedule_is_optimal(make_contacts, seed):
+    scheduling = random_contacts(make_contacts, seed)
+    contacts = list(scheduling.contacts)
+    scheduled, benefit = scheduling.simple_dynamic_schedule()
+
+    assert feasible(scheduled)
+    assert benefit == pytest.approx(sum(c.benefit for c in scheduled))
+    assert benefit == pytest.approx(optimum(contacts))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_greedy_schedule_is_feasible(make_contacts, seed):
+    # The greedy schedule must meet the quota and revisit constraints, and
+    # cannot exceed the optimum
+    constraints = {"max_duration": 0.5, "min_revisit": 0.3}
+    scheduling = random_contacts(make_contacts, seed)
+    contacts = list(scheduling.contacts)
+    scheduled, benefit = scheduling.constrained_greedy_schedule(**constraints)
+
+    assert feasible(scheduled, **constraints)
+    assert benefit == pytest.approx(sum(c.benefit for c in scheduled))
+    assert benefit <= optimum(contacts, **constraints) + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_milp_schedule_is_optimal(make_contacts, seed):
+    pytest.importorskip("highspy")
+    constraints = {"max_duration": 0.5, "min_revisit": 0.3}
+    scheduling = random_contacts(make_contacts, seed)
+    contacts = list(scheduling.contacts)
+    scheduled, benefit = scheduling.milp_schedule(**constraints)
+
+    assert feasible(scheduled, **constraints)
+    assert benefit == pytest.approx(optimum(contacts, **constraints))